@@ -0,0 +1,212 @@
+import sys
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src import cipher_class
+from src.Codec.codec import codec_for
+from main.run.Encrypt import write_encrypted, CHUNK_SIZES, METHOD_NAMES
+from main.run.Compression import choose_compression, CompressedReader
+
+SEGMENT_BLOCKS = 256  # Blocks per scheduling unit, large files are split on this boundary
+
+# Per-worker codec, built once by the pool initializer and reused for every job
+_worker_codec = None
+
+def _init_worker(method, public_key):
+    """Pool initializer: load the shared public key once per worker process"""
+    global _worker_codec
+    _worker_codec = codec_for(cipher_class(METHOD_NAMES[method])(public_key))
+
+def _encrypt_segment(method, file_index, segment_index, path, offset, length):
+    """Worker job: encrypt one block-aligned byte range of a file"""
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read(length)
+    encrypted = _worker_codec.encrypt_all(data)
+    return file_index, segment_index, encrypted, len(data), time.perf_counter() - start
+
+def plan_jobs(files, chunk_size, segment_blocks=SEGMENT_BLOCKS):
+    """
+    Split files into block-aligned segments and order them for the pool
+
+    Segments are sorted largest first (LPT scheduling) so that small files
+    fill the gaps left by big ones and no worker is left with a long tail.
+
+    :return: (jobs, segment count per file)
+    """
+    segment_size = chunk_size * segment_blocks
+    jobs = []
+    counts = []
+    for file_index, path in enumerate(files):
+        size = os.path.getsize(path)
+        offsets = list(range(0, size, segment_size)) or [0]
+        counts.append(len(offsets))
+        for segment_index, offset in enumerate(offsets):
+            jobs.append((file_index, segment_index, path, offset, min(segment_size, size - offset)))
+    jobs.sort(key=lambda job: job[4], reverse=True)
+    return jobs, counts
+
+def output_path_for(path, output_dir, root=None):
+    """Mirror the input layout below output_dir"""
+    rel = os.path.relpath(path, root) if root else os.path.basename(path)
+    return os.path.join(output_dir, rel + '.enc')
+
+def compress_sources(files, compression, directory):
+    """
+    Compressed copy of every file that benefits from it (per-file decision)
+
+    Workers read block-aligned byte ranges, so the compressed streams are
+    written out once here instead of being produced inside the jobs.
+
+    :return: (paths to encrypt, algorithm or None per file)
+    """
+    sources, used = [], []
+    for index, path in enumerate(files):
+        algorithm = choose_compression(path, compression)
+        if algorithm:
+            staged = os.path.join(directory, f"{index}.z")
+            with CompressedReader(path, algorithm) as src, open(staged, 'wb') as dst:
+                shutil.copyfileobj(src, dst)
+            path = staged
+        sources.append(path)
+        used.append(algorithm)
+    return sources, used
+
+def run_batch(method, files, public_key, output_dir, workers=None, root=None,
+              segment_blocks=SEGMENT_BLOCKS, compression=None):
+    """
+    Encrypt many files on a process pool with one shared key
+
+    :param method: '1' for RSA, '2' for ElGamal, '3' for EC-ElGamal (same codes as Encrypt.py)
+    :param files: Input file paths
+    :param public_key: RSA (e, n), ElGamal (p, g, h) or EC (Qx, Qy) tuple shared with every worker
+    :param output_dir: Directory receiving one .enc file per input
+    :param compression: 'zlib' or 'lzma' to compress each compressible file first
+    :return: Report dictionary with per-file and aggregate throughput
+    """
+    with tempfile.TemporaryDirectory() as staging:
+        sources, used = compress_sources(files, compression, staging)
+        return _run_batch(method, files, sources, used, public_key, output_dir,
+                          workers, root, segment_blocks)
+
+def _run_batch(method, files, sources, used, public_key, output_dir, workers, root, segment_blocks):
+    chunk_size = CHUNK_SIZES[method]
+    label = METHOD_NAMES[method]
+    jobs, counts = plan_jobs(sources, chunk_size, segment_blocks)
+
+    pending = [dict() for _ in files]
+    stats = [{'bytes': 0, 'cpu_time': 0.0} for _ in files]
+    report = {'method': label, 'files': [], 'workers': workers or os.cpu_count() or 1}
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(method, public_key)) as pool:
+        futures = [pool.submit(_encrypt_segment, method, *job) for job in jobs]
+        for future in as_completed(futures):
+            file_index, segment_index, encrypted, size, elapsed = future.result()
+            pending[file_index][segment_index] = encrypted
+            stats[file_index]['bytes'] += size
+            stats[file_index]['cpu_time'] += elapsed
+
+            # Write a file as soon as all of its segments are back
+            if len(pending[file_index]) == counts[file_index]:
+                segments = pending[file_index]
+                blocks = [block for i in range(counts[file_index]) for block in segments[i]]
+                out_path = output_path_for(files[file_index], output_dir, root)
+                write_encrypted(label, blocks, out_path)
+                pending[file_index] = None
+                stat = stats[file_index]
+                report['files'].append({
+                    'path': files[file_index],
+                    'output': out_path,
+                    'compression': used[file_index],
+                    'input_bytes': os.path.getsize(files[file_index]),
+                    'bytes': stat['bytes'],
+                    'blocks': len(blocks),
+                    'cpu_time': stat['cpu_time'],
+                    'throughput': stat['bytes'] / stat['cpu_time'] if stat['cpu_time'] else 0.0,
+                })
+    wall_time = time.perf_counter() - wall_start
+
+    total = sum(s['bytes'] for s in stats)
+    report['files'].sort(key=lambda entry: entry['path'])
+    report['total_bytes'] = total
+    report['wall_time'] = wall_time
+    report['throughput'] = total / wall_time if wall_time else 0.0
+    return report
+
+def files_from_manifest(manifest_path):
+    """Read the file list produced by Turn_Into_Bytes.py --batch"""
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    files = [entry['staged'] or entry['source'] for entry in manifest['files']]
+    root = os.path.commonpath([os.path.dirname(path) for path in files]) if files else None
+    return files, root
+
+def main():
+    parser = argparse.ArgumentParser(description="Encrypt many files in parallel with one key")
+    parser.add_argument('files', nargs='*', help="input files")
+    parser.add_argument('--manifest', help="manifest written by Turn_Into_Bytes.py --batch")
+    parser.add_argument('--method', choices=['1', '2', '3'], default='1',
+                        help="1 for RSA, 2 for ElGamal, 3 for EC-ElGamal")
+    parser.add_argument('--output-dir', default=os.path.join('main', 'data', 'encrypted'))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--report', help="write the throughput report as JSON")
+    parser.add_argument('--compress', nargs='?', const='zlib', choices=['zlib', 'lzma'],
+                        help="compress compressible files before encrypting them (zlib by default)")
+    args = parser.parse_args()
+
+    files, root = list(args.files), None
+    if args.manifest:
+        files, root = files_from_manifest(args.manifest)
+    if not files:
+        parser.error("no input files")
+
+    # Keys are generated once and shipped to every worker through the initializer
+    if args.method == '1':
+        from src.RSA.rsa import RSAKeyGenerator
+        public_key, private_key = RSAKeyGenerator.generate_keypair(2048)
+    elif args.method == '3':
+        from src.ECElGamal.ECElGamal import ECElGamal
+        public_elgamal, private_elgamal = ECElGamal.create_keypair()
+        public_key = public_elgamal.Q
+    else:
+        from src.ElGamal.ElGamal import ElGamal
+        public_elgamal, private_elgamal = ElGamal.create_keypair(512)
+        public_key = (public_elgamal.p, public_elgamal.g, public_elgamal.h)
+
+    report = run_batch(args.method, files, public_key, args.output_dir, args.workers, root,
+                       compression=args.compress)
+
+    for entry in report['files']:
+        print(f"{entry['path']}: {entry['bytes']} bytes, {entry['blocks']} blocks, "
+              f"{entry['throughput'] / 1024:.2f} KB/s")
+    print(f"\nTotal: {report['total_bytes']} bytes in {report['wall_time']:.2f} s "
+          f"({report['throughput'] / 1024:.2f} KB/s, {report['workers']} workers)")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    print("\nPrivate Key (save this for decryption):")
+    if args.method == '1':
+        d, n = private_key
+        print(f"RSA private key format: d,n")
+        print(f"Example: {d},{n}")
+    elif args.method == '3':
+        print(f"EC-ElGamal private key format: x")
+        print(f"Example: {private_elgamal.x}")
+    else:
+        print(f"ElGamal private key:")
+        print(f"x: {private_elgamal.x}")
+        print(f"p: {private_elgamal.p}")
+
+if __name__ == "__main__":
+    main()
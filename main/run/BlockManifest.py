@@ -0,0 +1,69 @@
+import os
+import hmac
+import json
+import hashlib
+
+# Per-block record of an encrypt.txt, kept next to it as encrypt.txt.blocks:
+#   label, public key and compression of the run
+#   salt: random key of the block digests
+#   blocks: [digest of the padded plaintext block, record offset, record length]
+#   output_size / output_digest: the encrypt.txt the offsets refer to
+# The digests are keyed with the salt so they cannot be matched against
+# precomputed tables, but they still confirm guesses about short blocks:
+# keep the manifest on the plaintext side, do not ship it with the ciphertext.
+
+def manifest_path(output_path):
+    return output_path + '.blocks'
+
+def block_digest(salt, block):
+    return hmac.new(salt, block, hashlib.sha256).hexdigest()[:32]
+
+def new_manifest(label, public_key, compression, salt=None):
+    return {
+        'label': label, 'public_key': public_key, 'compression': compression,
+        'salt': (salt or os.urandom(16)).hex(),
+        'blocks': [], 'output_size': 0, 'output_digest': None,
+    }
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def save_manifest(path, manifest):
+    """Replace the manifest atomically"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def file_digest(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for data in iter(lambda: f.read(block_size), b''):
+            digest.update(data)
+    return digest.hexdigest()
+
+def reusable_records(manifest, output_path, label, public_key, compression):
+    """
+    Records of the previous run that may be copied into the next one
+
+    Nothing is reusable unless the previous run used the same record label,
+    public key and compression and its output is still exactly the file the
+    manifest describes.
+
+    :return: {block digest: [(offset, length), ...]} in file order
+    """
+    if manifest is None or not os.path.exists(output_path):
+        return {}
+    if (manifest['label'], manifest['public_key'], manifest['compression']) != (label, public_key, compression):
+        return {}
+    if os.path.getsize(output_path) != manifest['output_size'] or file_digest(output_path) != manifest['output_digest']:
+        return {}
+    records = {}
+    for digest, offset, length in manifest['blocks']:
+        records.setdefault(digest, []).append((offset, length))
+    return records
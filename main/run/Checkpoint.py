@@ -0,0 +1,63 @@
+import os
+import json
+import hashlib
+
+CHECKPOINT_EVERY = 64  # Blocks between two progress records
+
+def checkpoint_path(output_path):
+    """Progress record lives next to the output it describes"""
+    return output_path + '.ckpt'
+
+def save_checkpoint(output_file, path, state):
+    """
+    Persist progress after the output has reached stable storage
+
+    The output is flushed and fsynced first, then the record is replaced
+    atomically, so a record never points past data that could be lost.
+    """
+    output_file.flush()
+    os.fsync(output_file.fileno())
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_checkpoint(path):
+    """Return the saved progress record, or None if there is nothing to resume"""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def remove_checkpoint(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+def tail_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+def verify_tail(output_path, state):
+    """
+    Check that the output still ends with the last block recorded in state
+
+    :return: True if the first output_offset bytes can be kept
+    """
+    offset = state['output_offset']
+    length = state['tail_length']
+    if not os.path.exists(output_path) or os.path.getsize(output_path) < offset:
+        return False
+    if length == 0:
+        return True
+    with open(output_path, 'rb') as f:
+        f.seek(offset - length)
+        return tail_digest(f.read(length)) == state['tail_digest']
+
+def open_for_resume(output_path, state):
+    """Open the output positioned right after the last completed block"""
+    f = open(output_path, 'r+b')
+    # Anything written after the last record belongs to an unfinished block
+    f.truncate(state['output_offset'])
+    f.seek(state['output_offset'])
+    return f
@@ -0,0 +1,138 @@
+import lzma
+import zlib
+
+from main.run.Restore import detect_file_type
+
+# A compressed stream starts with MAGIC and one algorithm byte, so Restore.py
+# can tell it apart from raw data and pick the matching decompressor.
+MAGIC = b'UFCZ'
+ALGORITHMS = {'zlib': 1, 'lzma': 2}
+ALGORITHM_NAMES = {code: name for name, code in ALGORITHMS.items()}
+
+BLOCK_SIZE = 1 << 16  # Bytes read from the source per compressor call
+
+# Formats that are compressed already, a second pass only costs time
+COMPRESSED_TYPES = ('png', 'jpg', 'gif', 'mp3', 'mp4', 'zip')
+SAMPLE_SIZE = 1 << 16
+MIN_SAVING = 0.1  # Skip compression when a sample shrinks by less than this
+
+def compressor(algorithm):
+    if algorithm == 'zlib':
+        return zlib.compressobj(6)
+    if algorithm == 'lzma':
+        return lzma.LZMACompressor()
+    raise ValueError(f"Unknown compression: {algorithm}")
+
+def decompressor(algorithm):
+    if algorithm == 'zlib':
+        return zlib.decompressobj()
+    return lzma.LZMADecompressor()
+
+def choose_compression(path, algorithm):
+    """
+    Per-file decision: algorithm, or None when compressing would not pay off
+
+    Known compressed formats (by signature, as detected by Restore.py) are
+    skipped outright; anything else is skipped when a zlib pass over the
+    first SAMPLE_SIZE bytes saves less than MIN_SAVING.
+    """
+    if not algorithm:
+        return None
+    with open(path, 'rb') as f:
+        sample = f.read(SAMPLE_SIZE)
+    if not sample:
+        return None
+    if detect_file_type(sample) in COMPRESSED_TYPES or sample[4:8] == b'ftyp':  # ISO media (mp4, mov)
+        return None
+    if len(zlib.compress(sample, 1)) > len(sample) * (1 - MIN_SAVING):
+        return None
+    return algorithm
+
+class CompressedReader:
+    """
+    Read-only file object over the compressed stream of a file
+
+    The stream is produced on the fly while it is read, so nothing is staged
+    on disk. Compression is deterministic, so seek() (forward only, as used
+    when resuming from a checkpoint) simply regenerates and drops the bytes
+    before the target offset.
+    """
+
+    def __init__(self, path, algorithm, block_size=BLOCK_SIZE):
+        self._src = open(path, 'rb')
+        self._compressor = compressor(algorithm)
+        self._block_size = block_size
+        self._buffer = bytearray(MAGIC + bytes([ALGORITHMS[algorithm]]))
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size):
+        while len(self._buffer) < size and not self._eof:
+            data = self._src.read(self._block_size)
+            if data:
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._eof = True
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            self._fill(float('inf'))
+            size = len(self._buffer)
+        self._fill(size)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._pos += len(data)
+        return data
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset):
+        if offset < self._pos:
+            raise ValueError("CompressedReader can only seek forward")
+        while self._pos < offset:
+            if not self.read(min(self._block_size, offset - self._pos)):
+                break
+        return self._pos
+
+    def close(self):
+        self._src.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def open_source(path, algorithm=None):
+    """Plain binary file, or its compressed stream when algorithm is set"""
+    if algorithm:
+        return CompressedReader(path, algorithm)
+    return open(path, 'rb')
+
+def is_compressed(head):
+    return head[:len(MAGIC)] == MAGIC and head[len(MAGIC):len(MAGIC) + 1] in (b'\x01', b'\x02')
+
+def decompress_stream(src, dst, block_size=BLOCK_SIZE):
+    """
+    Stream-decompress a MAGIC-prefixed stream from src into dst
+
+    Anything after the end of the compressed stream (the zero padding of the
+    last cipher block) is ignored.
+
+    :return: Number of bytes written
+    """
+    head = src.read(len(MAGIC) + 1)
+    if not is_compressed(head):
+        raise ValueError("Not a compressed stream")
+    d = decompressor(ALGORITHM_NAMES[head[-1]])
+    written = 0
+    while not d.eof:
+        data = src.read(block_size)
+        if not data:
+            raise ValueError("Compressed stream is truncated")
+        out = d.decompress(data)
+        dst.write(out)
+        written += len(out)
+    return written
@@ -1,163 +1,210 @@
 import os
-import math
+import sys
 import hashlib
-import struct
+import argparse
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-def read_encrypted_file(file_path):
-    """Read encrypted file, supports multi-line ELGamal|(num1,num2) format"""
-    if not os.path.exists(file_path):
-        with open(file_path, 'w') as f:
-            f.write('')  # 创建空文件
-    with open(file_path, 'r') as f:
-        lines = f.readlines()
-        if not lines:
-            return None, []
-            
-        # Parse first line to get encryption method
-        first_line = lines[0].strip()
-        if '|' not in first_line:
-            return None, []
-            
-        method, first_data = first_line.split('|', 1)
-        chunks = [first_data]
-        
-        # Process remaining lines
-        for line in lines[1:]:
-            line = line.strip()
-            if not line:
-                continue
-            if '|' in line:
-                _, data = line.split('|', 1)
-                chunks.append(data)
-            else:
-                chunks.append(line)
-                
-        return method, chunks
-
-def rsa_decrypt(cipher_int, d, n):
-    """RSA decryption implementation (with OAEP unpadding)"""
-    try:
-        # RSA decryption formula: m = c^d mod n
-        m = pow(cipher_int, d, n)
-        # Convert to bytes
-        decrypted = m.to_bytes((n.bit_length() + 7) // 8, 'big')
-        
-        # OAEP unpadding
-        def mgf1(seed, mask_len, hash_func=hashlib.sha256):
-            """MGF1 mask generation function"""
-            counter = 0
-            output = bytearray()
-            while len(output) < mask_len:
-                C = seed + struct.pack(">I", counter)
-                output.extend(hash_func(C).digest())
-                counter += 1
-            return bytes(output[:mask_len])
-        
-        # OAEP unpadding parameters
-        hash_len = 32  # SHA-256 hash length
-        k = (n.bit_length() + 7) // 8  # Modulus byte length
-        
-        if len(decrypted) != k or k < 2 * hash_len + 2:
-            raise ValueError(" Invalid OAEP ciphertext format")
-        
-        # Split data
-        masked_seed = decrypted[1:1 + hash_len]
-        masked_db = decrypted[1 + hash_len:]
-        
-        # recover seed
-        seed_mask = mgf1(masked_db, hash_len)
-        seed = bytes(x ^ y for x, y in zip(masked_seed, seed_mask))
-        
-        # recover DB
-        db_mask = mgf1(seed, len(masked_db))
-        db = bytes(x ^ y for x, y in zip(masked_db, db_mask))
-        
-        # verify lHash
-        lhash = hashlib.sha256(b"").digest()  # empty label hash
-        if db[:hash_len] != lhash:
-            raise ValueError("OAEP label verification failed")
-        
-        # Find separator
-        try:
-            sep_pos = db.index(b"\x01", hash_len)
-        except ValueError:
-            raise ValueError("OAEP format error: separator not found")
-        
-        return db[sep_pos + 1:]  # Return unpadded plaintext
-        
-    except Exception as e:
-        print(f"RSA decrypt error: {str(e)}")
-        raise
-
-def elgamal_decrypt(chunk, x, p):
-    """ElGamal decrypt"""
-    try:
-        # Clean parentheses and spaces in data
-        clean_chunk = chunk.strip().replace('(', '').replace(')', '').replace(' ', '')
-        #  Split and convert to integers
-        if ',' not in clean_chunk:
-            raise ValueError("Invalid ElGamal encrypted data format")
-        
-        c1, c2 = map(int, clean_chunk.split(','))
-        #  Compute shared secret s = c1^x mod p
-        s = pow(c1, x, p)
-        #  Compute modular inverse s_inv = s^(p-2) mod p (Fermat's Little Theorem)
-        s_inv = pow(s, p-2, p)
-        # plaintext m = c2 * s_inv mod p
-        m = (c2 * s_inv) % p
-        
-        # Convert to 16-byte blocks (consistent with chunk_size during encryption
-        return m.to_bytes(16, 'big')
-        
-    except Exception as e:
-        print(f"ElGamal decrypt error : {str(e)}")
-        raise
+# Cipher and key file modules are imported inside the helpers that need them
+from src import cipher_class
+from src.Codec.codec import codec_class, codec_for, codec_from_private_key
+from main.run.Checkpoint import (CHECKPOINT_EVERY, checkpoint_path, save_checkpoint, load_checkpoint,
+                                 remove_checkpoint, tail_digest, verify_tail, open_for_resume)
+from main.run.Profiling import stage
+from main.run.SharedMemoryPool import worker_pool
 
-def main():
-    # read encrypted file
-    method, chunks = read_encrypted_file('main/data/encrypt.txt')
-    if not method:
-        print("Invalid encrypted file")
-        return
+def parse_record(line):
+    """Split one METHOD|data line, lines without a prefix carry data only"""
+    line = line.strip().decode()
+    if '|' in line:
+        method, data = line.split('|', 1)
+        return method, data
+    return None, line
+
+def iter_encrypted_blocks(f):
+    """Yield (method, data) for each record, reading one line at a time"""
+    for line in f:
+        if line.strip():
+            yield parse_record(line)
+
+def key_fingerprint(codec):
+    """Identify the key of a run by its modulus (or public point) without storing the secret part"""
+    cipher = codec.cipher
+    if codec.algorithm == 'ECElGamal':
+        return hashlib.sha256(str(cipher.Q).encode()).hexdigest()[:16]
+    public = cipher.n if codec.algorithm == 'RSA' else cipher.p
+    return hashlib.sha256(str(public).encode()).hexdigest()[:16]
+
+def decrypt_file(encrypted_path, output_path, codec, state=None,
+                 checkpoint_every=CHECKPOINT_EVERY, pool=None):
+    """
+    Decrypt encrypt.txt record by record, writing plaintext as it is produced
+
+    Records are decrypted in runs up to the next checkpoint boundary through
+    codec.decrypt_batch, so ElGamal runs share one modular inversion.
+
+    Progress (block index, input/output byte offsets, digest of the last
+    written block) is saved every checkpoint_every blocks; pass the loaded
+    checkpoint as state to continue an interrupted run.
+
+    :param pool: SharedMemoryPool decrypting each run in parallel (None: in this process)
+    :return: Number of blocks decrypted in total
+    """
+    ckpt_path = checkpoint_path(output_path)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:  #  If path contains directory
+        os.makedirs(output_dir, exist_ok=True)
+
+    method, _ = read_first_record(encrypted_path)
+    if state is None:
+        state = {
+            'method': method, 'key': key_fingerprint(codec),
+            'block_index': 0, 'input_offset': 0, 'output_offset': 0,
+            'tail_length': 0, 'tail_digest': None,
+        }
+        out = open(output_path, 'wb')
+        save_checkpoint(out, ckpt_path, state)
+    else:
+        if state['key'] != key_fingerprint(codec):
+            raise ValueError("Private key differs from the one used before the interruption")
+        if not verify_tail(output_path, state):
+            raise ValueError("Output does not match the checkpoint, cannot resume")
+        out = open_for_resume(output_path, state)
+
+    with out, open(encrypted_path, 'rb') as src:
+        src.seek(state['input_offset'])
+        while True:
+            # Read records up to the next checkpoint boundary and decrypt them together
+            chunks, offsets = [], []
+            while len(chunks) < checkpoint_every - state['block_index'] % checkpoint_every:
+                line = src.readline()
+                if not line:
+                    break
+                if line.strip():
+                    chunks.append(parse_record(line)[1])
+                    offsets.append(src.tell())
+            if not chunks:
+                break
+
+            blocks = pool.decrypt(chunks) if pool is not None else codec.decrypt_batch(chunks)
+            for block, offset in zip(blocks, offsets):
+                out.write(block)
+                state['block_index'] += 1
+                state['input_offset'] = offset
+                state['output_offset'] += len(block)
+                state['tail_length'] = len(block)
+                state['tail_digest'] = tail_digest(block)
+            if state['block_index'] % checkpoint_every == 0:
+                save_checkpoint(out, ckpt_path, state)
+        out.flush()
+        os.fsync(out.fileno())
+    remove_checkpoint(ckpt_path)
+    return state['block_index']
 
+def read_first_record(file_path):
+    """Return (method, data) of the first record, (None, None) if there is none"""
+    with open(file_path, 'rb') as f:
+        for method, data in iter_encrypted_blocks(f):
+            return method, data
+    return None, None
+
+def cipher_from_key_file(path, subgroup=False):
+    """Private RSA / ElGamal / ECElGamal instance from a binary key file"""
+    from src.Keyfile.keyfile import load_key
+    key = load_key(path)
+    cls = cipher_class(key.algorithm)
+    if key.algorithm == 'RSA':
+        return cls(key.public_key(), key.private_key(), primes=key.rsa_primes())
+    if key.algorithm == 'ElGamal':
+        return cls(key.public_key(), key.private_key(), subgroup=subgroup)
+    return cls(key.public_key(), key.private_key())
+
+def codec_from_key_file(path, method):
+    """Decrypting codec for records labelled method, from a binary key file"""
+    cipher = cipher_from_key_file(path, subgroup=method == 'ElGamalSubgroup')
+    codec = codec_for(cipher)
+    if codec.algorithm != codec_class(method).algorithm:
+        raise ValueError(f"Key file holds a {codec.algorithm} key, data was encrypted with {method}")
+    return codec
+
+def prompt_private_key(method):
+    """Read the private key pasted as decimal text"""
     # 获取私钥
     print(f"\nplease input {method} private_keys:")
+    count = 1 if method == 'ECElGamal' else 2
     while True:
         try:
-            key_input = input("Format: parameter1,parameter2").strip()
+            key_input = input("Format: parameter1" if count == 1 else "Format: parameter1,parameter2").strip()
             # clean input
             key_input = key_input.replace('(', '').replace(')', '').replace(' ', '')
             key_parts = key_input.split(',')
-            if len(key_parts) != 2:
-                raise ValueError("need exactly two parameters")
-            private_key = tuple(map(int, key_parts))
-            break
+            if len(key_parts) != count:
+                raise ValueError("need exactly one parameter" if count == 1 else "need exactly two parameters")
+            return tuple(map(int, key_parts))
         except ValueError as e:
             print(f"Invalid input: {e}")
             print("Please re-enter, example: 12345,67890 (without parentheses)")
 
-    # Decrypt data
-    decrypted = []
-    if method == 'RSA':
-        d, n = private_key
-        for chunk in chunks:
-            hex_str = chunk.split('|')[-1].replace('0x', '')
-            cipher_int = int(hex_str, 16)
-            decrypted.append(rsa_decrypt(cipher_int, d, n))
-    elif method == 'ElGamal':
-        x, p = private_key
-        for chunk in chunks:
-            decrypted.append(elgamal_decrypt(chunk, x, p))
-
-    # Write decrypted result
+def main():
+    parser = argparse.ArgumentParser(description="Decrypt main/data/encrypt.txt")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its last checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY,
+                        help="blocks between two progress records")
+    parser.add_argument('--key', help="private key file written by Keygen.py or Encrypt.py --save-key")
+    parser.add_argument('--envelope', action='store_true',
+                        help="open main/data/encrypt.env written by Encrypt.py --recipient (needs --key)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="decrypt in this many processes, blocks are passed through shared memory")
+    args = parser.parse_args()
+
+    if args.envelope:
+        from src.Envelope.envelope import open_file
+        if not args.key:
+            parser.error("--envelope needs --key")
+        with stage('load-key'):
+            cipher = cipher_from_key_file(args.key)
+        with stage('decrypt'):
+            size = open_file(os.path.join('main', 'data', 'encrypt.env'), 'main/data/decrypt.txt', cipher)
+        print(f"Opened {size} bytes, result saved")
+        return
+
+    encrypted_path = 'main/data/encrypt.txt'
     output_path = 'main/data/decrypt.txt'
-    output_dir = os.path.dirname(output_path)
-    if output_dir:  #  If path contains directory
-        os.makedirs(output_dir, exist_ok=True)
-    
-    with open(output_path, 'wb') as f:
-        f.write(b''.join(decrypted))
+
+    # read encrypted file
+    if not os.path.exists(encrypted_path):
+        with open(encrypted_path, 'w') as f:
+            f.write('')  # 创建空文件
+    method, _ = read_first_record(encrypted_path)
+    if not method:
+        print("Invalid encrypted file")
+        return
+
+    state = None
+    if args.resume:
+        state = load_checkpoint(checkpoint_path(output_path))
+        if state is None:
+            print("No checkpoint found, nothing to resume")
+            return
+        print(f"Resuming {method} decryption at block {state['block_index']}")
+
+    numbers = None if args.key else prompt_private_key(method)
+    with stage('load-key'):
+        if args.key:
+            codec = codec_from_key_file(args.key, method)
+        else:
+            codec = codec_from_private_key(method, numbers)
+
+    # Decrypt data and write result incrementally; workers load the key the same way
+    if args.key:
+        make_codec, codec_args = codec_from_key_file, (args.key, method)
+    else:
+        make_codec, codec_args = codec_from_private_key, (method, numbers)
+    with stage('decrypt'), worker_pool(args.workers, codec, make_codec, codec_args) as pool:
+        decrypt_file(encrypted_path, output_path, codec, state, args.checkpoint_every, pool)
     print("Decryption completed, result saved")
 
 if __name__ == "__main__":
-    main()
+    from main.run.Profiling import run_main
+    run_main(main, 'decrypt')
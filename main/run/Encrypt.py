@@ -1,18 +1,24 @@
 import sys
 import os
-from pathlib import Path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+import hashlib
+import argparse
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
 
-from src.RSA.rsa import RSA, RSAKeyGenerator
-from src.ElGamal.ElGamal import ElGamal, ElGamalKeyGenerator
+# Cipher modules are imported on demand (see src.cipher_class), a run only loads its own algorithm
+from src import cipher_class
+from src.Codec.codec import CODECS, codec_for
+from main.run.Checkpoint import (CHECKPOINT_EVERY, checkpoint_path, save_checkpoint, load_checkpoint,
+                                 remove_checkpoint, tail_digest, verify_tail, open_for_resume)
+from main.run.Compression import choose_compression, open_source
+from main.run.Profiling import stage
+from main.run.SharedMemoryPool import worker_pool
+from main.run.BlockManifest import (manifest_path, block_digest, new_manifest, load_manifest,
+                                    save_manifest, reusable_records)
 
-def read_file_content(file_path):
-    """Read raw binary file content"""
-    if not os.path.exists(file_path):
-        with open(file_path, 'wb') as f:
-            f.write(b'')  # 创建空文件
-    with open(file_path, 'rb') as f:
-        return f.read()
+METHOD_NAMES = {'1': 'RSA', '2': 'ElGamal', '3': 'ECElGamal'}
+# Plaintext bytes per record, defined by the codecs (src/Codec/codec.py)
+CHUNK_SIZES = {code: CODECS[name].chunk_size for code, name in METHOD_NAMES.items()}
 
 def write_encrypted(method, encrypted, output_path):
     """Write encrypted data with method prefix"""
@@ -22,77 +28,305 @@ def write_encrypted(method, encrypted, output_path):
         os.makedirs(output_dir, exist_ok=True)
     
     with open(output_path, 'wb') as f:
-        if method == 'RSA':
-            for chunk in encrypted:
-                f.write(f"RSA|{chunk}\n".encode())
-        else:  # ElGamal
-            for chunk in encrypted:
-                f.write(f"ElGamal|{chunk}\n".encode())
-
-def process_data(method, data, public_key):
-    """Process data according to encryption method"""
-    if method == '1':  # RSA
-        chunk_size = 117  # RSA 2048 chunk size
-        chunks = [data[i:i+chunk_size] for i in range(0, len(data), chunk_size)]
-        # Ensure last chunk is padded to chunk_size
-        if len(chunks[-1]) < chunk_size:
-            chunks[-1] = chunks[-1] + b'\x00' * (chunk_size - len(chunks[-1]))
-        encrypted = []
-        for chunk in chunks:
-            encrypted_int = public_key.encrypt(chunk)
-            encrypted.append(f"0x{encrypted_int:x}")
-        return encrypted
-    else:  # ElGamal
-        chunk_size = 16  # ElGamal chunk size
-        chunks = [data[i:i+chunk_size] for i in range(0, len(data), chunk_size)]
-        # Ensure last chunk is padded to chunk_size
-        if len(chunks[-1]) < chunk_size:
-            chunks[-1] = chunks[-1] + b'\x00' * (chunk_size - len(chunks[-1]))
-        encrypted = []
-        for chunk in chunks:
-            c1, c2 = public_key.encrypt(chunk)
-            encrypted.append(f"({c1},{c2})")
-        return encrypted
+        for chunk in encrypted:
+            f.write(f"{method}|{chunk}\n".encode())
+
+def method_code(name):
+    """Menu code ('1', '2', '3') for an algorithm name"""
+    return {v: k for k, v in METHOD_NAMES.items()}[name]
+
+def key_tuple(method, public_key):
+    """Public key numbers of an RSA/ElGamal/EC-ElGamal instance"""
+    if method == '1':
+        return (public_key.e, public_key.n)
+    if method == '3':
+        return public_key.Q
+    return (public_key.p, public_key.g, public_key.h)
+
+def public_codec(algorithm, numbers, subgroup=False):
+    """Encrypting codec from public key numbers, rebuilt this way in --workers processes"""
+    cls = cipher_class(algorithm)
+    return codec_for(cls(numbers, subgroup=True) if subgroup else cls(numbers))
+
+def encrypt_file(method, data_path, output_path, public_key, state=None,
+                 checkpoint_every=CHECKPOINT_EVERY, compression=None, pool=None):
+    """
+    Encrypt a file block by block, writing each record as soon as it is ready
+
+    A progress record (block index, input and output byte offsets, digest of
+    the last record) is saved every checkpoint_every blocks so an interrupted
+    run can continue with encrypt_file(..., state=load_checkpoint(...)).
+
+    :param state: Checkpoint to resume from (None starts from the beginning)
+    :param compression: 'zlib' or 'lzma' to encrypt the compressed stream of the
+                        file instead (see Compression.py), offsets then count
+                        compressed bytes
+    :param pool: SharedMemoryPool that encrypts the blocks up to each checkpoint
+                 in parallel (None encrypts them one by one in this process)
+    :return: Number of blocks written in total
+    """
+    codec = codec_for(public_key)
+    chunk_size = codec.chunk_size
+    ckpt_path = checkpoint_path(output_path)
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    if state is None:
+        state = {
+            'method': METHOD_NAMES[method],
+            'public_key': [f"0x{v:x}" for v in key_tuple(method, public_key)],
+            'subgroup': method == '2' and public_key.subgroup,
+            'compression': compression,
+            'block_index': 0, 'input_offset': 0, 'output_offset': 0,
+            'tail_length': 0, 'tail_digest': None,
+        }
+        out = open(output_path, 'wb')
+        save_checkpoint(out, ckpt_path, state)
+    else:
+        if not verify_tail(output_path, state):
+            raise ValueError("Output does not match the checkpoint, cannot resume")
+        out = open_for_resume(output_path, state)
+
+    with out, open_source(data_path, state.get('compression')) as src:
+        src.seek(state['input_offset'])
+        while True:
+            # One block at a time, or the blocks up to the next checkpoint through the pool
+            count = 1 if pool is None else checkpoint_every - state['block_index'] % checkpoint_every
+            chunks, offsets = [], []
+            while len(chunks) < count:
+                chunk = src.read(chunk_size)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                offsets.append(src.tell())
+            if not chunks:
+                break
+
+            # The last chunk is zero-padded to chunk_size
+            records = pool.encrypt(chunks) if pool is not None else [codec.encrypt_record(chunks[0])]
+            for record, offset in zip(records, offsets):
+                out.write(record)
+                state['block_index'] += 1
+                state['input_offset'] = offset
+                state['output_offset'] += len(record)
+                state['tail_length'] = len(record)
+                state['tail_digest'] = tail_digest(record)
+            if state['block_index'] % checkpoint_every == 0:
+                save_checkpoint(out, ckpt_path, state)
+        out.flush()
+        os.fsync(out.fileno())
+    remove_checkpoint(ckpt_path)
+    return state['block_index']
+
+def encrypt_file_incremental(method, data_path, output_path, public_key, compression=None):
+    """
+    Re-encrypt a file, copying the records of blocks that did not change
+
+    Every run leaves a manifest of per-block plaintext digests next to the
+    output (see BlockManifest.py). The next run digests the new blocks and
+    copies the old record of any block whose digest it finds, wherever that
+    block was before, so unchanged blocks and blocks that moved by whole
+    chunks cost no encryption. Each old record is used at most once, so
+    repeated blocks still get distinct ciphertexts.
+
+    The new output is written next to the old one and swapped in at the end;
+    an interrupted run leaves the previous output and manifest untouched.
+
+    :return: (blocks in total, blocks encrypted in this run)
+    """
+    codec = codec_for(public_key)
+    key = [f"0x{v:x}" for v in key_tuple(method, public_key)]
+    path = manifest_path(output_path)
+    previous = load_manifest(path)
+    reuse = reusable_records(previous, output_path, codec.label, key, compression)
+    salt = bytes.fromhex(previous['salt']) if reuse else None
+    manifest = new_manifest(codec.label, key, compression, salt)
+    salt = bytes.fromhex(manifest['salt'])
+
+    tmp_path = output_path + '.tmp'
+    output_dir = os.path.dirname(output_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    old = open(output_path, 'rb') if reuse else None
+    total = encrypted = offset = 0
+    output_digest = hashlib.sha256()
+    try:
+        with open_source(data_path, compression) as src, open(tmp_path, 'wb') as out:
+            while True:
+                chunk = src.read(codec.chunk_size)
+                if not chunk:
+                    break
+                chunk = codec.pad(chunk)
+                digest = block_digest(salt, chunk)
+                if reuse.get(digest):
+                    old_offset, length = reuse[digest].pop(0)
+                    old.seek(old_offset)
+                    record = old.read(length)
+                else:
+                    record = codec.encrypt_record(chunk)
+                    encrypted += 1
+                out.write(record)
+                output_digest.update(record)
+                manifest['blocks'].append([digest, offset, len(record)])
+                offset += len(record)
+                total += 1
+            out.flush()
+            os.fsync(out.fileno())
+    finally:
+        if old:
+            old.close()
+    os.replace(tmp_path, output_path)
+    manifest['output_size'] = offset
+    manifest['output_digest'] = output_digest.hexdigest()
+    save_manifest(path, manifest)
+    return total, encrypted
 
 import time
 
 def main():
-    method = input("Choose encryption method (1 for RSA, 2 for ElGamal): ").strip()
-    start_time = time.time()
-    
+    parser = argparse.ArgumentParser(description="Encrypt main/data/data.txt")
+    parser.add_argument('--resume', action='store_true',
+                        help="continue an interrupted run from its last checkpoint")
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY,
+                        help="blocks between two progress records")
+    parser.add_argument('--public-key', help="encrypt with an existing public key file instead of a new key")
+    parser.add_argument('--save-key', help="save the generated key pair as <prefix>.key / <prefix>.pub")
+    parser.add_argument('--group', help="ElGamal only: take p and g from a standardized group "
+                                        "such as ffdhe2048 instead of searching for a safe prime")
+    parser.add_argument('--subgroup', action='store_true',
+                        help="ElGamal only: short exponents with messages encoded into the order-q subgroup")
+    parser.add_argument('--compress', nargs='?', const='zlib', choices=['zlib', 'lzma'],
+                        help="compress the data before encrypting it (zlib by default), "
+                             "skipped for formats that are compressed already")
+    parser.add_argument('--incremental', action='store_true',
+                        help="with --public-key: only encrypt blocks that changed since the last run, "
+                             "using the block manifest main/data/encrypt.txt.blocks")
+    parser.add_argument('--recipient', action='append', default=[], metavar='PUBLIC_KEY',
+                        help="seal the data once for several public key files (repeatable), "
+                             "writes main/data/encrypt.env")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="encrypt in this many processes, blocks are passed through shared memory")
+    args = parser.parse_args()
+
     data_path = os.path.join('main', 'data', 'data.txt')
     encrypt_path = os.path.join('main', 'data', 'encrypt.txt')
-    
-    # Read and process input
-    data = read_file_content(data_path)
-    
-    if method == '1':  # RSA
-        private_key, public_key = RSAKeyGenerator.generate_keypair(2048)
-        rsa = RSA(public_key)
-        encrypted = process_data(method, data, rsa)
-    elif method == '2':  # ElGamal
-        public_key, private_key = ElGamal.create_keypair(512)
-        encrypted = process_data(method, data, public_key)
+
+    if not os.path.exists(data_path):
+        open(data_path, 'wb').close()  # 创建空文件
+    if args.incremental and (not args.public_key or args.resume or args.recipient):
+        parser.error("--incremental needs --public-key and cannot be combined with --resume or --recipient")
+
+    if args.recipient:
+        from src.Keyfile.keyfile import load_key
+        from src.Envelope.envelope import seal_file
+        # Multi-recipient mode: one pass over the data, one key wrap per recipient
+        envelope_path = os.path.join('main', 'data', 'encrypt.env')
+        start_time = time.time()
+        recipients = []
+        for path in args.recipient:
+            key = load_key(path)
+            if key.algorithm == 'ElGamal':
+                recipients.append(cipher_class('ElGamal')(key.public_key(), subgroup=args.subgroup))
+            else:
+                recipients.append(cipher_class(key.algorithm)(key.public_key()))
+        with stage('seal'):
+            size = seal_file(data_path, envelope_path, recipients)
+        print(f"Sealed {size} bytes for {len(recipients)} recipients into {envelope_path}")
+        print(f"Encryption completed in: {time.time() - start_time:.2f} seconds")
+        return
+
+    state = None
+    if args.resume:
+        state = load_checkpoint(checkpoint_path(encrypt_path))
+        if state is None:
+            print("No checkpoint found, nothing to resume")
+            return
+        method = method_code(state['method'])
+        start_time = time.time()
+        numbers = tuple(int(v, 16) for v in state['public_key'])
+        if state.get('subgroup'):
+            cipher = cipher_class('ElGamal')(numbers, subgroup=True)
+        else:
+            cipher = cipher_class(state['method'])(numbers)
+        print(f"Resuming {state['method']} encryption at block {state['block_index']}")
+    elif args.public_key:
+        from src.Keyfile.keyfile import load_key
+        key = load_key(args.public_key)
+        method = method_code(key.algorithm)
+        start_time = time.time()
+        if method == '2':
+            cipher = cipher_class('ElGamal')(key.public_key(), subgroup=args.subgroup)
+        else:
+            cipher = cipher_class(key.algorithm)(key.public_key())
+        print(f"Encrypting with {key.algorithm} public key {args.public_key}")
     else:
-        print("Invalid choice")
+        method = input("Choose encryption method (1 for RSA, 2 for ElGamal, 3 for EC-ElGamal): ").strip()
+        start_time = time.time()
+
+        if method not in ('1', '2', '3'):
+            print("Invalid choice")
+            return
+        with stage('keygen'):
+            if method == '1':  # RSA
+                from src.RSA.rsa import RSA, RSAKeyGenerator
+                public_key, private_key = RSAKeyGenerator.generate_keypair(2048)
+                cipher = RSA(public_key)
+            elif method == '2':  # ElGamal
+                from src.ElGamal.ElGamal import ElGamal
+                cipher, private_key = ElGamal.create_keypair(512, group=args.group, subgroup=args.subgroup)
+            else:  # EC-ElGamal
+                from src.ECElGamal.ECElGamal import ECElGamal
+                cipher, private_key = ECElGamal.create_keypair()
+
+        if args.save_key:
+            from main.run.Keygen import write_keypair
+            if method == '1':
+                paths = write_keypair(method, public_key, private_key, args.save_key)
+            else:
+                paths = write_keypair(method, key_tuple(method, cipher), private_key.x, args.save_key)
+            print(f"\nKey pair saved to {paths[0]} (private) and {paths[1]} (public)")
+
+        # Output private key before the long run so an interrupted job can still be decrypted
+        print("\nPrivate Key (save this for decryption):")
+        if method == '1':  # RSA
+            d, n = private_key
+            print(f"RSA private key format: d,n")
+            print(f"Example: {d},{n}")
+        elif method == '3':  # EC-ElGamal
+            print(f"EC-ElGamal private key format: x")
+            print(f"Example: {private_key.x}")
+        else:  # ElGamal
+            print(f"ElGamal private key:")
+            print(f"x: {private_key.x}")
+            print(f"p: {private_key.p}")
+
+    compression = None
+    if state is None and args.compress:
+        compression = choose_compression(data_path, args.compress)
+        if compression:
+            print(f"Compressing the data with {compression} before encryption")
+        else:
+            print("Data is not compressible, encrypting it as is")
+
+    if args.incremental:
+        with stage('encrypt'):
+            blocks, encrypted = encrypt_file_incremental(method, data_path, encrypt_path, cipher, compression)
+        print(f"\nEncrypted {encrypted} of {blocks} blocks, {blocks - encrypted} copied from the previous run")
+        print(f"Encryption completed in: {time.time() - start_time:.2f} seconds")
         return
-    
-    # Write output
-    write_encrypted('RSA' if method == '1' else 'ElGamal', encrypted, encrypt_path)
-    
-    # Output private key in format needed for decryption
-    print("\nPrivate Key (save this for decryption):")
-    if method == '1':  # RSA
-        d, n = private_key
-        print(f"RSA private key format: d,n")
-        print(f"Example: {d},{n}")
-    else:  # ElGamal
-        print(f"ElGamal private key:")
-        print(f"x: {private_key.x}")
-        print(f"p: {private_key.p}")
-    
+
+    # Encrypt and write output incrementally
+    subgroup = method == '2' and cipher.subgroup
+    codec_args = (METHOD_NAMES[method], key_tuple(method, cipher), subgroup)
+    with stage('encrypt'), worker_pool(args.workers, codec_for(cipher), public_codec, codec_args) as pool:
+        blocks = encrypt_file(method, data_path, encrypt_path, cipher, state, args.checkpoint_every,
+                              compression, pool)
+
     end_time = time.time()
-    print(f"\nEncryption completed in: {end_time - start_time:.2f} seconds")
+    print(f"\nEncrypted {blocks} blocks")
+    print(f"Encryption completed in: {end_time - start_time:.2f} seconds")
 
 if __name__ == "__main__":
-    main()
+    from main.run.Profiling import run_main
+    run_main(main, 'encrypt')
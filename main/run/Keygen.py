@@ -0,0 +1,79 @@
+import sys
+import os
+import time
+import argparse
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src import keygen_class
+from main.run.Profiling import stage
+
+def write_keypair(method, public_key, private_key, prefix, pem=False):
+    """
+    Save a key pair as <prefix>.key (private) and <prefix>.pub (public)
+
+    :param method: '1' for RSA ((e, n), (d, n)), '2' for ElGamal ((p, g, h), x),
+                   '3' for EC-ElGamal ((Qx, Qy), x)
+    :param pem: Also export PKCS#1 PEM files for RSA keys
+    :return: (private key path, public key path)
+    """
+    from src.Keyfile.keyfile import (save_rsa_public, save_rsa_private, save_elgamal_public,
+                                     save_elgamal_private, save_ecelgamal_public, save_ecelgamal_private,
+                                     load_key, rsa_to_pkcs1_der, to_pem)
+    private_path, public_path = prefix + '.key', prefix + '.pub'
+    if method == '1':
+        save_rsa_private(private_path, public_key, private_key)
+        save_rsa_public(public_path, public_key)
+        if pem:
+            for path, private in ((private_path, True), (public_path, False)):
+                fd = os.open(path + '.pem', os.O_WRONLY | os.O_CREAT | os.O_TRUNC,
+                             0o600 if private else 0o644)
+                with os.fdopen(fd, 'w') as f:
+                    f.write(to_pem(rsa_to_pkcs1_der(load_key(path)), private))
+    elif method == '3':
+        save_ecelgamal_private(private_path, public_key, private_key)
+        save_ecelgamal_public(public_path, public_key)
+    else:
+        save_elgamal_private(private_path, public_key, private_key)
+        save_elgamal_public(public_path, public_key)
+    return private_path, public_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a key pair into binary key files")
+    parser.add_argument('--method', choices=['1', '2', '3'], default='1',
+                        help="1 for RSA, 2 for ElGamal, 3 for EC-ElGamal (P-256)")
+    parser.add_argument('--bits', type=int, default=None,
+                        help="key size (default: 2048 for RSA, 512 for ElGamal)")
+    parser.add_argument('--out', default=os.path.join('main', 'data', 'keys', 'key'),
+                        help="output prefix, writes <out>.key and <out>.pub")
+    parser.add_argument('--pem', action='store_true', help="also export PKCS#1 PEM (RSA only)")
+    parser.add_argument('--primes', type=int, default=2,
+                        help="RSA only: prime factors of n, 3 below 4096 bits and 4 from 4096 bits "
+                             "make key generation and decryption faster (multi-prime RSA)")
+    parser.add_argument('--group', help="ElGamal only: use a standardized group such as ffdhe2048 "
+                                        "(instant, --bits is ignored)")
+    parser.add_argument('--subgroup', action='store_true',
+                        help="ElGamal only: g of prime order q and a short private exponent")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    with stage('keygen'):
+        if args.method == '1':
+            public_key, private_key = keygen_class('RSA').generate_keypair(args.bits or 2048,
+                                                                           num_primes=args.primes)
+        elif args.method == '3':
+            public_key, private_key = keygen_class('ECElGamal').generate_keypair()
+        else:
+            public_key, private_key = keygen_class('ElGamal').generate_keypair(
+                args.bits or 512, group=args.group, subgroup=args.subgroup
+            )
+    with stage('write-keys'):
+        private_path, public_path = write_keypair(args.method, public_key, private_key, args.out, args.pem)
+
+    print(f"Private key saved to {private_path}")
+    print(f"Public key saved to {public_path}")
+    print(f"Key generation completed in: {time.time() - start_time:.2f} seconds")
+
+if __name__ == "__main__":
+    from main.run.Profiling import run_main
+    run_main(main, 'keygen')
@@ -1,4 +1,9 @@
 import os
+import sys
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from main.run.Profiling import stage
 
 def detect_file_type(data):
     """Enhanced file type detection"""
@@ -62,62 +67,96 @@ def compare_files(file1, file2):
         print(f"File comparison failed: {str(e)}")
         return False
 
+def restore_compressed(decrypt_file, original_file, output_dir):
+    """
+    Inflate a compressed stream (Encrypt.py --compress) into output_dir
+
+    The stream is decompressed block by block into a temporary file, which is
+    then named after the type detected from its first bytes.
+    """
+    from main.run.Compression import decompress_stream  # Compression imports this module
+    os.makedirs(output_dir, exist_ok=True)
+    tmp_path = os.path.join(output_dir, 'restored.part')
+    with stage('decompress'), open(decrypt_file, 'rb') as src, open(tmp_path, 'wb') as dst:
+        size = decompress_stream(src, dst)
+    with open(tmp_path, 'rb') as f:
+        file_type = detect_file_type(f.read(4096))
+    if file_type is None:
+        print("Could not automatically identify file type, saving it as .bin")
+        file_type = 'bin'
+    output_path = os.path.join(output_dir, f'restored.{file_type}')
+    os.replace(tmp_path, output_path)
+    print(f"Decompressed {size} bytes into: {output_path}")
+    with stage('verify'):
+        compare_files(original_file, output_path)
+    return output_path
+
 def restore_file():
     """Restore decrypted bytes to original file format"""
     decrypt_file = 'main/data/decrypt.txt'
     original_file = 'main/data/data.txt'
     output_dir = 'main/data/output_file'
+
+    if os.path.exists(decrypt_file):
+        from main.run.Compression import is_compressed
+        with open(decrypt_file, 'rb') as f:
+            if is_compressed(f.read(8)):
+                restore_compressed(decrypt_file, original_file, output_dir)
+                return
     
     # Verify decryption but continue restoration anyway
-    compare_files(original_file, decrypt_file)
+    with stage('verify'):
+        compare_files(original_file, decrypt_file)
     
     # Ensure output directory exists
     os.makedirs(output_dir, exist_ok=True)
     
-    try:
-        # Read decrypted binary data
-        with open(decrypt_file, 'rb') as f:
-            data = f.read()
+    with stage('restore'):
+        try:
+            # Read decrypted binary data
+            with open(decrypt_file, 'rb') as f:
+                data = f.read()
         
-        # Auto-detect file type
-        file_type = detect_file_type(data)
-        if file_type is None:
-            print("Could not automatically identify file type. Please check file format.")
-            return
+            # Auto-detect file type
+            file_type = detect_file_type(data)
+            if file_type is None:
+                print("Could not automatically identify file type. Please check file format.")
+                return
         
-        # Generate output file name
-        output_path = os.path.join(output_dir, f'restored.{file_type}')
+            # Generate output file name
+            output_path = os.path.join(output_dir, f'restored.{file_type}')
         
-        # Write file
-        if file_type == 'txt':
-            # Try multiple encodings
-            encodings = ['utf-8', 'gbk', 'iso-8859-1']
-            for enc in encodings:
-                try:
-                    text = data.decode(enc)
-                    with open(output_path, 'w', encoding='utf-8') as f:
-                        f.write(text)
-                    print(f"Successfully restored text file: {output_path}")
-                    print(f"Content preview:\n{text[:200]}{'...' if len(text)>200 else ''}")
-                    return
-                except UnicodeDecodeError:
-                    continue
+            # Write file
+            if file_type == 'txt':
+                # Try multiple encodings
+                encodings = ['utf-8', 'gbk', 'iso-8859-1']
+                for enc in encodings:
+                    try:
+                        text = data.decode(enc)
+                        with open(output_path, 'w', encoding='utf-8') as f:
+                            f.write(text)
+                        print(f"Successfully restored text file: {output_path}")
+                        print(f"Content preview:\n{text[:200]}{'...' if len(text)>200 else ''}")
+                        return
+                    except UnicodeDecodeError:
+                        continue
             
-            # Save as raw binary if decoding fails
-            with open(output_path, 'wb') as f:
-                f.write(data)
-            print(f"Failed to decode text. Saved raw data to: {output_path}")
-        else:
-            with open(output_path, 'wb') as f:
-                f.write(data)
-            print(f"Successfully restored binary file: {output_path}")
+                # Save as raw binary if decoding fails
+                with open(output_path, 'wb') as f:
+                    f.write(data)
+                print(f"Failed to decode text. Saved raw data to: {output_path}")
+            else:
+                with open(output_path, 'wb') as f:
+                    f.write(data)
+                print(f"Successfully restored binary file: {output_path}")
             
-    except FileNotFoundError:
-        print(f"Decrypted file not found: {decrypt_file}")
-    except Exception as e:
-        print(f"File restoration failed: {str(e)}")
-    finally:
-        print("File restoration operation completed")
+        except FileNotFoundError:
+            print(f"Decrypted file not found: {decrypt_file}")
+        except Exception as e:
+            print(f"File restoration failed: {str(e)}")
+        finally:
+            print("File restoration operation completed")
 
 if __name__ == "__main__":
-    restore_file()
\ No newline at end of file
+    from main.run.Profiling import run_main
+    run_main(restore_file, 'restore')
\ No newline at end of file
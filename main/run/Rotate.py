@@ -0,0 +1,113 @@
+import sys
+import os
+import time
+import fnmatch
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src import cipher_class
+from src.Envelope.envelope import rotate_file
+from main.run.Decrypt import cipher_from_key_file
+
+# Key rotation for envelope files (Encrypt.py --recipient): only the wrapped
+# session key is re-encrypted and the header rewritten in place, so rotating
+# an archive costs a few public key operations per file, whatever its size.
+
+# Per-worker keys, loaded once by the pool initializer (ciphers hold locks and
+# are not sent through the pool)
+_worker_keys = None
+
+def public_cipher_from_key_file(path, subgroup=False):
+    """Public RSA / ElGamal / ECElGamal instance from a binary key file"""
+    from src.Keyfile.keyfile import load_key
+    key = load_key(path)
+    if key.algorithm == 'ElGamal':
+        return cipher_class('ElGamal')(key.public_key(), subgroup=subgroup)
+    return cipher_class(key.algorithm)(key.public_key())
+
+def load_keys(old_key, new_keys, subgroup=False):
+    """(old private cipher, [new public ciphers]) from key file paths"""
+    return (cipher_from_key_file(old_key),
+            [public_cipher_from_key_file(path, subgroup) for path in new_keys])
+
+def _init_worker(old_key, new_keys, subgroup):
+    global _worker_keys
+    _worker_keys = load_keys(old_key, new_keys, subgroup)
+
+def _rotate(path, keep_old, rewrite, keys=None):
+    """Worker job: rotate one file, errors are reported instead of raised"""
+    old_cipher, new_ciphers = keys or _worker_keys
+    start = time.perf_counter()
+    try:
+        in_place = rotate_file(path, old_cipher, new_ciphers, keep_old, rewrite)
+    except (ValueError, OSError) as e:
+        return {'path': path, 'error': str(e)}
+    return {'path': path, 'in_place': in_place, 'time': time.perf_counter() - start}
+
+def find_envelopes(paths, pattern='*.env'):
+    """Files given directly, plus every file matching pattern below the given directories"""
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+        for root, dirs, names in os.walk(path):
+            dirs.sort()
+            files += [os.path.join(root, name) for name in sorted(names) if fnmatch.fnmatch(name, pattern)]
+    return files
+
+def rotate_files(files, old_key, new_keys, workers=None, keep_old=False, rewrite=False, subgroup=False):
+    """
+    Rotate many envelopes on a process pool
+
+    :param old_key: Private key file of a current recipient
+    :param new_keys: Public (or private) key files of the new recipients
+    :return: One result dictionary per file, in input order
+    """
+    if workers == 1 or len(files) <= 1:
+        keys = load_keys(old_key, new_keys, subgroup)
+        return [_rotate(path, keep_old, rewrite, keys) for path in files]
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(old_key, new_keys, subgroup)) as pool:
+        futures = [pool.submit(_rotate, path, keep_old, rewrite) for path in files]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result['path']] = result
+    return [results[path] for path in files]
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-wrap envelope keys for new recipients without re-encrypting")
+    parser.add_argument('paths', nargs='+', help="envelope files or directories to search")
+    parser.add_argument('--old-key', required=True, help="private key file of a current recipient")
+    parser.add_argument('--new-key', required=True, action='append',
+                        help="key file of a new recipient (repeatable)")
+    parser.add_argument('--keep-old', action='store_true', help="keep the old recipient as well")
+    parser.add_argument('--rewrite', action='store_true',
+                        help="rewrite files whose header has no room left instead of skipping them")
+    parser.add_argument('--subgroup', action='store_true', help="wrap for new ElGamal keys in subgroup mode")
+    parser.add_argument('--pattern', default='*.env', help="file name pattern inside directories")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    files = find_envelopes(args.paths, args.pattern)
+    if not files:
+        parser.error("no envelope files found")
+
+    start = time.perf_counter()
+    results = rotate_files(files, args.old_key, args.new_key, args.workers,
+                           args.keep_old, args.rewrite, args.subgroup)
+    failed = [r for r in results if 'error' in r]
+    for r in results:
+        if 'error' in r:
+            print(f"{r['path']}: {r['error']}")
+        elif not r['in_place']:
+            print(f"{r['path']}: rewritten")
+    print(f"Rotated {len(results) - len(failed)} of {len(results)} files "
+          f"in {time.perf_counter() - start:.2f} seconds")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
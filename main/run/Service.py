@@ -0,0 +1,339 @@
+import sys
+import os
+import json
+import time
+import uuid
+import base64
+import signal
+import socket
+import asyncio
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Cipher modules load inside the workers, on the first request that needs them
+from src import ALGORITHMS, cipher_class, keygen_class
+
+DEFAULT_SOCKET = os.path.join('main', 'data', 'crypto.sock')
+
+#region Worker side (runs in the process pool)
+# Ciphers cached per worker process so key validation happens once per key
+_worker_ciphers = {}
+
+def _worker_cipher(algorithm, key_id, public_key, private_key):
+    cipher = _worker_ciphers.get(key_id)
+    if cipher is None:
+        cipher = cipher_class(algorithm)(public_key, private_key)
+        _worker_ciphers[key_id] = cipher
+    return cipher
+
+# ElGamal and EC-ElGamal encrypt the plaintext as an integer, so decryption
+# drops leading zero bytes (and ElGamal cannot encrypt m = 0). Their
+# plaintexts are sent with a 0x01 marker byte in front, which keeps every
+# byte of the data and costs one byte of the maximum plaintext length.
+MARKER = b"\x01"
+
+def _unmark(plaintext):
+    if not plaintext.startswith(MARKER):
+        raise ValueError("Ciphertext was not produced by this service")
+    return plaintext[len(MARKER):]
+
+def _run_batch(op, algorithm, key_id, public_key, private_key, items):
+    """Apply one operation to a whole micro-batch, errors are reported per item"""
+    cipher = _worker_cipher(algorithm, key_id, public_key, private_key)
+    if algorithm == 'RSA':  # OAEP keeps the exact plaintext
+        func = cipher.encrypt if op == 'encrypt' else cipher.decrypt
+    elif op == 'encrypt':
+        func = lambda data: cipher.encrypt(MARKER + data)
+    else:
+        func = lambda ciphertext: _unmark(cipher.decrypt(ciphertext))
+    results = []
+    for item in items:
+        try:
+            results.append((True, func(item)))
+        except Exception as e:
+            results.append((False, str(e)))
+    return results
+
+def _run_keygen(algorithm, bits, group=None, deadline=None):
+    """
+    Generate a key pair, raising TimeoutError (ERR602) once the deadline has passed
+
+    :param deadline: time.monotonic() value taken in the service process; the
+                     monotonic clock is system-wide, so it holds in the worker
+    """
+    budget = None
+    if deadline is not None:
+        from src.Utils.budget import KeygenBudget
+        budget = KeygenBudget(deadline=deadline)
+    if algorithm == 'RSA':
+        return keygen_class('RSA').generate_keypair(bits, budget=budget)
+    if algorithm == 'ECElGamal':
+        return keygen_class('ECElGamal').generate_keypair()
+    return keygen_class('ElGamal').generate_keypair(bits, group=group, budget=budget)
+#endregion
+
+#region Wire encoding
+def _encode_ciphertext(algorithm, value):
+    if algorithm == 'RSA':
+        return f"0x{value:x}"
+    return [f"0x{part:x}" for part in value]
+
+def _decode_ciphertext(algorithm, value):
+    if algorithm == 'RSA':
+        return int(value, 16)
+    c1, c2 = value
+    return (int(c1, 16), int(c2, 16))
+#endregion
+
+class CryptoService:
+    """
+    Long-lived encryption service over a Unix domain socket
+
+    Protocol: one JSON object per line in each direction.
+      {"id": 1, "op": "keygen", "algorithm": "RSA", "bits": 2048}
+      {"id": 1, "op": "keygen", "algorithm": "ElGamal", "group": "ffdhe2048"}
+      {"id": 1, "op": "keygen", "algorithm": "RSA", "bits": 2048, "timeout": 2.5}
+      {"id": 2, "op": "encrypt", "key_id": "...", "data": "<base64>"}
+      {"id": 3, "op": "decrypt", "key_id": "...", "ciphertext": "0x..." | ["0x...", "0x..."]}
+    Responses carry the same id plus either "ok": true and a result or
+    "ok": false and an "error" message. A keygen that exceeds its timeout is
+    answered with a spare key of the same kind when one is ready ("pooled":
+    true); with spare_keys > 0 that many spares are kept per kind of key.
+    The timeout counts from the arrival of the request, time spent waiting for
+    a worker included; spares are generated in a pool of their own so they
+    never queue in front of a request.
+    decrypt returns exactly the encrypted data; ElGamal and EC-ElGamal
+    plaintexts are one byte shorter than the cipher's maximum (see MARKER).
+
+    Performance design:
+    1. Modular exponentiation runs in a process pool, the event loop only does I/O
+    2. Small encrypt/decrypt requests for the same key are coalesced into micro-batches
+    3. A bounded number of in-flight requests; readers stop consuming input when full
+    """
+
+    def __init__(self, workers=None, max_pending=256, batch_size=32, batch_window=0.002, spare_keys=0):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.keys = {}  # key_id -> (algorithm, public_key, private_key)
+        self.spare_keys = spare_keys
+        self._spares = {}  # (algorithm, bits, group) -> [(public_key, private_key)]
+        self._filling = {}  # (algorithm, bits, group) -> spares being generated
+        self._batches = {}  # (op, key_id) -> [(item, future)]
+        self._timers = {}
+        self.pool = None
+        self.spare_pool = None
+        self.slots = None
+
+    #region Micro-batching
+    async def submit(self, op, key_id, item):
+        """Queue one item and wait for the result of its batch"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        key = (op, key_id)
+        batch = self._batches.setdefault(key, [])
+        batch.append((item, future))
+        if len(batch) >= self.batch_size:
+            self._flush(key)
+        elif len(batch) == 1:
+            self._timers[key] = loop.call_later(self.batch_window, self._flush, key)
+        return await future
+
+    def _flush(self, key):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._batches.pop(key, None)
+        if not batch:
+            return
+        op, key_id = key
+        algorithm, public_key, private_key = self.keys[key_id]
+        items = [item for item, _ in batch]
+        job = asyncio.get_running_loop().run_in_executor(
+            self.pool, _run_batch, op, algorithm, key_id, public_key, private_key, items
+        )
+        job.add_done_callback(lambda done: self._resolve(batch, done))
+
+    @staticmethod
+    def _resolve(batch, done):
+        error = done.exception()
+        for index, (_, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+                continue
+            ok, value = done.result()[index]
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(ValueError(value))
+    #endregion
+
+    #region Spare keys
+    def _top_up(self, kind):
+        """Start generating spares of this kind until spare_keys are ready or on the way"""
+        spares = self._spares.setdefault(kind, [])
+        missing = self.spare_keys - len(spares) - self._filling.get(kind, 0)
+        loop = asyncio.get_running_loop()
+        for _ in range(missing):
+            self._filling[kind] = self._filling.get(kind, 0) + 1
+            job = loop.run_in_executor(self.spare_pool, _run_keygen, *kind)
+            job.add_done_callback(lambda done, kind=kind: self._add_spare(kind, done))
+
+    def _add_spare(self, kind, done):
+        self._filling[kind] -= 1
+        if not done.cancelled() and done.exception() is None:
+            self._spares[kind].append(done.result())
+    #endregion
+
+    #region Request handling
+    async def keygen(self, request):
+        algorithm = request.get('algorithm', 'RSA')
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm: {algorithm}")
+        bits = int(request.get('bits', 2048 if algorithm == 'RSA' else 512))
+        kind = (algorithm, bits, request.get('group'))
+        timeout = request.get('timeout')
+        timeout = None if timeout is None else float(timeout)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        if self.spare_keys:
+            self._top_up(kind)
+        pooled = False
+        try:
+            job = loop.run_in_executor(self.pool, _run_keygen, *kind, deadline)
+            # The worker stops at the deadline, wait_for also covers the time the job is queued
+            public_key, private_key = await asyncio.wait_for(job, timeout)
+        except (TimeoutError, asyncio.TimeoutError):
+            # Latency target missed: fall back to a key generated ahead of time
+            if not self._spares.get(kind):
+                raise TimeoutError(f"ERR602: Key generation deadline of {timeout} s exceeded") from None
+            public_key, private_key = self._spares[kind].pop()
+            pooled = True
+            self._top_up(kind)
+        key_id = uuid.uuid4().hex
+        self.keys[key_id] = (algorithm, public_key, private_key)
+        return {'key_id': key_id, 'algorithm': algorithm, 'pooled': pooled,
+                'public_key': [f"0x{v:x}" for v in public_key]}
+
+    async def dispatch(self, request):
+        op = request.get('op')
+        if op == 'keygen':
+            return await self.keygen(request)
+
+        if op not in ('encrypt', 'decrypt'):
+            raise ValueError(f"Unknown operation: {op}")
+        key_id = request.get('key_id')
+        if key_id not in self.keys:
+            raise KeyError(f"Unknown key_id: {key_id}")
+        algorithm = self.keys[key_id][0]
+
+        if op == 'encrypt':
+            data = base64.b64decode(request['data'])
+            result = await self.submit(op, key_id, data)
+            return {'ciphertext': _encode_ciphertext(algorithm, result)}
+        ciphertext = _decode_ciphertext(algorithm, request['ciphertext'])
+        result = await self.submit(op, key_id, ciphertext)
+        return {'data': base64.b64encode(result).decode()}
+
+    async def _serve_one(self, line, writer, write_lock):
+        response = {}
+        try:
+            request = json.loads(line)
+            response['id'] = request.get('id')
+            response.update(await self.dispatch(request))
+            response['ok'] = True
+        except Exception as e:
+            response['ok'] = False
+            response['error'] = f"{type(e).__name__}: {e}"
+        finally:
+            self.slots.release()
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+    async def handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                # Backpressure: do not read the next request until a slot is free
+                await self.slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    self.slots.release()
+                    break
+                task = asyncio.create_task(self._serve_one(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+    #endregion
+
+    async def serve(self, socket_path):
+        """Run until cancelled"""
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        if self.spare_keys:
+            self.spare_pool = ProcessPoolExecutor(max_workers=1)
+        self.slots = asyncio.Semaphore(self.max_pending)
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        # SIGTERM stops the server the same way Ctrl+C does, so the socket gets removed
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            _shutdown_pool(self.pool)
+            if self.spare_pool is not None:
+                _shutdown_pool(self.spare_pool)
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+
+def _shutdown_pool(pool):
+    """Stop the pool without running the jobs still queued (cancel_futures needs Python 3.9)"""
+    if sys.version_info >= (3, 9):
+        pool.shutdown(cancel_futures=True)
+        return
+    # What cancel_futures does: cancel every job no worker has picked up yet
+    for work_item in list(getattr(pool, '_pending_work_items', {}).values()):
+        work_item.future.cancel()
+    pool.shutdown()
+
+def request(socket_path, message):
+    """Minimal blocking client: send one request and return the decoded response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(message).encode() + b'\n')
+        with sock.makefile('rb') as stream:
+            return json.loads(stream.readline())
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the local RSA/ElGamal encryption service")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--max-pending', type=int, default=256)
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--batch-window', type=float, default=0.002,
+                        help="seconds to wait for more requests before flushing a batch")
+    parser.add_argument('--spare-keys', type=int, default=0,
+                        help="key pairs kept ready per kind of key for keygen requests that time out")
+    args = parser.parse_args()
+
+    service = CryptoService(args.workers, args.max_pending, args.batch_size, args.batch_window,
+                            args.spare_keys)
+    print(f"Encryption service listening on {args.socket}")
+    try:
+        asyncio.run(service.serve(args.socket))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("Service stopped")
+
+if __name__ == "__main__":
+    main()
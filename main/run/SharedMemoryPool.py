@@ -0,0 +1,137 @@
+import os
+from contextlib import contextmanager
+
+# Worker pool transport of Encrypt.py / Decrypt.py --workers N.
+# Sending every block to a worker as pickled bytes, ints and record strings
+# costs about as much as encrypting a small block, so blocks go through two
+# shared_memory buffers instead: the parent writes a window of inputs into
+# the first one as fixed-width big-endian values (plaintext chunks, or
+# ciphertexts in the codec's pack_into form), each worker is sent only the
+# buffer names, a first block and a block count, and writes its results into
+# the second buffer at the same block positions. A task and its reply are a
+# few dozen bytes, whatever the block and key size.
+# Encrypt.py and Decrypt.py import this module on every run, so
+# multiprocessing and concurrent.futures are only imported once a pool is
+# started (--workers > 1).
+
+WINDOW_BLOCKS = 1024  # Blocks per buffer fill, longer runs are processed in several windows
+TASKS_PER_WORKER = 4  # Slices per worker and window, evens out slow and fast workers
+
+#region Worker side
+_worker_codec = None
+_attached = {}  # Buffer name -> SharedMemory, attached once per worker process
+
+def _init_worker(make_codec, args):
+    """Pool initializer: build the codec once per worker process"""
+    global _worker_codec
+    _worker_codec = make_codec(*args)
+
+def _attach(name):
+    # Workers share the parent's resource tracker, the buffer stays registered
+    # once and is unlinked by the parent in SharedMemoryPool.close()
+    shm = _attached.get(name)
+    if shm is None:
+        from multiprocessing import shared_memory
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    return shm
+
+def _work(op, input_name, output_name, start, count):
+    """Worker job: encrypt or decrypt blocks [start, start + count) in place"""
+    codec = _worker_codec
+    inputs, outputs = _attach(input_name).buf, _attach(output_name).buf
+    size, width = codec.chunk_size, codec.ciphertext_size
+    if op == 'encrypt':
+        for i in range(start, start + count):
+            ciphertext = codec.cipher.encrypt(bytes(inputs[i * size:(i + 1) * size]))
+            codec.pack_into(outputs, i * width, ciphertext)
+    else:
+        ciphertexts = [codec.unpack_from(inputs, i * width) for i in range(start, start + count)]
+        for i, block in enumerate(codec.decrypt_values(ciphertexts), start):
+            outputs[i * size:(i + 1) * size] = block
+    return count
+#endregion
+
+class SharedMemoryPool:
+    """Process pool encrypting / decrypting runs of blocks through shared memory"""
+
+    def __init__(self, codec, make_codec, args=(), workers=None, window=WINDOW_BLOCKS):
+        """
+        :param codec: The parent's codec, for record formatting and buffer sizes
+        :param make_codec: Top-level function, make_codec(*args) builds the same
+                           codec in each worker (e.g. from key numbers or a key file)
+        :param workers: Worker processes (default: one per CPU)
+        :param window: Blocks per buffer fill
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        self.codec = codec
+        self.workers = workers or os.cpu_count() or 1
+        self.window = window
+        self._buffers = {}  # op -> (input buffer, output buffer)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(make_codec, args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.executor.shutdown()
+        for buffers in self._buffers.values():
+            for shm in buffers:
+                shm.close()
+                shm.unlink()
+        self._buffers = {}
+
+    def _buffers_for(self, op, input_width, output_width):
+        if op not in self._buffers:
+            from multiprocessing import shared_memory
+            self._buffers[op] = (shared_memory.SharedMemory(create=True, size=self.window * input_width),
+                                 shared_memory.SharedMemory(create=True, size=self.window * output_width))
+        return self._buffers[op]
+
+    def _run(self, op, inputs, outputs, count):
+        """Split blocks [0, count) over the workers and wait for all of them"""
+        step = max(1, -(-count // (self.workers * TASKS_PER_WORKER)))
+        jobs = [self.executor.submit(_work, op, inputs.name, outputs.name, start, min(step, count - start))
+                for start in range(0, count, step)]
+        for job in jobs:
+            job.result()  # Re-raises the first worker error
+
+    def encrypt(self, chunks):
+        """encrypt.txt records of plaintext chunks, as Codec.encrypt_record"""
+        codec = self.codec
+        size, width = codec.chunk_size, codec.ciphertext_size
+        inputs, outputs = self._buffers_for('encrypt', size, width)
+        records = []
+        for first in range(0, len(chunks), self.window):
+            window = chunks[first:first + self.window]
+            for i, chunk in enumerate(window):
+                inputs.buf[i * size:(i + 1) * size] = codec.pad(chunk)
+            self._run('encrypt', inputs, outputs, len(window))
+            records += [codec.record(codec.unpack_from(outputs.buf, i * width)) for i in range(len(window))]
+        return records
+
+    def decrypt(self, records):
+        """Plaintext chunks of record data strings, as Codec.decrypt_batch"""
+        codec = self.codec
+        size, width = codec.chunk_size, codec.ciphertext_size
+        inputs, outputs = self._buffers_for('decrypt', width, size)
+        blocks = []
+        for first in range(0, len(records), self.window):
+            window = records[first:first + self.window]
+            for i, data in enumerate(window):
+                codec.pack_into(inputs.buf, i * width, codec.parse(data))
+            self._run('decrypt', inputs, outputs, len(window))
+            blocks += [bytes(outputs.buf[i * size:(i + 1) * size]) for i in range(len(window))]
+        return blocks
+
+@contextmanager
+def worker_pool(workers, codec, make_codec, args=()):
+    """SharedMemoryPool for workers > 1, None (run in this process) otherwise"""
+    if not workers or workers <= 1:
+        yield None
+        return
+    with SharedMemoryPool(codec, make_codec, args, workers) as pool:
+        yield pool
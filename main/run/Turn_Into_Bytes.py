@@ -1,28 +1,134 @@
 import os
+import sys
+import json
+import shutil
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+def _zero_copy(src_file, dst_file, size):
+    """Copy size bytes between open files inside the kernel when possible"""
+    src_fd, dst_fd = src_file.fileno(), dst_file.fileno()
+    copied = 0
+    # First choice: copy_file_range (Linux, may reflink on CoW filesystems)
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < size:
+                sent = os.copy_file_range(src_fd, dst_fd, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return copied
+        except OSError:
+            pass  # Cross-device or unsupported filesystem, try sendfile
+    # Second choice: sendfile (file-to-file is supported on Linux)
+    if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+        try:
+            while copied < size:
+                sent = os.sendfile(dst_fd, src_fd, copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return copied
+        except OSError:
+            pass
+    # Fallback: buffered user-space copy from the current position
+    src_file.seek(copied)
+    dst_file.seek(copied)
+    shutil.copyfileobj(src_file, dst_file, 1024 * 1024)
+    return os.fstat(dst_fd).st_size
 
 def file_to_bytes(input_path, output_path):
     """Convert file to raw bytes and save"""
     # Verify input file exists
     if not os.path.exists(input_path):
         raise FileNotFoundError(f"Input file not found: {input_path}")
-    
-    # Read file content as bytes
-    with open(input_path, 'rb') as f:
-        file_bytes = f.read()
-    
+
     # Check and create directory if needed before writing
     output_dir = os.path.dirname(output_path)
     if output_dir:  # If path contains directory
         os.makedirs(output_dir, exist_ok=True)
-    
-    # Write raw bytes (regardless of file existence)
-    with open(output_path, 'wb') as f:
-        f.write(file_bytes)
 
-if __name__ == "__main__":
-    input_dir = os.path.join('main', 'data', 'input_file')
+    # Copy raw bytes without pulling the file into memory (regardless of file existence)
+    with open(input_path, 'rb') as src, open(output_path, 'wb') as dst:
+        size = os.fstat(src.fileno()).st_size
+        return _zero_copy(src, dst, size)
+
+def collect_files(input_dir):
+    """List every regular file under input_dir (recursive, stable order)"""
+    found = []
+    for root, dirs, names in os.walk(input_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            if os.path.isfile(path):
+                found.append(path)
+    return found
+
+def batch_to_bytes(input_dir, output_dir, manifest_path, stream=False, workers=None):
+    """
+    Stage every file of a directory tree and describe it in a manifest
+
+    :param input_dir: Directory scanned recursively
+    :param output_dir: Staging directory (mirrors the input tree)
+    :param manifest_path: JSON manifest written after staging
+    :param stream: Skip the copy and let consumers read the source directly
+    :param workers: Number of concurrent copies (default: CPU count)
+    :return: Manifest dictionary
+    """
+    if not os.path.isdir(input_dir):
+        raise FileNotFoundError(f"Input directory not found: {input_dir}")
+
+    def stage(path):
+        rel = os.path.relpath(path, input_dir)
+        size = os.path.getsize(path)
+        staged = None
+        if not stream:
+            staged = os.path.join(output_dir, rel)
+            file_to_bytes(path, staged)
+        return {'path': rel, 'source': os.path.abspath(path),
+                'staged': staged and os.path.abspath(staged), 'size': size}
+
+    files = collect_files(input_dir)
+    # Largest files first so one big copy does not end up last in the queue
+    files.sort(key=os.path.getsize, reverse=True)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        entries = sorted(pool.map(stage, files), key=lambda e: e['path'])
+
+    manifest = {
+        'root': os.path.abspath(input_dir),
+        'mode': 'stream' if stream else 'staged',
+        'total_bytes': sum(e['size'] for e in entries),
+        'files': entries,
+    }
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir:
+        os.makedirs(manifest_dir, exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert input files to raw bytes")
+    parser.add_argument('--batch', action='store_true',
+                        help="stage every file under the input directory and write a manifest")
+    parser.add_argument('--input-dir', default=os.path.join('main', 'data', 'input_file'))
+    parser.add_argument('--output-dir', default=os.path.join('main', 'data', 'staged'))
+    parser.add_argument('--manifest', default=os.path.join('main', 'data', 'manifest.json'))
+    parser.add_argument('--stream', action='store_true',
+                        help="do not copy, record source paths for streaming instead")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    input_dir = args.input_dir
     output_file = os.path.join('main', 'data', 'data.txt')
-    
+
+    if args.batch:
+        manifest = batch_to_bytes(input_dir, args.output_dir, args.manifest,
+                                  stream=args.stream, workers=args.workers)
+        print(f"Processed {len(manifest['files'])} files ({manifest['total_bytes']} bytes), "
+              f"manifest saved to {args.manifest}")
+        return
+
     # Get first file in input_dir
     files = os.listdir(input_dir)
     if not files:
@@ -31,8 +137,11 @@ if __name__ == "__main__":
         with open(placeholder_file, 'w') as f:
             f.write('')  # Create placeholder file
         files = [placeholder_file]  # Use placeholder file
-    
+
     input_file = os.path.join(input_dir, files[0])
     file_to_bytes(input_file, output_file)
-    
+
     print(f"Successfully converted {input_file} to bytes and saved to {output_file}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Command-line scripts (run directly or through the ufug-crypto entry point)"""
@@ -0,0 +1,49 @@
+import sys
+import os
+import importlib
+if not __package__:  # Run as a script: make the repository root importable
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+# Sub-command -> (module, entry point, description)
+# Modules are imported only once their sub-command is chosen, so
+# `ufug-crypto keygen` never loads the envelope or service code.
+COMMANDS = {
+    'stage': ('main.run.Turn_Into_Bytes', 'main', "Convert input files to raw bytes"),
+    'encrypt': ('main.run.Encrypt', 'main', "Encrypt main/data/data.txt"),
+    'decrypt': ('main.run.Decrypt', 'main', "Decrypt main/data/encrypt.txt"),
+    'restore': ('main.run.Restore', 'restore_file', "Restore the decrypted bytes into a file"),
+    'keygen': ('main.run.Keygen', 'main', "Generate a key pair into binary key files"),
+    'batch': ('main.run.Batch_Encrypt', 'main', "Encrypt many files in parallel"),
+    'rotate': ('main.run.Rotate', 'main', "Re-wrap envelope keys for new recipients"),
+    'serve': ('main.run.Service', 'main', "Run the encryption service on a Unix socket"),
+}
+
+def usage() -> str:
+    lines = ["usage: ufug-crypto <command> [options]", "", "commands:"]
+    lines += [f"  {name:<10}{description}" for name, (_, _, description) in COMMANDS.items()]
+    lines += ["", "Run 'ufug-crypto <command> --help' for the options of a command.",
+              "Add --profile[=DIR] to any command to write a stack profile and per-stage",
+              "timings into DIR (main/data/profile by default)."]
+    return "\n".join(lines)
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(usage())
+        return 0
+    command = argv[0]
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}\n\n{usage()}", file=sys.stderr)
+        return 2
+    from main.run.Profiling import split_profile_args, run
+    module, entry, _ = COMMANDS[command]
+    args, profile_dir = split_profile_args(argv[1:])
+    # The commands parse sys.argv themselves
+    sys.argv = [f"ufug-crypto {command}"] + args
+    entry = getattr(importlib.import_module(module), entry)
+    if profile_dir is None:
+        return entry()
+    return run(entry, command, profile_dir)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import unittest
+import os
+import sys
+import base64
+import asyncio
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src import cipher_class
+from main.run.Service import CryptoService
+
+class TestService(unittest.TestCase):
+    """Encryption service Test Class"""
+
+    KEYGEN = {
+        'RSA': {'bits': 2048},
+        'ElGamal': {'group': 'ffdhe2048'},
+        'ECElGamal': {},
+    }
+
+    def run_requests(self, algorithm, messages):
+        """decrypt(encrypt(message)) for every message, through CryptoService.dispatch"""
+        async def scenario():
+            # pool None: batches run in the event loop's default thread pool
+            service = CryptoService(batch_window=0)
+            key = await service.dispatch({'op': 'keygen', 'algorithm': algorithm, **self.KEYGEN[algorithm]})
+            results = []
+            for message in messages:
+                encrypted = await service.dispatch({'op': 'encrypt', 'key_id': key['key_id'],
+                                                    'data': base64.b64encode(message).decode()})
+                decrypted = await service.dispatch({'op': 'decrypt', 'key_id': key['key_id'],
+                                                    'ciphertext': encrypted['ciphertext']})
+                results.append(base64.b64decode(decrypted['data']))
+            return results
+        return asyncio.run(scenario())
+
+    def test_round_trip(self):
+        messages = [b"", b"\x00", b"\x00" * 16, b"\x00\x00abc", b"hello", b"abc\x00\x00"]
+        for algorithm in self.KEYGEN:
+            with self.subTest(algorithm=algorithm):
+                self.assertEqual(self.run_requests(algorithm, messages), messages)
+
+    def test_foreign_ciphertext(self):
+        async def scenario():
+            service = CryptoService(batch_window=0)
+            key = await service.dispatch({'op': 'keygen', 'algorithm': 'ECElGamal'})
+            _, public_key, private_key = service.keys[key['key_id']]
+            c1, c2 = cipher_class('ECElGamal')(public_key, private_key).encrypt(b"data")
+            await service.dispatch({'op': 'decrypt', 'key_id': key['key_id'],
+                                    'ciphertext': [f"0x{c1:x}", f"0x{c2:x}"]})
+        with self.assertRaises(ValueError):
+            asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main()
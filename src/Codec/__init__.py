@@ -0,0 +1 @@
+"""encrypt.txt record formats and the codec registry shared by the scripts"""
@@ -0,0 +1,200 @@
+import abc
+from typing import Dict, List, Tuple, Type
+
+from src import cipher_class, algorithm_of
+
+#region Codecs
+class Codec(abc.ABC):
+    """
+    Record format of one algorithm in encrypt.txt
+
+    A codec wraps an RSA / ElGamal / ECElGamal instance and turns fixed-size
+    plaintext chunks into "<label>|<data>" records and back. Encrypt.py,
+    Decrypt.py and Batch_Encrypt.py all go through it, so whatever the cipher
+    classes do (CRT, blinding, batched ElGamal inversion, gmpy2) also applies
+    to the files they write.
+    """
+
+    algorithm = None  # Key in src.ALGORITHMS
+    chunk_size = None  # Plaintext bytes per record
+
+    def __init__(self, cipher):
+        self.cipher = cipher
+
+    @property
+    def label(self) -> str:
+        """Method prefix of the records"""
+        return self.algorithm
+
+    @classmethod
+    def from_private_key(cls, numbers: Tuple[int, ...]) -> "Codec":
+        """Decrypting codec from the bare private key numbers typed in by the user"""
+        return cls(cipher_class(cls.algorithm).from_private_key(*numbers))
+
+    @abc.abstractmethod
+    def format(self, ciphertext) -> str:
+        """Record data of a ciphertext"""
+
+    @abc.abstractmethod
+    def parse(self, data: str):
+        """Ciphertext of record data"""
+
+    @property
+    @abc.abstractmethod
+    def ciphertext_widths(self) -> Tuple[int, ...]:
+        """Bytes of each ciphertext integer in the fixed-width form (pack_into / unpack_from)"""
+
+    @property
+    def ciphertext_size(self) -> int:
+        return sum(self.ciphertext_widths)
+
+    def pack_into(self, buffer, offset: int, ciphertext) -> None:
+        """Write a ciphertext into buffer[offset:] as fixed-width big-endian integers"""
+        values = ciphertext if isinstance(ciphertext, tuple) else (ciphertext,)
+        for value, width in zip(values, self.ciphertext_widths):
+            buffer[offset:offset + width] = value.to_bytes(width, "big")
+            offset += width
+
+    def unpack_from(self, buffer, offset: int):
+        """Inverse of pack_into"""
+        values = []
+        for width in self.ciphertext_widths:
+            values.append(int.from_bytes(buffer[offset:offset + width], "big"))
+            offset += width
+        return values[0] if len(values) == 1 else tuple(values)
+
+    def pad(self, chunk: bytes) -> bytes:
+        """Zero-pad a short (last) chunk to chunk_size"""
+        if len(chunk) < self.chunk_size:
+            chunk = chunk + b"\x00" * (self.chunk_size - len(chunk))
+        return chunk
+
+    def encrypt(self, chunk: bytes) -> str:
+        """Record data for one chunk of at most chunk_size bytes"""
+        return self.format(self.cipher.encrypt(self.pad(chunk)))
+
+    def encrypt_record(self, chunk: bytes) -> bytes:
+        """One complete encrypt.txt line"""
+        return self.record(self.cipher.encrypt(self.pad(chunk)))
+
+    def record(self, ciphertext) -> bytes:
+        """encrypt.txt line of a ciphertext"""
+        return f"{self.label}|{self.format(ciphertext)}\n".encode()
+
+    def encrypt_all(self, data: bytes) -> List[str]:
+        """Split data into chunks and encrypt each of them"""
+        size = self.chunk_size
+        return [self.encrypt(data[i:i + size]) for i in range(0, len(data), size)]
+
+    def decrypt(self, data: str) -> bytes:
+        return self.decrypt_batch([data])[0]
+
+    def decrypt_batch(self, records: List[str]) -> List[bytes]:
+        """Plaintext chunks of several records, each restored to chunk_size bytes"""
+        return self.decrypt_values([self.parse(data) for data in records])
+
+    def decrypt_values(self, ciphertexts: list) -> List[bytes]:
+        """decrypt_batch for parsed ciphertexts"""
+        return [self._restore(self.cipher.decrypt(ciphertext)) for ciphertext in ciphertexts]
+
+    def _restore(self, plaintext: bytes) -> bytes:
+        # ElGamal and EC-ElGamal decryption strip leading zero bytes
+        return plaintext.rjust(self.chunk_size, b"\x00")
+
+class RSACodec(Codec):
+    """RSA|0x<ciphertext> records, 117-byte chunks under OAEP"""
+
+    algorithm = "RSA"
+    chunk_size = 117
+
+    def format(self, ciphertext: int) -> str:
+        return f"0x{ciphertext:x}"
+
+    def parse(self, data: str) -> int:
+        return int(data.strip(), 16)
+
+    @property
+    def ciphertext_widths(self) -> Tuple[int, ...]:
+        return ((self.cipher.n.bit_length() + 7) // 8,)
+
+class PairCodec(Codec):
+    """<label>|(c1,c2) records"""
+
+    def format(self, ciphertext: Tuple[int, int]) -> str:
+        c1, c2 = ciphertext
+        return f"({c1},{c2})"
+
+    def parse(self, data: str) -> Tuple[int, int]:
+        clean = data.strip().replace("(", "").replace(")", "").replace(" ", "")
+        if "," not in clean:
+            raise ValueError(f"Invalid {self.label} encrypted data format")
+        c1, c2 = map(int, clean.split(","))
+        return c1, c2
+
+class ElGamalCodec(PairCodec):
+    """ElGamal records, one shared modular inversion per batch"""
+
+    algorithm = "ElGamal"
+    chunk_size = 16
+    subgroup = False
+
+    @property
+    def label(self) -> str:
+        # Subgroup-mode records need their own decoding
+        return "ElGamalSubgroup" if self.cipher.subgroup else "ElGamal"
+
+    @classmethod
+    def from_private_key(cls, numbers: Tuple[int, ...]) -> "Codec":
+        x, p = numbers
+        return cls(cipher_class("ElGamal").from_private_key(x, p, subgroup=cls.subgroup))
+
+    @property
+    def ciphertext_widths(self) -> Tuple[int, ...]:
+        width = (self.cipher.p.bit_length() + 7) // 8
+        return (width, width)
+
+    def decrypt_values(self, ciphertexts: List[Tuple[int, int]]) -> List[bytes]:
+        return [self._restore(m) for m in self.cipher.decrypt_batch(ciphertexts)]
+
+class ElGamalSubgroupCodec(ElGamalCodec):
+    subgroup = True
+
+class ECElGamalCodec(PairCodec):
+    """EC-ElGamal records, 32-byte chunks (one SHA-256 key stream block)"""
+
+    algorithm = "ECElGamal"
+    chunk_size = 32
+
+    @property
+    def ciphertext_widths(self) -> Tuple[int, ...]:
+        # Compressed point (prefix byte + x) and the masked 32-byte block
+        from src.ECElGamal.ECElGamal import COORD_BYTES
+        return (COORD_BYTES + 1, self.chunk_size)
+#endregion
+
+#region Registry
+# Record label -> codec class
+CODECS: Dict[str, Type[Codec]] = {}
+
+def register_codec(label: str, codec_class: Type[Codec]) -> None:
+    """Make records with this label readable (and the codec's algorithm writable)"""
+    CODECS[label] = codec_class
+
+register_codec("RSA", RSACodec)
+register_codec("ElGamal", ElGamalCodec)
+register_codec("ElGamalSubgroup", ElGamalSubgroupCodec)
+register_codec("ECElGamal", ECElGamalCodec)
+
+def codec_class(label: str) -> Type[Codec]:
+    if label not in CODECS:
+        raise ValueError(f"Unknown record format: {label}")
+    return CODECS[label]
+
+def codec_for(cipher) -> Codec:
+    """Codec for an RSA / ElGamal / ECElGamal instance"""
+    return codec_class(algorithm_of(cipher))(cipher)
+
+def codec_from_private_key(label: str, numbers: Tuple[int, ...]) -> Codec:
+    """Decrypting codec for records of this label from (d, n), (x, p) or (x,)"""
+    return codec_class(label).from_private_key(numbers)
+#endregion
@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from codec import (CODECS, Codec, RSACodec, codec_for, codec_class, codec_from_private_key,
+                   register_codec)
+from src.RSA.rsa import RSA
+from src.ElGamal.ElGamal import ElGamal
+from src.ECElGamal.ECElGamal import ECElGamal
+
+class TestCodec(unittest.TestCase):
+    """encrypt.txt record codec Test Class"""
+
+    @classmethod
+    def setUpClass(cls):
+        rsa_pub, rsa_priv = RSA.create_keypair(2048)
+        elg_pub, elg_priv = ElGamal.create_keypair(group="ffdhe2048")
+        sub_pub, sub_priv = ElGamal.create_keypair(group="ffdhe2048", subgroup=True)
+        ec_pub, ec_priv = ECElGamal.create_keypair()
+        cls.pairs = {
+            "RSA": (rsa_pub, rsa_priv, (rsa_priv.d, rsa_priv.n)),
+            "ElGamal": (elg_pub, elg_priv, (elg_priv.x, elg_priv.p)),
+            "ElGamalSubgroup": (sub_pub, sub_priv, (sub_priv.x, sub_priv.p)),
+            "ECElGamal": (ec_pub, ec_priv, (ec_priv.x,)),
+        }
+
+    def test_round_trip(self):
+        """Records written with the public key open with the key instance and with bare numbers"""
+        for label, (pub, priv, numbers) in self.pairs.items():
+            with self.subTest(label=label):
+                codec = codec_for(pub)
+                self.assertEqual(codec.label, label)
+                data = b"\x00\x00" + os.urandom(3 * codec.chunk_size)  # Leading zeros, short last chunk
+                records = codec.encrypt_all(data)
+                self.assertEqual(len(records), 4)
+                expected = [codec.pad(data[i:i + codec.chunk_size])
+                            for i in range(0, len(data), codec.chunk_size)]
+                self.assertEqual(codec_for(priv).decrypt_batch(records), expected)
+                self.assertEqual(codec_from_private_key(label, numbers).decrypt_batch(records), expected)
+
+                line = codec.encrypt_record(data[:5]).decode()
+                prefix, body = line.rstrip("\n").split("|", 1)
+                self.assertEqual(prefix, label)
+                self.assertEqual(codec_for(priv).decrypt(body), codec.pad(data[:5]))
+
+    def test_zero_chunks(self):
+        """All-zero chunks and a zero-padded short last chunk come back intact"""
+        for label, (pub, priv, numbers) in self.pairs.items():
+            with self.subTest(label=label):
+                codec = codec_for(pub)
+                data = bytes(2 * codec.chunk_size) + b"\x00\x00\x01"
+                records = codec.encrypt_all(data)
+                expected = [bytes(codec.chunk_size), bytes(codec.chunk_size), codec.pad(b"\x00\x00\x01")]
+                self.assertEqual(codec_for(priv).decrypt_batch(records), expected)
+                self.assertEqual(codec_from_private_key(label, numbers).decrypt_batch(records), expected)
+                body = codec.encrypt_record(bytes(3)).decode().rstrip("\n").split("|", 1)[1]
+                self.assertEqual(codec_for(priv).decrypt(body), bytes(codec.chunk_size))
+
+    def test_record_parsing(self):
+        pub, priv, _ = self.pairs["ElGamal"]
+        c1, c2 = pub.encrypt(b"abc")
+        codec = codec_for(priv)
+        self.assertEqual(codec.decrypt(f" ({c1}, {c2}) \n").lstrip(b"\x00"), b"abc")
+        with self.assertRaises(ValueError):
+            codec.decrypt("12345")
+        self.assertEqual(RSACodec(None).parse("0xff\n"), 255)
+
+    def test_fixed_width_form(self):
+        """pack_into / unpack_from round trip at fixed offsets, as used by the worker pool"""
+        for label, (pub, priv, _) in self.pairs.items():
+            with self.subTest(label=label):
+                codec = codec_for(pub)
+                chunks = [codec.pad(os.urandom(codec.chunk_size - i)) for i in range(3)]
+                width = codec.ciphertext_size
+                buffer = bytearray(len(chunks) * width)
+                for i, chunk in enumerate(chunks):
+                    codec.pack_into(buffer, i * width, pub.encrypt(chunk))
+                ciphertexts = [codec.unpack_from(memoryview(buffer), i * width) for i in range(len(chunks))]
+                self.assertEqual(codec_for(priv).decrypt_values(ciphertexts), chunks)
+                record = codec.record(ciphertexts[0]).decode()
+                self.assertEqual(codec_for(priv).decrypt(record.split("|", 1)[1]), chunks[0])
+
+    def test_incomplete_codec(self):
+        """A codec without format / parse / ciphertext_widths cannot be built"""
+        class HalfCodec(Codec):
+            algorithm = "RSA"
+            chunk_size = 117
+
+            def format(self, ciphertext):
+                return str(ciphertext)
+
+        class NoWidthCodec(HalfCodec):
+            def parse(self, data):
+                return int(data)
+
+        pub, _, _ = self.pairs["RSA"]
+        for codec in (HalfCodec, NoWidthCodec):
+            with self.assertRaises(TypeError):
+                codec(pub)
+
+    def test_registry(self):
+        with self.assertRaises(ValueError):
+            codec_class("DES")
+
+        class LoudRSACodec(RSACodec):
+            def format(self, ciphertext):
+                return super().format(ciphertext).upper()
+
+        register_codec("LoudRSA", LoudRSACodec)
+        try:
+            self.assertIs(codec_class("LoudRSA"), LoudRSACodec)
+            pub, priv, numbers = self.pairs["RSA"]
+            record = LoudRSACodec(pub).encrypt(b"hi")
+            self.assertTrue(record.startswith("0X"))
+            self.assertEqual(codec_from_private_key("LoudRSA", numbers).decrypt(record)[:2], b"hi")
+        finally:
+            del CODECS["LoudRSA"]
+        self.assertTrue(all(issubclass(c, Codec) for c in CODECS.values()))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,357 @@
+import hashlib
+from typing import Tuple, Optional, List
+
+from src.Utils import randomness
+from src.Utils.secret import SecretInt
+
+#region Curve parameters (NIST P-256 / secp256r1, FIPS 186-4 D.1.2.3)
+P256 = {
+    "p": 0xffffffff00000001000000000000000000000000ffffffffffffffffffffffff,
+    "a": -3,
+    "b": 0x5ac635d8aa3a93e7b3ebbd55769886bc651d06b0cc53b0f63bce3c3e27d2604b,
+    "gx": 0x6b17d1f2e12c4247f8bce6e563a440f277037d812deb33a0f4a13945d898c296,
+    "gy": 0x4fe342e2fe1a7f9b8ee7eb4a7c0f9e162bce33576b315ececbb6406837bf51f5,
+    "n": 0xffffffff00000000ffffffffffffffffbce6faada7179e84f3b9cac2fc632551,
+}
+_P = P256["p"]
+_B = P256["b"]
+_N = P256["n"]
+_G = (P256["gx"], P256["gy"])
+
+WINDOW = 4  # Bits per window in scalar multiplication
+COORD_BYTES = 32  # Byte length of a field element
+MAX_PLAINTEXT = 32  # One SHA-256 output of key stream per block
+#endregion
+
+#region Jacobian coordinate arithmetic (a = -3)
+# A Jacobian point (X, Y, Z) stands for the affine point (X/Z^2, Y/Z^3); Z == 0 is infinity.
+_INFINITY = (1, 1, 0)
+
+def _double(P: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """Point doubling, dbl-2001-b formulas"""
+    X1, Y1, Z1 = P
+    if Z1 == 0 or Y1 == 0:
+        return _INFINITY
+    delta = Z1 * Z1 % _P
+    gamma = Y1 * Y1 % _P
+    beta = X1 * gamma % _P
+    alpha = 3 * (X1 - delta) * (X1 + delta) % _P
+    X3 = (alpha * alpha - 8 * beta) % _P
+    Z3 = ((Y1 + Z1) ** 2 - gamma - delta) % _P
+    Y3 = (alpha * (4 * beta - X3) - 8 * gamma * gamma) % _P
+    return (X3, Y3, Z3)
+
+def _add(P: Tuple[int, int, int], Q: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """General Jacobian addition"""
+    X1, Y1, Z1 = P
+    X2, Y2, Z2 = Q
+    if Z1 == 0:
+        return Q
+    if Z2 == 0:
+        return P
+    Z1Z1 = Z1 * Z1 % _P
+    Z2Z2 = Z2 * Z2 % _P
+    U1 = X1 * Z2Z2 % _P
+    U2 = X2 * Z1Z1 % _P
+    S1 = Y1 * Z2 * Z2Z2 % _P
+    S2 = Y2 * Z1 * Z1Z1 % _P
+    H = (U2 - U1) % _P
+    R = (S2 - S1) % _P
+    if H == 0:
+        return _double(P) if R == 0 else _INFINITY
+    H2 = H * H % _P
+    H3 = H * H2 % _P
+    U1H2 = U1 * H2 % _P
+    X3 = (R * R - H3 - 2 * U1H2) % _P
+    Y3 = (R * (U1H2 - X3) - S1 * H3) % _P
+    Z3 = H * Z1 * Z2 % _P
+    return (X3, Y3, Z3)
+
+def _add_affine(P: Tuple[int, int, int], Q: Tuple[int, int]) -> Tuple[int, int, int]:
+    """Mixed addition of a Jacobian point and an affine point (Z2 = 1)"""
+    X1, Y1, Z1 = P
+    if Z1 == 0:
+        return (Q[0], Q[1], 1)
+    Z1Z1 = Z1 * Z1 % _P
+    U2 = Q[0] * Z1Z1 % _P
+    S2 = Q[1] * Z1 * Z1Z1 % _P
+    H = (U2 - X1) % _P
+    R = (S2 - Y1) % _P
+    if H == 0:
+        return _double(P) if R == 0 else _INFINITY
+    H2 = H * H % _P
+    H3 = H * H2 % _P
+    U1H2 = X1 * H2 % _P
+    X3 = (R * R - H3 - 2 * U1H2) % _P
+    Y3 = (R * (U1H2 - X3) - Y1 * H3) % _P
+    Z3 = H * Z1 % _P
+    return (X3, Y3, Z3)
+
+def _to_affine(P: Tuple[int, int, int]) -> Optional[Tuple[int, int]]:
+    X, Y, Z = P
+    if Z == 0:
+        return None
+    z_inv = pow(Z, -1, _P)
+    z_inv2 = z_inv * z_inv % _P
+    return (X * z_inv2 % _P, Y * z_inv2 * z_inv % _P)
+
+def _batch_to_affine(points: List[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+    """Convert many Jacobian points with a single inversion (Montgomery's trick)"""
+    prefix = []
+    acc = 1
+    for _, _, Z in points:
+        prefix.append(acc)
+        acc = acc * Z % _P
+    inv = pow(acc, -1, _P)
+    result = [None] * len(points)
+    for i in range(len(points) - 1, -1, -1):
+        X, Y, Z = points[i]
+        z_inv = inv * prefix[i] % _P
+        inv = inv * Z % _P
+        z_inv2 = z_inv * z_inv % _P
+        result[i] = (X * z_inv2 % _P, Y * z_inv2 * z_inv % _P)
+    return result
+#endregion
+
+#region Scalar multiplication
+def _window_table(point: Tuple[int, int]) -> List[Tuple[int, int]]:
+    """Affine multiples 1P .. (2^w - 1)P for fixed-window multiplication"""
+    table = [(point[0], point[1], 1)]
+    for _ in range((1 << WINDOW) - 2):
+        table.append(_add_affine(table[-1], point))
+    return _batch_to_affine(table)
+
+def _multiply(k: int, point: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+    """Variable-base k*P with a fixed 4-bit window"""
+    table = _window_table(point)
+    mask = (1 << WINDOW) - 1
+    R = _INFINITY
+    for shift in range(((k.bit_length() + WINDOW - 1) // WINDOW - 1) * WINDOW, -1, -WINDOW):
+        for _ in range(WINDOW):
+            R = _double(R)
+        digit = (k >> shift) & mask
+        if digit:
+            R = _add_affine(R, table[digit - 1])
+    return _to_affine(R)
+
+class _FixedBaseTable:
+    """
+    Comb table for a point that is multiplied many times (G, or a public key)
+
+    Row i holds j * 2^(w*i) * P for j = 1 .. 2^w - 1, so k*P is the sum of one
+    entry per window and needs no doublings at all.
+    """
+
+    def __init__(self, point: Tuple[int, int]):
+        rows = (_N.bit_length() + WINDOW - 1) // WINDOW
+        self.rows = []
+        base = point
+        for _ in range(rows):
+            row = _window_table(base)
+            self.rows.append(row)
+            # Next row base: 2^w * base = (2^w - 1) * base + base
+            base = _to_affine(_add_affine((row[-1][0], row[-1][1], 1), base))
+
+    def multiply(self, k: int) -> Optional[Tuple[int, int]]:
+        mask = (1 << WINDOW) - 1
+        R = _INFINITY
+        for row in self.rows:
+            digit = k & mask
+            if digit:
+                R = _add_affine(R, row[digit - 1])
+            k >>= WINDOW
+        return _to_affine(R)
+
+# Generator table is shared by every key and built on first use
+_G_TABLE: Optional[_FixedBaseTable] = None
+
+def _multiply_generator(k: int) -> Tuple[int, int]:
+    global _G_TABLE
+    if _G_TABLE is None:
+        _G_TABLE = _FixedBaseTable(_G)
+    return _G_TABLE.multiply(k)
+#endregion
+
+#region Point encoding
+def _is_on_curve(point: Tuple[int, int]) -> bool:
+    x, y = point
+    if not (0 <= x < _P and 0 <= y < _P):
+        return False
+    return (y * y - (x * x * x - 3 * x + _B)) % _P == 0
+
+def compress_point(point: Tuple[int, int]) -> int:
+    """SEC1 compressed encoding (0x02/0x03 || x) as an integer"""
+    x, y = point
+    return ((2 + (y & 1)) << (8 * COORD_BYTES)) | x
+
+def decompress_point(value: int) -> Tuple[int, int]:
+    """Inverse of compress_point, validates that the point is on the curve"""
+    prefix = value >> (8 * COORD_BYTES)
+    x = value & ((1 << (8 * COORD_BYTES)) - 1)
+    if prefix not in (2, 3) or x >= _P:
+        raise ValueError("ERR318: Invalid compressed point")
+    rhs = (x * x * x - 3 * x + _B) % _P
+    y = pow(rhs, (_P + 1) // 4, _P)  # p = 3 (mod 4)
+    if y * y % _P != rhs:
+        raise ValueError("ERR318: Invalid compressed point")
+    if (y & 1) != (prefix & 1):
+        y = _P - y
+    return (x, y)
+#endregion
+
+class ECElGamalKeyGenerator:
+    """
+    Elliptic-curve ElGamal Key Generator (NIST P-256)
+
+    Features:
+    1. Instant key generation (one fixed-base scalar multiplication)
+    2. Supports custom private key x
+    3. Public key validation (point on curve, not infinity)
+    """
+
+    CURVES = {"P-256": P256}
+
+    @staticmethod
+    def generate_keypair(
+        curve: str = "P-256",
+        x: Optional[int] = None
+    ) -> Tuple[Tuple[int, int], int]:
+        """
+        Generate EC-ElGamal key pair
+
+        :param curve: Curve name (only "P-256" is supported)
+        :param x: Custom private key in [1, n-1] (optional)
+        :return: (public point (Qx, Qy), private scalar x)
+        """
+        if curve not in ECElGamalKeyGenerator.CURVES:
+            raise ValueError(f"ERR301: Unsupported curve {curve}")
+        if x is None:
+            x = randomness.randbelow(_N - 1) + 1
+        else:
+            if not isinstance(x, int):
+                raise TypeError("ERR302: x must be an integer")
+            if not (0 < x < _N):
+                raise ValueError("ERR303: x must satisfy 0 < x < n")
+        return _multiply_generator(x), x
+
+class ECElGamal:
+    """EC-ElGamal (hashed ElGamal / ECIES-style) encryption and decryption class"""
+    def __init__(self, public_key: Tuple[int, int], private_key: Optional[int] = None):
+        """
+        Initialize EC-ElGamal instance
+
+        :param public_key: Public point (Qx, Qy)
+        :param private_key: Private scalar x
+        """
+        self.Q = self._validate_public_key(public_key)
+        self._x = None
+        self._q_table = None
+
+        if private_key is not None:
+            if not (0 < private_key < _N):
+                raise ValueError("ERR311: Private key out of range")
+            if _multiply_generator(private_key) != self.Q:
+                raise ValueError("ERR312: Private key doesn't match public key")
+            self._x = SecretInt(private_key)
+
+    @property
+    def x(self) -> Optional[int]:
+        """Private scalar, read from its SecretInt for each operation"""
+        return self._x.value if self._x is not None else None
+
+    def zeroize(self) -> None:
+        """Wipe the private key, the instance can only encrypt afterwards"""
+        if self._x is not None:
+            self._x.zeroize()
+            self._x = None
+
+    @staticmethod
+    def _validate_public_key(key: Tuple[int, int]) -> Tuple[int, int]:
+        """Validate public key format"""
+        if len(key) != 2:
+            raise ValueError("ERR313: Public key must be (Qx, Qy)")
+        point = tuple(key)
+        if not _is_on_curve(point):
+            raise ValueError("ERR314: Public key is not a point on P-256")
+        return point
+
+    @staticmethod
+    def _mask(c1: int, shared: Tuple[int, int]) -> int:
+        """Key stream for one block: SHA-256(C1 || S.x)"""
+        digest = hashlib.sha256(
+            c1.to_bytes(COORD_BYTES + 1, 'big') + shared[0].to_bytes(COORD_BYTES, 'big')
+        ).digest()
+        return int.from_bytes(digest, 'big')
+
+    def encrypt(self, plaintext: bytes) -> Tuple[int, int]:
+        """
+        Encrypt data using the public key
+
+        :param plaintext: Plaintext byte data (at most 32 bytes)
+        :return: Ciphertext tuple (c1 = compressed ephemeral point, c2 = masked message)
+        """
+        if not isinstance(plaintext, bytes):
+            raise TypeError("ERR315: Plaintext must be bytes")
+        if len(plaintext) > MAX_PLAINTEXT:
+            raise ValueError(f"ERR316: Plaintext too long (maximum {MAX_PLAINTEXT} bytes)")
+
+        # The public key is reused for every block, so it gets its own comb table
+        if self._q_table is None:
+            self._q_table = _FixedBaseTable(self.Q)
+
+        y = randomness.randbelow(_N - 1) + 1
+        c1 = compress_point(_multiply_generator(y))
+        shared = self._q_table.multiply(y)
+        m = int.from_bytes(plaintext, byteorder='big')
+        return (c1, m ^ self._mask(c1, shared))
+
+    def decrypt(self, ciphertext: Tuple[int, int]) -> bytes:
+        """
+        Decrypt data using the private key
+
+        :param ciphertext: Ciphertext tuple (c1, c2)
+        :return: Decrypted byte data
+        """
+        if self._x is None:
+            raise RuntimeError("ERR317: Private key not available")
+
+        c1, c2 = ciphertext
+        if not (0 <= c2 < (1 << (8 * MAX_PLAINTEXT))):
+            raise ValueError("ERR318: Invalid ciphertext values")
+        shared = _multiply(self._x.value, decompress_point(c1))
+        m = c2 ^ self._mask(c1, shared)
+        return m.to_bytes(MAX_PLAINTEXT, byteorder='big').lstrip(b'\x00')  # Remove leading zeros
+
+    @classmethod
+    def from_private_key(cls, x: int) -> 'ECElGamal':
+        """Rebuild a decrypting instance from the private scalar alone"""
+        public_key, _ = ECElGamalKeyGenerator.generate_keypair(x=x)
+        return cls(public_key=public_key, private_key=x)
+
+    @classmethod
+    def create_keypair(cls, bit_length: int = 256) -> Tuple['ECElGamal', 'ECElGamal']:
+        """
+        Create paired EC-ElGamal instances
+
+        :param bit_length: Curve size (only 256 is supported)
+        :return: (Public key instance, Private key instance)
+        """
+        if bit_length != 256:
+            raise ValueError("ERR301: Only 256-bit curves (P-256) are supported")
+        public_key, private_key = ECElGamalKeyGenerator.generate_keypair()
+        return (
+            cls(public_key=public_key),
+            cls(public_key=public_key, private_key=private_key)
+        )
+
+# Usage example
+if __name__ == "__main__":
+    alice_public, alice_private = ECElGamal.create_keypair()
+
+    message = b"Hello, EC-ElGamal!"
+    ciphertext = alice_public.encrypt(message)
+    print("Encryption result:", ciphertext)
+    print("Public key:", alice_public.Q)
+
+    decrypted = alice_private.decrypt(ciphertext)
+    print("Decryption result:", decrypted.decode('utf-8'))
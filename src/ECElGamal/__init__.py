@@ -0,0 +1 @@
+"""EC-ElGamal on NIST P-256 (src.ECElGamal.ECElGamal)"""
@@ -0,0 +1,60 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from ECElGamal import (ECElGamal, ECElGamalKeyGenerator, compress_point, decompress_point,
+                       _multiply, _multiply_generator, _G, _N, MAX_PLAINTEXT)
+
+class TestECElGamal(unittest.TestCase):
+    """EC-ElGamal (P-256) Test Class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.public, cls.private = ECElGamal.create_keypair()
+
+    def test_curve_arithmetic(self):
+        """Known multiple of G and group order"""
+        self.assertEqual(
+            _multiply(2, _G)[0],
+            0x7cf27b188d034f7e8a52380304b51ac3c08969e277f21b35a60b48fc47669978
+        )
+        self.assertIsNone(_multiply(_N, _G))
+        for k in (1, 3, 0xdeadbeef, _N - 1):
+            with self.subTest(k=k):
+                self.assertEqual(_multiply_generator(k), _multiply(k, _G))
+
+    def test_point_compression(self):
+        point = _multiply_generator(123456789)
+        self.assertEqual(decompress_point(compress_point(point)), point)
+        with self.assertRaises(ValueError):
+            decompress_point((4 << 256) | point[0])
+
+    def test_encryption_decryption_cycle(self):
+        for plaintext in (b"A", os.urandom(16), b"\x01" * MAX_PLAINTEXT, "English test".encode('utf-8')):
+            with self.subTest(plaintext=plaintext):
+                ciphertext = self.public.encrypt(plaintext)
+                self.assertEqual(self.private.decrypt(ciphertext), plaintext)
+
+    def test_ciphertext_size(self):
+        """Ciphertext is a 33-byte point plus a 32-byte masked block"""
+        c1, c2 = self.public.encrypt(os.urandom(MAX_PLAINTEXT))
+        self.assertLessEqual((c1.bit_length() + 7) // 8 + (c2.bit_length() + 7) // 8, 65)
+
+    def test_input_validation(self):
+        with self.assertRaises(TypeError):
+            self.public.encrypt("Unencoded string")
+        with self.assertRaises(ValueError):
+            self.public.encrypt(b"x" * (MAX_PLAINTEXT + 1))
+        with self.assertRaises(RuntimeError):
+            self.public.decrypt(self.public.encrypt(b"x"))
+        with self.assertRaises(ValueError):
+            ECElGamal((1, 2))
+        with self.assertRaises(ValueError):
+            ECElGamalKeyGenerator.generate_keypair(x=_N)
+
+    def test_from_private_key(self):
+        restored = ECElGamal.from_private_key(self.private.x)
+        self.assertEqual(restored.Q, self.public.Q)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -1,7 +1,383 @@
-import random
 import math
-import os
-from typing import Tuple, Optional
+import functools
+from typing import List, Tuple, Optional
+
+from src.Utils import randomness, bigint
+from src.Utils.secret import SecretInt
+
+#region Standardized groups
+# Safe primes p = 2q + 1 from RFC 3526 (MODP) and RFC 7919 (FFDHE), all with g = 2.
+# g = 2 is a quadratic residue modulo these primes, so it generates the subgroup of order q.
+STANDARD_GROUPS = {
+    "modp2048": (
+        """
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AACAA68 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "modp3072": (
+        """
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A93AD2CA FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "modp4096": (
+        """
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A9210801 1A723C12 A787E6D7
+        88719A10 BDBA5B26 99C32718 6AF4E23C 1A946834 B6150BDA 2583E9CA 2AD44CE8
+        DBBBC2DB 04DE8EF9 2E8EFC14 1FBECAA6 287C5947 4E6BC05D 99B2964F A090C3A2
+        233BA186 515BE7ED 1F612970 CEE2D7AF B81BDD76 2170481C D0069127 D5B05AA9
+        93B4EA98 8D8FDDC1 86FFB7DC 90A6C08F 4DF435C9 34063199 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "modp6144": (
+        """
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A9210801 1A723C12 A787E6D7
+        88719A10 BDBA5B26 99C32718 6AF4E23C 1A946834 B6150BDA 2583E9CA 2AD44CE8
+        DBBBC2DB 04DE8EF9 2E8EFC14 1FBECAA6 287C5947 4E6BC05D 99B2964F A090C3A2
+        233BA186 515BE7ED 1F612970 CEE2D7AF B81BDD76 2170481C D0069127 D5B05AA9
+        93B4EA98 8D8FDDC1 86FFB7DC 90A6C08F 4DF435C9 34028492 36C3FAB4 D27C7026
+        C1D4DCB2 602646DE C9751E76 3DBA37BD F8FF9406 AD9E530E E5DB382F 413001AE
+        B06A53ED 9027D831 179727B0 865A8918 DA3EDBEB CF9B14ED 44CE6CBA CED4BB1B
+        DB7F1447 E6CC254B 33205151 2BD7AF42 6FB8F401 378CD2BF 5983CA01 C64B92EC
+        F032EA15 D1721D03 F482D7CE 6E74FEF6 D55E702F 46980C82 B5A84031 900B1C9E
+        59E7C97F BEC7E8F3 23A97A7E 36CC88BE 0F1D45B7 FF585AC5 4BD407B2 2B4154AA
+        CC8F6D7E BF48E1D8 14CC5ED2 0F8037E0 A79715EE F29BE328 06A1D58B B7C5DA76
+        F550AA3D 8A1FBFF0 EB19CCB1 A313D55C DA56C9EC 2EF29632 387FE8D7 6E3C0468
+        043E8F66 3F4860EE 12BF2D5B 0B7474D6 E694F91E 6DCC4024 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "modp8192": (
+        """
+        FFFFFFFF FFFFFFFF C90FDAA2 2168C234 C4C6628B 80DC1CD1 29024E08 8A67CC74
+        020BBEA6 3B139B22 514A0879 8E3404DD EF9519B3 CD3A431B 302B0A6D F25F1437
+        4FE1356D 6D51C245 E485B576 625E7EC6 F44C42E9 A637ED6B 0BFF5CB6 F406B7ED
+        EE386BFB 5A899FA5 AE9F2411 7C4B1FE6 49286651 ECE45B3D C2007CB8 A163BF05
+        98DA4836 1C55D39A 69163FA8 FD24CF5F 83655D23 DCA3AD96 1C62F356 208552BB
+        9ED52907 7096966D 670C354E 4ABC9804 F1746C08 CA18217C 32905E46 2E36CE3B
+        E39E772C 180E8603 9B2783A2 EC07A28F B5C55DF0 6F4C52C9 DE2BCBF6 95581718
+        3995497C EA956AE5 15D22618 98FA0510 15728E5A 8AAAC42D AD33170D 04507A33
+        A85521AB DF1CBA64 ECFB8504 58DBEF0A 8AEA7157 5D060C7D B3970F85 A6E1E4C7
+        ABF5AE8C DB0933D7 1E8C94E0 4A25619D CEE3D226 1AD2EE6B F12FFA06 D98A0864
+        D8760273 3EC86A64 521F2B18 177B200C BBE11757 7A615D6C 770988C0 BAD946E2
+        08E24FA0 74E5AB31 43DB5BFC E0FD108E 4B82D120 A9210801 1A723C12 A787E6D7
+        88719A10 BDBA5B26 99C32718 6AF4E23C 1A946834 B6150BDA 2583E9CA 2AD44CE8
+        DBBBC2DB 04DE8EF9 2E8EFC14 1FBECAA6 287C5947 4E6BC05D 99B2964F A090C3A2
+        233BA186 515BE7ED 1F612970 CEE2D7AF B81BDD76 2170481C D0069127 D5B05AA9
+        93B4EA98 8D8FDDC1 86FFB7DC 90A6C08F 4DF435C9 34028492 36C3FAB4 D27C7026
+        C1D4DCB2 602646DE C9751E76 3DBA37BD F8FF9406 AD9E530E E5DB382F 413001AE
+        B06A53ED 9027D831 179727B0 865A8918 DA3EDBEB CF9B14ED 44CE6CBA CED4BB1B
+        DB7F1447 E6CC254B 33205151 2BD7AF42 6FB8F401 378CD2BF 5983CA01 C64B92EC
+        F032EA15 D1721D03 F482D7CE 6E74FEF6 D55E702F 46980C82 B5A84031 900B1C9E
+        59E7C97F BEC7E8F3 23A97A7E 36CC88BE 0F1D45B7 FF585AC5 4BD407B2 2B4154AA
+        CC8F6D7E BF48E1D8 14CC5ED2 0F8037E0 A79715EE F29BE328 06A1D58B B7C5DA76
+        F550AA3D 8A1FBFF0 EB19CCB1 A313D55C DA56C9EC 2EF29632 387FE8D7 6E3C0468
+        043E8F66 3F4860EE 12BF2D5B 0B7474D6 E694F91E 6DBE1159 74A3926F 12FEE5E4
+        38777CB6 A932DF8C D8BEC4D0 73B931BA 3BC832B6 8D9DD300 741FA7BF 8AFC47ED
+        2576F693 6BA42466 3AAB639C 5AE4F568 3423B474 2BF1C978 238F16CB E39D652D
+        E3FDB8BE FC848AD9 22222E04 A4037C07 13EB57A8 1A23F0C7 3473FC64 6CEA306B
+        4BCBC886 2F8385DD FA9D4B7F A2C087E8 79683303 ED5BDD3A 062B3CF5 B3A278A6
+        6D2A13F8 3F44F82D DF310EE0 74AB6A36 4597E899 A0255DC1 64F31CC5 0846851D
+        F9AB4819 5DED7EA1 B1D510BD 7EE74D73 FAF36BC3 1ECFA268 359046F4 EB879F92
+        4009438B 481C6CD7 889A002E D5EE382B C9190DA6 FC026E47 9558E447 5677E9AA
+        9E3050E2 765694DF C81F56E8 80B96E71 60C980DD 98EDD3DF FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "ffdhe2048": (
+        """
+        FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+        A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+        D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+        984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+        BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+        AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+        9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+        C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 61285C97 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "ffdhe3072": (
+        """
+        FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+        A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+        D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+        984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+        BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+        AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+        9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+        C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 611FCFDC DE355B3B 6519035B
+        BC34F4DE F99C0238 61B46FC9 D6E6C907 7AD91D26 91F7F7EE 598CB0FA C186D91C
+        AEFE1309 85139270 B4130C93 BC437944 F4FD4452 E2D74DD3 64F2E21E 71F54BFF
+        5CAE82AB 9C9DF69E E86D2BC5 22363A0D ABC52197 9B0DEADA 1DBF9A42 D5C4484E
+        0ABCD06B FA53DDEF 3C1B20EE 3FD59D7C 25E41D2B 66C62E37 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "ffdhe4096": (
+        """
+        FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+        A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+        D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+        984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+        BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+        AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+        9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+        C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 611FCFDC DE355B3B 6519035B
+        BC34F4DE F99C0238 61B46FC9 D6E6C907 7AD91D26 91F7F7EE 598CB0FA C186D91C
+        AEFE1309 85139270 B4130C93 BC437944 F4FD4452 E2D74DD3 64F2E21E 71F54BFF
+        5CAE82AB 9C9DF69E E86D2BC5 22363A0D ABC52197 9B0DEADA 1DBF9A42 D5C4484E
+        0ABCD06B FA53DDEF 3C1B20EE 3FD59D7C 25E41D2B 669E1EF1 6E6F52C3 164DF4FB
+        7930E9E4 E58857B6 AC7D5F42 D69F6D18 7763CF1D 55034004 87F55BA5 7E31CC7A
+        7135C886 EFB4318A ED6A1E01 2D9E6832 A907600A 918130C4 6DC778F9 71AD0038
+        092999A3 33CB8B7A 1A1DB93D 7140003C 2A4ECEA9 F98D0ACC 0A8291CD CEC97DCF
+        8EC9B55A 7F88A46B 4DB5A851 F44182E1 C68A007E 5E655F6A FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "ffdhe6144": (
+        """
+        FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+        A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+        D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+        984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+        BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+        AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+        9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+        C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 611FCFDC DE355B3B 6519035B
+        BC34F4DE F99C0238 61B46FC9 D6E6C907 7AD91D26 91F7F7EE 598CB0FA C186D91C
+        AEFE1309 85139270 B4130C93 BC437944 F4FD4452 E2D74DD3 64F2E21E 71F54BFF
+        5CAE82AB 9C9DF69E E86D2BC5 22363A0D ABC52197 9B0DEADA 1DBF9A42 D5C4484E
+        0ABCD06B FA53DDEF 3C1B20EE 3FD59D7C 25E41D2B 669E1EF1 6E6F52C3 164DF4FB
+        7930E9E4 E58857B6 AC7D5F42 D69F6D18 7763CF1D 55034004 87F55BA5 7E31CC7A
+        7135C886 EFB4318A ED6A1E01 2D9E6832 A907600A 918130C4 6DC778F9 71AD0038
+        092999A3 33CB8B7A 1A1DB93D 7140003C 2A4ECEA9 F98D0ACC 0A8291CD CEC97DCF
+        8EC9B55A 7F88A46B 4DB5A851 F44182E1 C68A007E 5E0DD902 0BFD64B6 45036C7A
+        4E677D2C 38532A3A 23BA4442 CAF53EA6 3BB45432 9B7624C8 917BDD64 B1C0FD4C
+        B38E8C33 4C701C3A CDAD0657 FCCFEC71 9B1F5C3E 4E46041F 388147FB 4CFDB477
+        A52471F7 A9A96910 B855322E DB6340D8 A00EF092 350511E3 0ABEC1FF F9E3A26E
+        7FB29F8C 183023C3 587E38DA 0077D9B4 763E4E4B 94B2BBC1 94C6651E 77CAF992
+        EEAAC023 2A281BF6 B3A739C1 22611682 0AE8DB58 47A67CBE F9C9091B 462D538C
+        D72B0374 6AE77F5E 62292C31 1562A846 505DC82D B854338A E49F5235 C95B9117
+        8CCF2DD5 CACEF403 EC9D1810 C6272B04 5B3B71F9 DC6B80D6 3FDD4A8E 9ADB1E69
+        62A69526 D43161C1 A41D570D 7938DAD4 A40E329C D0E40E65 FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+    "ffdhe8192": (
+        """
+        FFFFFFFF FFFFFFFF ADF85458 A2BB4A9A AFDC5620 273D3CF1 D8B9C583 CE2D3695
+        A9E13641 146433FB CC939DCE 249B3EF9 7D2FE363 630C75D8 F681B202 AEC4617A
+        D3DF1ED5 D5FD6561 2433F51F 5F066ED0 85636555 3DED1AF3 B557135E 7F57C935
+        984F0C70 E0E68B77 E2A689DA F3EFE872 1DF158A1 36ADE735 30ACCA4F 483A797A
+        BC0AB182 B324FB61 D108A94B B2C8E3FB B96ADAB7 60D7F468 1D4F42A3 DE394DF4
+        AE56EDE7 6372BB19 0B07A7C8 EE0A6D70 9E02FCE1 CDF7E2EC C03404CD 28342F61
+        9172FE9C E98583FF 8E4F1232 EEF28183 C3FE3B1B 4C6FAD73 3BB5FCBC 2EC22005
+        C58EF183 7D1683B2 C6F34A26 C1B2EFFA 886B4238 611FCFDC DE355B3B 6519035B
+        BC34F4DE F99C0238 61B46FC9 D6E6C907 7AD91D26 91F7F7EE 598CB0FA C186D91C
+        AEFE1309 85139270 B4130C93 BC437944 F4FD4452 E2D74DD3 64F2E21E 71F54BFF
+        5CAE82AB 9C9DF69E E86D2BC5 22363A0D ABC52197 9B0DEADA 1DBF9A42 D5C4484E
+        0ABCD06B FA53DDEF 3C1B20EE 3FD59D7C 25E41D2B 669E1EF1 6E6F52C3 164DF4FB
+        7930E9E4 E58857B6 AC7D5F42 D69F6D18 7763CF1D 55034004 87F55BA5 7E31CC7A
+        7135C886 EFB4318A ED6A1E01 2D9E6832 A907600A 918130C4 6DC778F9 71AD0038
+        092999A3 33CB8B7A 1A1DB93D 7140003C 2A4ECEA9 F98D0ACC 0A8291CD CEC97DCF
+        8EC9B55A 7F88A46B 4DB5A851 F44182E1 C68A007E 5E0DD902 0BFD64B6 45036C7A
+        4E677D2C 38532A3A 23BA4442 CAF53EA6 3BB45432 9B7624C8 917BDD64 B1C0FD4C
+        B38E8C33 4C701C3A CDAD0657 FCCFEC71 9B1F5C3E 4E46041F 388147FB 4CFDB477
+        A52471F7 A9A96910 B855322E DB6340D8 A00EF092 350511E3 0ABEC1FF F9E3A26E
+        7FB29F8C 183023C3 587E38DA 0077D9B4 763E4E4B 94B2BBC1 94C6651E 77CAF992
+        EEAAC023 2A281BF6 B3A739C1 22611682 0AE8DB58 47A67CBE F9C9091B 462D538C
+        D72B0374 6AE77F5E 62292C31 1562A846 505DC82D B854338A E49F5235 C95B9117
+        8CCF2DD5 CACEF403 EC9D1810 C6272B04 5B3B71F9 DC6B80D6 3FDD4A8E 9ADB1E69
+        62A69526 D43161C1 A41D570D 7938DAD4 A40E329C CFF46AAA 36AD004C F600C838
+        1E425A31 D951AE64 FDB23FCE C9509D43 687FEB69 EDD1CC5E 0B8CC3BD F64B10EF
+        86B63142 A3AB8829 555B2F74 7C932665 CB2C0F1C C01BD702 29388839 D2AF05E4
+        54504AC7 8B758282 2846C0BA 35C35F5C 59160CC0 46FD8251 541FC68C 9C86B022
+        BB709987 6A460E74 51A8A931 09703FEE 1C217E6C 3826E52C 51AA691E 0E423CFC
+        99E9E316 50C1217B 624816CD AD9A95F9 D5B80194 88D9C0A0 A1FE3075 A577E231
+        83F81D4A 3F2FA457 1EFC8CE0 BA8A4FE8 B6855DFE 72B0A66E DED2FBAB FBE58A30
+        FAFABE1C 5D71A87E 2F741EF8 C1FE86FE A6BBFDE5 30677F0D 97D11D49 F7A8443D
+        0822E506 A9F4614E 011E2A94 838FF88C D68C8BB7 C5C6424C FFFFFFFF FFFFFFFF
+        """,
+        2,
+    ),
+}
+
+class _FixedBaseTable:
+    """
+    Precomputed powers g^(j * 16^i) mod p for a fixed base
+
+    g^k then costs one multiplication per 4-bit digit of k and no squarings.
+    Rows are built on demand, so short exponents only pay for the rows they use.
+    Building all rows costs about four exponentiations, so the table is only
+    used for encryption, where g^y is computed once per block.
+    """
+
+    WINDOW = 4
+
+    def __init__(self, g: int, p: int):
+        self.p = p
+        self.rows = []
+        self._next_base = g
+
+    def _extend(self, rows: int) -> None:
+        p = self.p
+        while len(self.rows) < rows:
+            base = self._next_base
+            row = [1, base]
+            for _ in range((1 << self.WINDOW) - 2):
+                row.append(row[-1] * base % p)
+            self.rows.append(row)
+            self._next_base = row[-1] * base % p
+
+    def pow(self, k: int) -> int:
+        """Return g^k mod p"""
+        self._extend((k.bit_length() + self.WINDOW - 1) // self.WINDOW)
+        p = self.p
+        mask = (1 << self.WINDOW) - 1
+        result = 1
+        for row in self.rows:
+            if not k:
+                break
+            digit = k & mask
+            if digit:
+                result = result * row[digit] % p
+            k >>= self.WINDOW
+        return result
+
+@functools.lru_cache(maxsize=None)
+def get_standard_group(name: str) -> Tuple[int, int, int]:
+    """
+    Look up a standardized group
+
+    :param name: "modp2048" ... "modp8192" or "ffdhe2048" ... "ffdhe8192"
+    :return: (p, g, q) with q = (p - 1) / 2 the order of g
+    """
+    if name not in STANDARD_GROUPS:
+        raise ValueError(f"ERR219: Unknown group {name}, choose from {', '.join(STANDARD_GROUPS)}")
+    hex_p, g = STANDARD_GROUPS[name]
+    p = int("".join(hex_p.split()), 16)
+    return p, g, (p - 1) // 2
+
+@functools.lru_cache(maxsize=None)
+def _standard_group_primes() -> dict:
+    return {get_standard_group(name)[0]: name for name in STANDARD_GROUPS}
+
+@functools.lru_cache(maxsize=None)
+def _group_table(name: str) -> _FixedBaseTable:
+    """Fixed-base table for the generator of a standard group, shared by all keys"""
+    p, g, _ = get_standard_group(name)
+    return _FixedBaseTable(g, p)
+
+def standard_group_name(p: int, g: int) -> Optional[str]:
+    """Name of the standard group (p, g) belongs to, or None"""
+    name = _standard_group_primes().get(p)
+    if name is not None and STANDARD_GROUPS[name][1] == g:
+        return name
+    return None
+#endregion
+
+#region Subgroup mode
+# Exponent sizes from RFC 7919 section 5.2 (about twice the security level of p)
+SHORT_EXPONENT_BITS = ((2048, 225), (3072, 275), (4096, 325), (6144, 375), (8192, 400))
+
+def short_exponent_bits(p_bits: int) -> int:
+    """Length of a private / ephemeral exponent that matches the strength of a p_bits group"""
+    for size, bits in SHORT_EXPONENT_BITS:
+        if p_bits <= size:
+            return min(bits, p_bits - 2)
+    return 512
+
+def _jacobi(a: int, n: int) -> int:
+    """Jacobi symbol (a/n) for odd n > 0"""
+    a %= n
+    result = 1
+    while a:
+        zeros = (a & -a).bit_length() - 1
+        a >>= zeros
+        if zeros & 1 and n & 7 in (3, 5):
+            result = -result
+        if a & 3 == 3 and n & 3 == 3:
+            result = -result
+        a, n = n % a, a
+    return result if n == 1 else 0
+
+def encode_to_subgroup(m: int, p: int) -> int:
+    """
+    Map 0 <= m < q onto the quadratic residues mod p = 2q + 1
+
+    m + 1 is kept if it is a residue, otherwise p - (m + 1) is (-1 is a non-residue
+    for safe primes). Both land in the order-q subgroup, so c2 leaks nothing about m.
+    """
+    m += 1
+    return m if _jacobi(m, p) == 1 else p - m
+
+def decode_from_subgroup(m: int, p: int) -> int:
+    """Inverse of encode_to_subgroup"""
+    return m - 1 if m <= (p - 1) // 2 else p - m - 1
+#endregion
+
+def batch_inverse(values: List[int], p: int) -> List[int]:
+    """
+    Invert every value mod p with Montgomery's trick
+
+    One modular inversion plus 3(n-1) multiplications instead of n inversions.
+    All values must be invertible mod p.
+    """
+    if not values:
+        return []
+    prefix = [values[0]]
+    for v in values[1:]:
+        prefix.append(prefix[-1] * v % p)
+    inv = bigint.invert(prefix[-1], p)
+    result = [0] * len(values)
+    for i in range(len(values) - 1, 0, -1):
+        result[i] = inv * prefix[i - 1] % p
+        inv = inv * values[i] % p
+    result[0] = inv
+    return result
 
 class ElGamalKeyGenerator:
     """
@@ -9,9 +385,11 @@ class ElGamalKeyGenerator:
 
     Features:
     1. Supports custom safe prime p, generator g, and private key x
-    2. Secure memory wiping (compliant with NIST SP 800-88)
+    2. Private key kept in a zeroizable SecretInt
     3. Enhanced parameter validation
     4. Optimized primality testing algorithm
+    5. Instant key generation from RFC 3526 / RFC 7919 groups
+    6. Subgroup mode with short private exponents
     """
 
     MAX_RETRIES = 1000  # Maximum attempts to generate a prime number
@@ -21,7 +399,10 @@ class ElGamalKeyGenerator:
         bit_length: int = 2048,
         p: Optional[int] = None,
         g: Optional[int] = None,
-        x: Optional[int] = None
+        x: Optional[int] = None,
+        group: Optional[str] = None,
+        subgroup: bool = False,
+        budget=None
     ) -> Tuple[Tuple[int, int, int], int]:
         """
         Generate ElGamal key pair (supports automatic generation or custom parameters)
@@ -31,26 +412,36 @@ class ElGamalKeyGenerator:
         2. Prime number validity check (primality test + safe prime check)
         3. Generator validity check
         4. Private key range validation
-        """
-        #region Secure wiping function
-        def secure_wipe(num: int) -> None:
-            """Three-pass overwrite wiping compliant with NIST SP 800-88"""
-            if num is None:
-                return
-            try:
-                byte_len = (num.bit_length() + 7) // 8
-                buffer = bytearray(byte_len)
-                buffer[:] = os.urandom(byte_len)
-                for i in range(byte_len):
-                    buffer[i] ^= 0xFF
-                buffer[:] = b'\x00' * byte_len
-            finally:
-                del buffer
-        #endregion
 
+        With group (e.g. "ffdhe2048") p and g come from a standardized group
+        and only x is sampled (or checked, if given), so no prime search happens.
+
+        With subgroup=True g generates the subgroup of prime order q and x is a
+        short exponent (see short_exponent_bits); use the keys with ElGamal(..., subgroup=True).
+
+        :param budget: src.Utils.budget.KeygenBudget bounding the safe prime
+                       search (deadline, cancellation) and counting its progress
+        """
         #region Initialization cleanup
         p_val = g_val = x_val = h = q_val = None
         try:
+            #region Standardized group mode
+            if group is not None:
+                if p is not None or g is not None:
+                    raise ValueError("ERR220: group cannot be combined with custom p/g")
+                p, g, q_val = get_standard_group(group)
+                if x is None:
+                    x_val = ElGamalKeyGenerator._sample_exponent(p, q_val - 1, subgroup)
+                    x = x_val
+                elif not isinstance(x, int):
+                    raise TypeError("ERR202: p/g/x must be integers")
+                elif not (1 < x < q_val):
+                    raise ValueError(f"ERR206: x must satisfy 1 < x < {q_val}")
+                # One-off exponentiation, the shared table is left for encryption
+                h = bigint.powmod(g, x, p)
+                return ((p, g, h), x)
+            #endregion
+
             #region Parameter validation
             if (p is None or g is None or x is None) and not (p is None and g is None and x is None):
                 raise ValueError(
@@ -76,30 +467,36 @@ class ElGamalKeyGenerator:
                     raise ValueError("ERR204: p must be a safe prime")
 
                 # Generator validation
-                if pow(g, 2, p) == 1 or pow(g, q_val, p) == 1:
+                if subgroup:
+                    if g in (1, p - 1) or bigint.powmod(g, q_val, p) != 1:
+                        raise ValueError("ERR221: g must generate the subgroup of order q")
+                elif bigint.powmod(g, 2, p) == 1 or bigint.powmod(g, q_val, p) == 1:
                     raise ValueError("ERR205: g is not a valid generator")
 
                 # Private key range validation
-                if not (1 < x < p-1):
-                    raise ValueError(f"ERR206: x must satisfy 1 < x < {p-1}")
+                limit = q_val if subgroup else p - 1
+                if not (1 < x < limit):
+                    raise ValueError(f"ERR206: x must satisfy 1 < x < {limit}")
 
                 # Calculate public key h
-                h = pow(g, x, p)
+                h = bigint.powmod(g, x, p)
                 #endregion
             else:
                 #region Automatic generation mode
                 for _ in range(ElGamalKeyGenerator.MAX_RETRIES):
                     # Generate safe prime p
-                    p_val, q_val = ElGamalKeyGenerator._generate_safe_prime(bit_length)
+                    p_val, q_val = ElGamalKeyGenerator._generate_safe_prime(bit_length, budget)
 
-                    # Find generator g
+                    # Find generator g, squaring it gives a generator of the order-q subgroup
                     g_val = ElGamalKeyGenerator._find_generator(p_val, q_val)
+                    if subgroup:
+                        g_val = bigint.powmod(g_val, 2, p_val)
 
                     # Generate private key x
-                    x_val = random.randint(2, p_val-2)
+                    x_val = ElGamalKeyGenerator._sample_exponent(p_val, p_val - 2, subgroup)
 
                     # Calculate public key h
-                    h = pow(g_val, x_val, p_val)
+                    h = bigint.powmod(g_val, x_val, p_val)
 
                     if g_val and h:
                         break
@@ -112,22 +509,26 @@ class ElGamalKeyGenerator:
             return ((p, g, h), x)
 
         finally:
-            #region Secure cleanup
-            secure_wipe(p_val)
-            secure_wipe(g_val)
-            secure_wipe(x_val)
-            secure_wipe(q_val)
-            secure_wipe(h if 'h' in locals() else 0)
-            # Dereference
+            #region Cleanup
+            # Ints cannot be overwritten, drop the references; ElGamal keeps x as a SecretInt
             p_val = g_val = x_val = h = q_val = None
             #endregion
 
     @staticmethod
-    def _generate_safe_prime(bit_length: int) -> Tuple[int, int]:
+    def _sample_exponent(p: int, upper: int, subgroup: bool) -> int:
+        """Exponent in [2, upper], or a short one in subgroup mode"""
+        if subgroup:
+            upper = min(1 << short_exponent_bits(p.bit_length()), (p - 1) // 2 - 1)
+        return randomness.randint(2, upper)
+
+    @staticmethod
+    def _generate_safe_prime(bit_length: int, budget=None) -> Tuple[int, int]:
         """Generate safe prime p=2q+1"""
         for _ in range(ElGamalKeyGenerator.MAX_RETRIES):
-            q = ElGamalKeyGenerator._generate_prime(bit_length - 1)  # Adjust bit length calculation
+            q = ElGamalKeyGenerator._generate_prime(bit_length - 1, budget)  # Adjust bit length calculation
             p = 2 * q + 1
+            if budget is not None:
+                budget.tested()
             if ElGamalKeyGenerator._is_prime(p):
                 return p, q
         raise RuntimeError("ERR208: Safe prime generation timeout")
@@ -136,81 +537,72 @@ class ElGamalKeyGenerator:
     def _find_generator(p: int, q: int) -> int:
         """Find generator g"""
         for _ in range(10000):  # Increase attempts
-            g = random.randint(2, p-1)
-            if pow(g, 2, p) != 1 and pow(g, q, p) != 1:
+            g = randomness.randint(2, p-1)
+            if bigint.powmod(g, 2, p) != 1 and bigint.powmod(g, q, p) != 1:
                 return g
         raise RuntimeError("ERR209: Generator not found")
 
     @staticmethod
-    def _generate_prime(bit_length: int) -> int:
+    def _generate_prime(bit_length: int, budget=None) -> int:
         """Generate a prime number with specified bit length"""
-        SMALL_PRIMES = [
-            2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71,
-            73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151,
-            157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223, 227, 229, 233,
-            239, 241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311, 313, 317,
-            331, 337, 347, 349, 353, 359, 367, 373, 379, 383, 389, 397, 401, 409, 419,
-            421, 431, 433, 439, 443, 449, 457, 461, 463, 467, 479, 487, 491, 499, 503,
-            509, 521, 523, 541
-        ]
         for _ in range(10000):  # Increase attempts
-            candidate = random.getrandbits(bit_length)
-            candidate |= (1 << (bit_length - 1)) | 1  # Ensure the highest and lowest bits are 1
-            if any(candidate % p == 0 for p in SMALL_PRIMES if p < candidate):
-                continue
-            if ElGamalKeyGenerator._is_prime(candidate):
+            # Random start with the highest bit set, then the next prime after it
+            start = randomness.getrandbits(bit_length) | (1 << (bit_length - 1))
+            candidate = bigint.next_prime(start, budget)
+            if budget is not None:
+                budget.found()
+            if candidate.bit_length() == bit_length:
                 return candidate
         raise RuntimeError("ERR210: Prime generation timeout")
 
     @staticmethod
     def _is_prime(n: int, k: int = 64) -> bool:
-        """Optimized Miller-Rabin primality test"""
-        if n <= 1:
-            return False
-        if n <= 3:
-            return True
-        if n % 2 == 0:
-            return False
-
-        d = n - 1
-        s = 0
-        while d % 2 == 0:
-            d //= 2
-            s += 1
-
-        witnesses = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
-        if n >= 3825123056546413051:
-            witnesses = [random.randint(2, min(n-2, 1<<20)) for _ in range(k)]
-
-        for a in witnesses:
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(s - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        return True
+        """Miller-Rabin primality test (gmpy2 when installed)"""
+        return bigint.is_prime(n, k)
 
 class ElGamal:
     """ElGamal encryption and decryption class"""
-    def __init__(self, public_key: Tuple[int, int, int], private_key: Optional[int] = None):
+    def __init__(self, public_key: Tuple[int, int, int], private_key: Optional[int] = None,
+                 subgroup: bool = False):
         """
         Initialize ElGamal instance
 
         :param public_key: Public key (p, g, h)
         :param private_key: Private key x
+        :param subgroup: Encode messages into the order-q subgroup and use short
+                         ephemeral exponents (p must be a safe prime, g of order q)
         """
         self.p, self.g, self.h = self._validate_public_key(public_key)
-        self.x = private_key
+        self._x = None
+        self.subgroup = subgroup
+
+        # Keys in a standardized group share a cached fixed-base table for g
+        group = standard_group_name(self.p, self.g)
+        self._g_table = _group_table(group) if group else None
+
+        if subgroup:
+            # Standard group generators are known to have order q
+            if group is None and bigint.powmod(self.g, (self.p - 1) // 2, self.p) != 1:
+                raise ValueError("ERR221: g must generate the subgroup of order q")
+            self.exponent_bits = short_exponent_bits(self.p.bit_length())
 
         if private_key is not None:
-            if not (1 < self.x < self.p-1):
+            if not (1 < private_key < self.p-1):
                 raise ValueError("ERR211: Private key out of range")
-            if pow(self.g, self.x, self.p) != self.h:
+            if bigint.powmod(self.g, private_key, self.p) != self.h:
                 raise ValueError("ERR212: Private key doesn't match public key")
+            self._x = SecretInt(private_key)
+
+    @property
+    def x(self) -> Optional[int]:
+        """Private key, read from its SecretInt for each operation"""
+        return self._x.value if self._x is not None else None
+
+    def zeroize(self) -> None:
+        """Wipe the private key, the instance can only encrypt afterwards"""
+        if self._x is not None:
+            self._x.zeroize()
+            self._x = None
 
     @staticmethod
     def _validate_public_key(key: Tuple[int, int, int]) -> Tuple[int, int, int]:
@@ -222,6 +614,12 @@ class ElGamal:
             raise ValueError("ERR214: Public key parameters must be positive integers")
         return p, g, h
 
+    def _pow_g(self, k: int) -> int:
+        """g^k mod p, through the fixed-base table when one is available"""
+        if self._g_table is not None:
+            return self._g_table.pow(k)
+        return bigint.powmod(self.g, k, self.p)
+
     def encrypt(self, plaintext: bytes) -> Tuple[int, int]:
         """
         Encrypt data using the public key
@@ -233,23 +631,27 @@ class ElGamal:
             raise TypeError("ERR215: Plaintext must be bytes")
 
         m = int.from_bytes(plaintext, byteorder='big')
-        if m >= self.p:
-            raise ValueError(f"ERR216: Plaintext too large, maximum allowed value is {self.p-1}")
-
-        # Securely wipe temporary variables
-        y = s = None
-        try:
-            y = random.randint(2, self.p-2)
-            c1 = pow(self.g, y, self.p)
-            s = pow(self.h, y, self.p)
-            c2 = (m * s) % self.p
-            return (c1, c2)
-        finally:
-            # Secure wiping
-            if y is not None:
-                self._secure_wipe(y)
-            if s is not None:
-                self._secure_wipe(s)
+        limit = (self.p - 1) // 2 if self.subgroup else self.p
+        if m >= limit:
+            raise ValueError(f"ERR216: Plaintext too large, maximum allowed value is {limit-1}")
+        if self.subgroup:
+            m = encode_to_subgroup(m, self.p)
+
+        # Ephemeral values are plain ints that go out of scope on return
+        if self.subgroup:
+            y = randomness.randint(2, 1 << self.exponent_bits)
+        else:
+            y = randomness.randint(2, self.p-2)
+        c1 = self._pow_g(y)
+        s = bigint.powmod(self.h, y, self.p)
+        c2 = (m * s) % self.p
+        return (c1, c2)
+
+    def _check_ciphertext(self, c1: int, c2: int) -> None:
+        """Range check, c2 = 0 is the encryption of m = 0 (never produced in subgroup mode)"""
+        lowest = 1 if self.subgroup else 0
+        if not (0 < c1 < self.p and lowest <= c2 < self.p):
+            raise ValueError("ERR218: Invalid ciphertext values")
 
     def decrypt(self, ciphertext: Tuple[int, int]) -> bytes:
         """
@@ -258,49 +660,79 @@ class ElGamal:
         :param ciphertext: Ciphertext tuple (c1, c2)
         :return: Decrypted byte data
         """
-        if self.x is None:
+        if self._x is None:
             raise RuntimeError("ERR217: Private key not available")
 
         c1, c2 = ciphertext
-        if not (0 < c1 < self.p and 0 < c2 < self.p):
-            raise ValueError("ERR218: Invalid ciphertext values")
+        self._check_ciphertext(c1, c2)
 
-        # Securely wipe temporary variables
-        s = s_inv = None
-        try:
-            s = pow(c1, self.x, self.p)
-            s_inv = pow(s, -1, self.p)
-            m = (c2 * s_inv) % self.p
-            byte_length = (self.p.bit_length() + 7) // 8
-            return m.to_bytes(byte_length, byteorder='big').lstrip(b'\x00')  # Remove leading zeros
-        finally:
-            if s is not None:
-                self._secure_wipe(s)
-            if s_inv is not None:
-                self._secure_wipe(s_inv)
+        s = bigint.powmod(c1, self._x.value, self.p)
+        s_inv = bigint.invert(s, self.p)
+        m = (c2 * s_inv) % self.p
+        if self.subgroup:
+            m = decode_from_subgroup(m, self.p)
+        byte_length = (self.p.bit_length() + 7) // 8
+        return m.to_bytes(byte_length, byteorder='big').lstrip(b'\x00')  # Remove leading zeros
 
-    @staticmethod
-    def _secure_wipe(num: int) -> None:
-        """Securely wipe an integer"""
-        byte_len = (num.bit_length() + 7) // 8
-        buffer = bytearray(byte_len)
-        buffer[:] = os.urandom(byte_len)
-        for i in range(byte_len):
-            buffer[i] ^= 0xFF
-        buffer[:] = b'\x00' * byte_len
+    def decrypt_batch(self, ciphertexts: List[Tuple[int, int]], fold: bool = False) -> List[bytes]:
+        """
+        Decrypt many ciphertexts at once
+
+        The shared secrets s = c1^x are inverted together (see batch_inverse), so each
+        block costs one exponentiation. With fold=True, s^-1 is computed directly as
+        c1^(p-1-x) and no inversion is needed; this only pays off for full-length x.
+
+        :param ciphertexts: Ciphertext tuples (c1, c2)
+        :return: Decrypted byte data, in the same order
+        """
+        if self._x is None:
+            raise RuntimeError("ERR217: Private key not available")
+        for c1, c2 in ciphertexts:
+            self._check_ciphertext(c1, c2)
+
+        p = self.p
+        x = self._x.value
+        if fold:
+            exponent = p - 1 - x
+            s_invs = [bigint.powmod(c1, exponent, p) for c1, _ in ciphertexts]
+        else:
+            s_invs = batch_inverse([bigint.powmod(c1, x, p) for c1, _ in ciphertexts], p)
+        byte_length = (p.bit_length() + 7) // 8
+        plaintexts = []
+        for (_, c2), s_inv in zip(ciphertexts, s_invs):
+            m = c2 * s_inv % p
+            if self.subgroup:
+                m = decode_from_subgroup(m, p)
+            plaintexts.append(m.to_bytes(byte_length, byteorder='big').lstrip(b'\x00'))
+        return plaintexts
 
     @classmethod
-    def create_keypair(cls, bit_length: int = 2048) -> Tuple['ElGamal', 'ElGamal']:
+    def from_private_key(cls, x: int, p: int, g: int = 4, subgroup: bool = False) -> 'ElGamal':
+        """
+        Rebuild a decrypting instance from (x, p) alone
+
+        Decryption never uses g or h, so when g is unknown any base will do;
+        the default 4 is a square and therefore also valid in subgroup mode.
+        """
+        return cls((p, g, bigint.powmod(g, x, p)), x, subgroup=subgroup)
+
+    @classmethod
+    def create_keypair(cls, bit_length: int = 2048, group: Optional[str] = None,
+                       subgroup: bool = False) -> Tuple['ElGamal', 'ElGamal']:
         """
         Create paired ElGamal instances
 
         :param bit_length: Bit length of the safe prime p
+        :param group: Standardized group name (skips the prime search, bit_length is ignored)
+        :param subgroup: Short exponents with messages encoded into the order-q subgroup
         :return: (Public key instance, Private key instance)
         """
-        public_key, private_key = ElGamalKeyGenerator.generate_keypair(bit_length)
+        public_key, private_key = ElGamalKeyGenerator.generate_keypair(
+            bit_length, group=group, subgroup=subgroup
+        )
         return (
-            cls(public_key=public_key),
-            cls(public_key=public_key, private_key=private_key)
+            cls(public_key=public_key, subgroup=subgroup),
+            cls(public_key=public_key, private_key=private_key, subgroup=subgroup)
         )
 
 # Usage example
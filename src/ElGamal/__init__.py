@@ -0,0 +1 @@
+"""ElGamal over safe-prime and standardized groups (src.ElGamal.ElGamal)"""
@@ -0,0 +1,102 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from ElGamal import (ElGamal, ElGamalKeyGenerator, STANDARD_GROUPS, get_standard_group, standard_group_name,
+                     encode_to_subgroup, decode_from_subgroup, short_exponent_bits, batch_inverse)
+
+class TestElGamal(unittest.TestCase):
+    """ElGamal Test Class (fixed 512-bit key and standardized groups)"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Use the fixed 512-bit key from the benchmark scripts, generating one takes too long"""
+        cls.public_key = (11936966245886666310355597323468895655388895234025558571267960693264548662380542246089231939171623902721066455718445462299544950000439465893723685135296959, 11499825327589751345662729089808977934486585081590504608618955325081184140789034122870410506967384387048332706469724117339704785834768792055352263627902522, 2703982250158194427441560695163390911009446668861957312868532114059975088512964928565678379359482645322522579819261315928979284437240480724648460907085880)
+        cls.private_key = 8164016195568216788392026341181978242313002272846305206316993751909298472582201585403731230072151332698517788491442990089266455287443400535168658271699231
+        cls.elgamal_pub = ElGamal(cls.public_key)
+        cls.elgamal_priv = ElGamal(cls.public_key, cls.private_key)
+        cls.group_pub, cls.group_priv = ElGamal.create_keypair(group="ffdhe2048")
+
+    def test_encryption_decryption_cycle(self):
+        test_vectors = [b"A", os.urandom(16), b"\xFF\x00" * 8, "English test".encode('utf-8')]
+        for pub, priv in ((self.elgamal_pub, self.elgamal_priv), (self.group_pub, self.group_priv)):
+            for plaintext in test_vectors:
+                with self.subTest(p_bits=pub.p.bit_length(), plaintext=plaintext):
+                    self.assertEqual(priv.decrypt(pub.encrypt(plaintext)), plaintext)
+
+    def test_input_validation(self):
+        with self.assertRaises(TypeError):
+            self.elgamal_pub.encrypt("Unencoded string")
+        with self.assertRaises(ValueError):
+            self.elgamal_pub.encrypt(b"\xFF" * 65)
+        with self.assertRaises(RuntimeError):
+            self.elgamal_pub.decrypt((2, 3))
+        with self.assertRaises(ValueError):
+            ElGamal(self.public_key, self.private_key + 1)
+
+    def test_standard_groups(self):
+        """Group primes are safe primes and g generates the order-q subgroup"""
+        for name in ("modp2048", "ffdhe2048"):
+            with self.subTest(group=name):
+                p, g, q = get_standard_group(name)
+                self.assertEqual(p.bit_length(), 2048)
+                self.assertTrue(ElGamalKeyGenerator._is_prime(q, k=4))
+                self.assertEqual(pow(g, q, p), 1)
+                self.assertEqual(standard_group_name(p, g), name)
+        self.assertEqual(len(STANDARD_GROUPS), 10)
+
+    def test_group_keypair_validation(self):
+        with self.assertRaises(ValueError):
+            ElGamalKeyGenerator.generate_keypair(group="modp1024")
+        with self.assertRaises(ValueError):
+            ElGamalKeyGenerator.generate_keypair(p=23, g=5, group="ffdhe2048")
+        (p, g, h), x = ElGamalKeyGenerator.generate_keypair(x=12345, group="modp2048")
+        self.assertEqual(h, pow(g, 12345, p))
+
+    def test_subgroup_mode(self):
+        """Short exponents, and every encoded message lies in the order-q subgroup"""
+        pub, priv = ElGamal.create_keypair(group="ffdhe2048", subgroup=True)
+        self.assertLessEqual(priv.x.bit_length(), short_exponent_bits(2048))
+        for plaintext in (b"\x00", os.urandom(16), b"\xFF" * 16):
+            with self.subTest(plaintext=plaintext):
+                c1, c2 = pub.encrypt(plaintext)
+                self.assertEqual(pow(c2, pub.p // 2, pub.p), 1)
+                self.assertEqual(priv.decrypt((c1, c2)).rjust(len(plaintext), b"\x00"), plaintext)
+        p, g, q = get_standard_group("ffdhe2048")
+        for m in (0, 1, 12345, q - 1):
+            self.assertEqual(decode_from_subgroup(encode_to_subgroup(m, p), p), m)
+        # The fixed 512-bit key uses a full-order generator
+        with self.assertRaises(ValueError):
+            ElGamal(self.public_key, subgroup=True)
+
+    def test_batch_decryption(self):
+        """Shared-inverse and folded batch decryption agree with decrypt"""
+        plaintexts = [os.urandom(16) for _ in range(8)]
+        ciphertexts = [self.elgamal_pub.encrypt(m) for m in plaintexts]
+        expected = [self.elgamal_priv.decrypt(c) for c in ciphertexts]
+        self.assertEqual(self.elgamal_priv.decrypt_batch(ciphertexts), expected)
+        self.assertEqual(self.elgamal_priv.decrypt_batch(ciphertexts, fold=True), expected)
+        self.assertEqual(self.elgamal_priv.decrypt_batch([]), [])
+        self.assertEqual(batch_inverse([3, 5, 6], 7), [5, 3, 6])
+        with self.assertRaises(RuntimeError):
+            self.elgamal_pub.decrypt_batch(ciphertexts)
+
+    def test_zero_message(self):
+        """m = 0 encrypts to c2 = 0 without the subgroup encoding, which decrypts like any other value"""
+        for plaintext in (b"", b"\x00" * 16):
+            ciphertext = self.elgamal_pub.encrypt(plaintext)
+            self.assertEqual(ciphertext[1], 0)
+            self.assertEqual(self.elgamal_priv.decrypt(ciphertext), b"")
+            self.assertEqual(self.elgamal_priv.decrypt_batch([ciphertext, ciphertext]), [b"", b""])
+        with self.assertRaises(ValueError):
+            self.elgamal_priv.decrypt((0, 0))
+        # The subgroup encoding never yields c2 = 0
+        pub, priv = ElGamal.create_keypair(group="ffdhe2048", subgroup=True)
+        c1, _ = pub.encrypt(b"")
+        with self.assertRaises(ValueError):
+            priv.decrypt((c1, 0))
+        with self.assertRaises(ValueError):
+            priv.decrypt_batch([(c1, 0)])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
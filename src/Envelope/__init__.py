@@ -0,0 +1 @@
+"""Multi-recipient envelopes (src.Envelope.envelope)"""
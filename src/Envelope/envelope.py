@@ -0,0 +1,332 @@
+import io
+import os
+import hmac
+import shutil
+import struct
+import hashlib
+from typing import BinaryIO, List, NamedTuple, Tuple
+
+from src import algorithm_of
+from src.Utils import randomness
+
+#region Format definition
+# Layout (all integers big-endian):
+#   magic "UFEV" | version u8 | flags u8 | recipient count u16 | header length u32 | nonce (16 bytes)
+#   recipient records: algorithm u8 | flags u8 | key id (16 bytes) | field count u8
+#                      then per field: length u16 | unsigned integer
+#   zero padding up to header length
+#   payload: plaintext XOR SHAKE-256 key stream
+#   tag: HMAC-SHA256 over nonce and payload (32 bytes)
+# The payload is encrypted once under a random session key, only that key is
+# wrapped per recipient, so sealing costs O(data + recipients). The tag does
+# not cover the header, and the padding leaves room to re-wrap the key for
+# other recipients in place (rotate_file) without touching the payload.
+MAGIC = b"UFEV"
+VERSION = 1
+PREFIX = struct.Struct(">4sBBHI16s")
+RECORD = struct.Struct(">BB16sB")
+FIELD_LENGTH = struct.Struct(">H")
+
+ALGORITHMS = {1: "RSA", 2: "ElGamal", 3: "ECElGamal"}
+ALGORITHM_CODES = {name: code for code, name in ALGORITHMS.items()}
+FLAG_SUBGROUP = 0x01  # ElGamal key wrapped in subgroup mode
+
+SESSION_KEY_SIZE = 32
+NONCE_SIZE = 16
+TAG_SIZE = 32
+SEGMENT_SIZE = 1 << 20  # Key stream is derived per 1 MiB segment
+HEADER_ROOM = 1024  # Spare header bytes reserved for later key rotations
+#endregion
+
+class Recipient(NamedTuple):
+    """One wrapped copy of the session key"""
+    algorithm: str
+    flags: int
+    key_id: bytes
+    fields: Tuple[int, ...]
+
+class Header(NamedTuple):
+    nonce: bytes
+    recipients: List[Recipient]
+    length: int  # Offset of the payload
+
+#region Recipient keys
+def key_id(cipher) -> bytes:
+    """Short identifier of the public half of a key, used to find a recipient's record"""
+    algorithm = algorithm_of(cipher)
+    if algorithm == "RSA":
+        numbers = (cipher.e, cipher.n)
+    elif algorithm == "ECElGamal":
+        numbers = cipher.Q
+    else:
+        numbers = (cipher.p, cipher.g, cipher.h)
+    return hashlib.sha256(f"{algorithm}:{numbers}".encode()).digest()[:16]
+
+def wrap_key(cipher, session_key: bytes) -> Recipient:
+    """Encrypt the session key for one recipient"""
+    algorithm = algorithm_of(cipher)
+    encrypted = cipher.encrypt(session_key)
+    fields = (encrypted,) if algorithm == "RSA" else tuple(encrypted)
+    flags = FLAG_SUBGROUP if getattr(cipher, "subgroup", False) else 0
+    return Recipient(algorithm, flags, key_id(cipher), fields)
+
+def unwrap_key(cipher, recipient: Recipient) -> bytes:
+    """Recover the session key from a recipient record with the matching private key"""
+    if recipient.algorithm == "RSA":
+        return cipher.decrypt(recipient.fields[0])
+    if recipient.flags & FLAG_SUBGROUP and not cipher.subgroup:
+        cipher = type(cipher)((cipher.p, cipher.g, cipher.h), cipher.x, subgroup=True)
+    # ElGamal decryption strips leading zeros, restore the fixed key size
+    return cipher.decrypt(recipient.fields).rjust(SESSION_KEY_SIZE, b"\x00")
+#endregion
+
+#region Header encoding
+def encode_header(nonce: bytes, recipients: List[Recipient], length: int = 0) -> bytes:
+    """
+    Serialize a header, zero-padded to length bytes when length is given
+
+    :raises ValueError: The recipient records do not fit into length
+    """
+    body = bytearray()
+    for r in recipients:
+        body += RECORD.pack(ALGORITHM_CODES[r.algorithm], r.flags, r.key_id, len(r.fields))
+        for value in r.fields:
+            raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+            body += FIELD_LENGTH.pack(len(raw)) + raw
+    size = PREFIX.size + len(body)
+    if length and size > length:
+        raise ValueError(f"ERR508: Header needs {size} bytes, only {length} are available")
+    length = max(length, size)
+    return PREFIX.pack(MAGIC, VERSION, 0, len(recipients), length, nonce) + bytes(body) + bytes(length - size)
+
+def read_header(f: BinaryIO) -> Header:
+    """Parse the container header, leaving f positioned at the payload"""
+    prefix = f.read(PREFIX.size)
+    if len(prefix) < PREFIX.size:
+        raise ValueError("ERR501: Envelope too short")
+    magic, version, _, count, length, nonce = PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("ERR502: Not an envelope (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"ERR503: Unsupported envelope version {version}")
+    body = f.read(length - PREFIX.size)
+    if len(body) < length - PREFIX.size:
+        raise ValueError("ERR504: Envelope header is truncated")
+
+    recipients = []
+    pos = 0
+    try:
+        for _ in range(count):
+            code, flags, kid, field_count = RECORD.unpack_from(body, pos)
+            pos += RECORD.size
+            fields = []
+            for _ in range(field_count):
+                (size,) = FIELD_LENGTH.unpack_from(body, pos)
+                pos += FIELD_LENGTH.size
+                fields.append(int.from_bytes(body[pos:pos + size], "big"))
+                pos += size
+            recipients.append(Recipient(ALGORITHMS[code], flags, kid, tuple(fields)))
+    except (struct.error, KeyError):
+        raise ValueError("ERR504: Envelope header is truncated or corrupted")
+    return Header(nonce, recipients, length)
+#endregion
+
+#region Payload
+def _derive_keys(session_key: bytes) -> Tuple[bytes, bytes]:
+    """Separate encryption and MAC keys from one session key"""
+    return (hashlib.sha256(b"enc" + session_key).digest(),
+            hashlib.sha256(b"mac" + session_key).digest())
+
+def _xor_segment(enc_key: bytes, nonce: bytes, index: int, data: bytes) -> bytes:
+    stream = hashlib.shake_256(enc_key + nonce + index.to_bytes(8, "big")).digest(len(data))
+    return (int.from_bytes(data, "big") ^ int.from_bytes(stream, "big")).to_bytes(len(data), "big")
+
+def seal_stream(src: BinaryIO, dst: BinaryIO, recipients: list, header_room: int = HEADER_ROOM) -> int:
+    """
+    Encrypt src once and write a container readable by every recipient
+
+    :param recipients: Public RSA / ElGamal / ECElGamal instances
+    :param header_room: Spare header bytes, so that later rotations fit in place
+    :return: Number of payload bytes
+    """
+    if not recipients:
+        raise ValueError("ERR505: At least one recipient is required")
+    session_key = randomness.token_bytes(SESSION_KEY_SIZE)
+    nonce = randomness.token_bytes(NONCE_SIZE)
+    enc_key, mac_key = _derive_keys(session_key)
+    wrapped = [wrap_key(c, session_key) for c in recipients]
+    dst.write(encode_header(nonce, wrapped, len(encode_header(nonce, wrapped)) + header_room))
+
+    mac = hmac.new(mac_key, nonce, hashlib.sha256)
+    total = 0
+    index = 0
+    while True:
+        data = src.read(SEGMENT_SIZE)
+        if not data:
+            break
+        encrypted = _xor_segment(enc_key, nonce, index, data)
+        mac.update(encrypted)
+        dst.write(encrypted)
+        total += len(data)
+        index += 1
+    dst.write(mac.digest())
+    return total
+
+def find_recipient(header: Header, cipher) -> Recipient:
+    kid = key_id(cipher)
+    for recipient in header.recipients:
+        if recipient.key_id == kid:
+            return recipient
+    raise ValueError("ERR506: Key is not among the envelope's recipients")
+
+def open_stream(src: BinaryIO, dst: BinaryIO, cipher) -> int:
+    """
+    Decrypt a container with one recipient's private key
+
+    The tag is checked over the whole payload before any plaintext is written,
+    so src must be seekable.
+
+    :param cipher: Private RSA / ElGamal / ECElGamal instance
+    :return: Number of payload bytes
+    """
+    header = read_header(src)
+    session_key = unwrap_key(cipher, find_recipient(header, cipher))
+    enc_key, mac_key = _derive_keys(session_key)
+
+    end = src.seek(0, os.SEEK_END)
+    size = end - header.length - TAG_SIZE
+    if size < 0:
+        raise ValueError("ERR504: Envelope payload is truncated")
+    src.seek(end - TAG_SIZE)
+    tag = src.read(TAG_SIZE)
+
+    # First pass: authenticate
+    mac = hmac.new(mac_key, header.nonce, hashlib.sha256)
+    src.seek(header.length)
+    remaining = size
+    while remaining:
+        data = src.read(min(SEGMENT_SIZE, remaining))
+        mac.update(data)
+        remaining -= len(data)
+    if not hmac.compare_digest(mac.digest(), tag):
+        raise ValueError("ERR507: Envelope authentication failed (wrong key or corrupted data)")
+
+    # Second pass: decrypt
+    src.seek(header.length)
+    remaining = size
+    index = 0
+    while remaining:
+        data = src.read(min(SEGMENT_SIZE, remaining))
+        dst.write(_xor_segment(enc_key, header.nonce, index, data))
+        remaining -= len(data)
+        index += 1
+    return size
+
+def seal_file(src_path: str, dst_path: str, recipients: list, header_room: int = HEADER_ROOM) -> int:
+    directory = os.path.dirname(dst_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        return seal_stream(src, dst, recipients, header_room)
+
+def open_file(src_path: str, dst_path: str, cipher) -> int:
+    directory = os.path.dirname(dst_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(src_path, "rb") as src, open(dst_path, "wb") as dst:
+        return open_stream(src, dst, cipher)
+#endregion
+
+#region Key rotation
+def rewrap_header(header: Header, old_cipher, new_recipients: list, keep_old: bool = False) -> List[Recipient]:
+    """
+    Recipient records with the session key re-wrapped for new_recipients
+
+    Only the wrapped session key is decrypted, the payload is not read.
+
+    :param old_cipher: Private key of a current recipient
+    :param new_recipients: Public RSA / ElGamal / ECElGamal instances
+    :param keep_old: Keep the record of old_cipher instead of replacing it
+    """
+    session_key = unwrap_key(old_cipher, find_recipient(header, old_cipher))
+    wrapped = [wrap_key(c, session_key) for c in new_recipients]
+    replaced = {r.key_id for r in wrapped}
+    if not keep_old:
+        replaced.add(key_id(old_cipher))
+    return [r for r in header.recipients if r.key_id not in replaced] + wrapped
+
+def journal_path(path: str) -> str:
+    return path + ".rotate"
+
+def recover_rotation(path: str) -> bool:
+    """
+    Finish a header rewrite interrupted by a crash
+
+    The new header is written to the journal before it overwrites the old
+    one, so a complete journal is replayed and an incomplete one (the crash
+    happened before the file was touched) is dropped.
+
+    :return: Whether a journal was replayed
+    """
+    journal = journal_path(path)
+    if not os.path.exists(journal):
+        return False
+    with open(journal, "rb") as f:
+        data = f.read()
+    try:
+        complete = read_header(io.BytesIO(data)).length == len(data)
+    except ValueError:
+        complete = False
+    if complete:
+        with open(path, "r+b") as f:
+            _write_header(f, data)
+    os.remove(journal)
+    return complete
+
+def _write_header(f: BinaryIO, data: bytes) -> None:
+    f.seek(0)
+    f.write(data)
+    f.flush()
+    os.fsync(f.fileno())
+
+def rotate_file(path: str, old_cipher, new_recipients: list, keep_old: bool = False,
+                rewrite: bool = False) -> bool:
+    """
+    Re-wrap the session key of a container for new recipients
+
+    The new header overwrites the old one in place when it fits into the old
+    header length (see HEADER_ROOM), so the cost does not depend on the
+    payload size. Otherwise the file is rewritten with a fresh header when
+    rewrite is set, and ERR508 is raised when it is not.
+
+    :return: Whether the header was rewritten in place
+    """
+    recover_rotation(path)
+    with open(path, "r+b") as f:
+        header = read_header(f)
+        recipients = rewrap_header(header, old_cipher, new_recipients, keep_old)
+        try:
+            data = encode_header(header.nonce, recipients, header.length)
+        except ValueError:
+            if not rewrite:
+                raise
+        else:
+            journal = journal_path(path)
+            with open(journal, "wb") as j:
+                j.write(data)
+                j.flush()
+                os.fsync(j.fileno())
+            _write_header(f, data)
+            os.remove(journal)
+            return True
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as dst:
+            dst.write(encode_header(header.nonce, recipients, len(encode_header(header.nonce, recipients)) + HEADER_ROOM))
+            f.seek(header.length)
+            shutil.copyfileobj(f, dst, SEGMENT_SIZE)
+            dst.flush()
+            os.fsync(dst.fileno())
+    os.replace(tmp_path, path)
+    return False
+#endregion
@@ -0,0 +1,133 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from envelope import (seal_stream, open_stream, read_header, key_id, rotate_file, journal_path,
+                      recover_rotation, encode_header, SEGMENT_SIZE)
+from src.Utils import randomness
+from src.RSA.rsa import RSA
+from src.ElGamal.ElGamal import ElGamal
+from src.ECElGamal.ECElGamal import ECElGamal
+
+class TestEnvelope(unittest.TestCase):
+    """Multi-recipient envelope Test Class"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.rsa_pub, cls.rsa_priv = RSA.create_keypair(2048)
+        cls.elg_pub, cls.elg_priv = ElGamal.create_keypair(group="ffdhe2048", subgroup=True)
+        cls.ec_pub, cls.ec_priv = ECElGamal.create_keypair()
+        cls.recipients = [cls.rsa_pub, cls.elg_pub, cls.ec_pub]
+
+    def seal(self, data, recipients=None):
+        sealed = io.BytesIO()
+        seal_stream(io.BytesIO(data), sealed, recipients or self.recipients)
+        return sealed.getvalue()
+
+    def open(self, sealed, cipher):
+        out = io.BytesIO()
+        open_stream(io.BytesIO(sealed), out, cipher)
+        return out.getvalue()
+
+    def test_every_recipient_can_open(self):
+        data = os.urandom(SEGMENT_SIZE + 1000)  # Crosses a key stream segment
+        sealed = self.seal(data)
+        for cipher in (self.rsa_priv, self.elg_priv, self.ec_priv):
+            with self.subTest(algorithm=type(cipher).__name__):
+                self.assertEqual(self.open(sealed, cipher), data)
+
+    def test_header(self):
+        header = read_header(io.BytesIO(self.seal(b"payload")))
+        self.assertEqual([r.algorithm for r in header.recipients], ["RSA", "ElGamal", "ECElGamal"])
+        self.assertEqual([r.key_id for r in header.recipients], [key_id(c) for c in self.recipients])
+        self.assertEqual(self.open(self.seal(b""), self.ec_priv), b"")
+
+    def test_seeded_envelopes_are_reproducible(self):
+        try:
+            randomness.seed(7)
+            first = self.seal(b"payload")
+            randomness.seed(7)
+            second = self.seal(b"payload")
+        finally:
+            randomness.seed(None)
+        self.assertEqual(first, second)
+        self.assertNotEqual(self.seal(b"payload"), first)
+
+    def test_rejects_tampering_and_strangers(self):
+        sealed = bytearray(self.seal(b"attack at dawn"))
+        sealed[-40] ^= 1
+        with self.assertRaises(ValueError):
+            self.open(bytes(sealed), self.rsa_priv)
+        with self.assertRaises(ValueError):
+            self.open(self.seal(b"x", [self.rsa_pub]), self.ec_priv)
+        with self.assertRaises(ValueError):
+            read_header(io.BytesIO(b"NOPE" + bytes(40)))
+
+    def test_rotation_in_place(self):
+        data = os.urandom(5000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.env")
+            with open(path, "wb") as f:
+                seal_stream(io.BytesIO(data), f, [self.rsa_pub, self.ec_pub])
+            with open(path, "rb") as f:
+                before = f.read()
+            length = read_header(io.BytesIO(before)).length
+
+            self.assertTrue(rotate_file(path, self.rsa_priv, [self.elg_pub]))
+            with open(path, "rb") as f:
+                after = f.read()
+            self.assertEqual(len(after), len(before))
+            self.assertEqual(after[length:], before[length:])  # Payload and tag untouched
+            self.assertEqual(self.open(after, self.elg_priv), data)
+            self.assertEqual(self.open(after, self.ec_priv), data)
+            with self.assertRaises(ValueError):
+                self.open(after, self.rsa_priv)
+            self.assertFalse(os.path.exists(journal_path(path)))
+
+    def test_rotation_without_room(self):
+        data = b"no spare header bytes"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.env")
+            with open(path, "wb") as f:
+                seal_stream(io.BytesIO(data), f, [self.ec_pub], header_room=0)
+            with self.assertRaises(ValueError):
+                rotate_file(path, self.ec_priv, [self.rsa_pub], keep_old=True)
+            self.assertFalse(rotate_file(path, self.ec_priv, [self.rsa_pub], keep_old=True, rewrite=True))
+            with open(path, "rb") as f:
+                sealed = f.read()
+            self.assertEqual(self.open(sealed, self.rsa_priv), data)
+            self.assertEqual(self.open(sealed, self.ec_priv), data)
+
+    def test_rotation_recovery(self):
+        data = b"interrupted rotation"
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.env")
+            with open(path, "wb") as f:
+                seal_stream(io.BytesIO(data), f, [self.ec_pub])
+            with open(path, "rb") as f:
+                sealed = f.read()
+            header = read_header(io.BytesIO(sealed))
+
+            # Crash while the journal was written: the file is left alone
+            with open(journal_path(path), "wb") as f:
+                f.write(sealed[:20])
+            self.assertFalse(recover_rotation(path))
+            self.assertEqual(self.open(sealed, self.ec_priv), data)
+
+            # Crash while the header was overwritten: the journal completes it
+            stranger = [r._replace(key_id=bytes(16)) for r in header.recipients]
+            journal = encode_header(header.nonce, header.recipients + stranger, header.length)
+            with open(journal_path(path), "wb") as f:
+                f.write(journal)
+            with open(path, "r+b") as f:
+                f.write(bytes(10))
+            self.assertTrue(recover_rotation(path))
+            with open(path, "rb") as f:
+                recovered = f.read()
+            self.assertEqual(len(read_header(io.BytesIO(recovered)).recipients), 2)
+            self.assertEqual(self.open(recovered, self.ec_priv), data)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
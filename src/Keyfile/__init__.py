@@ -0,0 +1 @@
+"""Binary key files and PKCS#1 export (src.Keyfile.keyfile)"""
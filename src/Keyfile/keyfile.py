@@ -0,0 +1,296 @@
+import os
+import mmap
+import base64
+import struct
+from typing import Dict, Optional, Tuple
+
+from src.RSA.rsa import RSAKeyGenerator
+
+#region Format definition
+# Layout (all integers big-endian):
+#   magic "UFKY" | version u8 | key type u8 | field width u16 | field count u8 | flags u8 | 2 reserved
+#   field_count * field_width bytes, one fixed-width unsigned integer per field
+# Every field sits at a fixed offset, so a key can be read straight out of an mmap.
+MAGIC = b"UFKY"
+VERSION = 1
+HEADER = struct.Struct(">4sBBHBB2x")
+
+KEY_TYPES = {
+    1: ("RSA", "public", ("e", "n")),
+    2: ("RSA", "private", ("e", "d", "n")),
+    3: ("ElGamal", "public", ("p", "g", "h")),
+    4: ("ElGamal", "private", ("p", "g", "h", "x")),
+    5: ("ECElGamal", "public", ("qx", "qy")),
+    6: ("ECElGamal", "private", ("qx", "qy", "x")),
+}
+TYPE_CODES = {(alg, kind): code for code, (alg, kind, _) in KEY_TYPES.items()}
+
+FLAG_CRT = 0x01
+RSA_CRT_FIELDS = ("p", "q", "dp", "dq", "qinv")
+# Multi-prime keys follow the CRT fields with r_i, d_i, t_i for i = 3, 4, ...
+# (prime, exponent and coefficient of PKCS#1 otherPrimeInfos)
+RSA_OTHER_PRIME_FIELDS = ("r", "d", "t")
+
+def _other_prime_fields(count: int) -> list:
+    return [f"{name}{i}" for i in range(3, count + 3) for name in RSA_OTHER_PRIME_FIELDS]
+
+def _other_prime_count(fields: Dict[str, int]) -> int:
+    count = 0
+    while all(fields.get(name) is not None for name in _other_prime_fields(count + 1)):
+        count += 1
+    return count
+#endregion
+
+class KeyFile:
+    """Decoded key: algorithm ('RSA'/'ElGamal'/'ECElGamal'), kind ('public'/'private') and named integers"""
+
+    def __init__(self, algorithm: str, kind: str, fields: Dict[str, int]):
+        self.algorithm = algorithm
+        self.kind = kind
+        self.fields = fields
+
+    def __getitem__(self, name: str) -> int:
+        return self.fields[name]
+
+    @property
+    def has_crt(self) -> bool:
+        return all(name in self.fields for name in RSA_CRT_FIELDS)
+
+    def rsa_primes(self) -> Optional[Tuple[int, ...]]:
+        """Prime factors (p, q, r3, ...) of an RSA key with CRT fields, None without"""
+        if not self.has_crt:
+            return None
+        count = _other_prime_count(self.fields)
+        return (self.fields["p"], self.fields["q"]) + tuple(self.fields[f"r{i}"] for i in range(3, count + 3))
+
+    def public_key(self) -> Tuple[int, ...]:
+        """Tuple accepted by RSA(...) / ElGamal(...) / ECElGamal(...) as public_key"""
+        if self.algorithm == "RSA":
+            return (self.fields["e"], self.fields["n"])
+        if self.algorithm == "ECElGamal":
+            return (self.fields["qx"], self.fields["qy"])
+        return (self.fields["p"], self.fields["g"], self.fields["h"])
+
+    def private_key(self):
+        """RSA (d, n) tuple or ElGamal / EC-ElGamal x"""
+        if self.kind != "private":
+            raise ValueError("ERR401: Key file holds a public key only")
+        if self.algorithm == "RSA":
+            return (self.fields["d"], self.fields["n"])
+        return self.fields["x"]
+
+#region Binary keyfile encoding
+def encode_key(algorithm: str, kind: str, fields: Dict[str, int]) -> bytes:
+    """Serialize named key integers into the fixed-width binary format"""
+    code = TYPE_CODES.get((algorithm, kind))
+    if code is None:
+        raise ValueError(f"ERR402: Unsupported key type {algorithm}/{kind}")
+    names = list(KEY_TYPES[code][2])
+    flags = 0
+    if algorithm == "RSA" and kind == "private" and all(fields.get(n) is not None for n in RSA_CRT_FIELDS):
+        names += RSA_CRT_FIELDS
+        names += _other_prime_fields(_other_prime_count(fields))
+        flags |= FLAG_CRT
+
+    values = [fields[name] for name in names]
+    if any(not isinstance(v, int) or v < 0 for v in values):
+        raise ValueError("ERR403: Key fields must be non-negative integers")
+    width = max((v.bit_length() + 7) // 8 for v in values) or 1
+    header = HEADER.pack(MAGIC, VERSION, code, width, len(names), flags)
+    return header + b"".join(v.to_bytes(width, "big") for v in values)
+
+def decode_key(buffer) -> KeyFile:
+    """Parse a keyfile from bytes, bytearray, memoryview or mmap"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("ERR404: Key file too short")
+    magic, version, code, width, count, flags = HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError("ERR405: Not a key file (bad magic)")
+    if version != VERSION:
+        raise ValueError(f"ERR406: Unsupported key file version {version}")
+    if code not in KEY_TYPES:
+        raise ValueError(f"ERR402: Unsupported key type code {code}")
+    algorithm, kind, names = KEY_TYPES[code]
+    names = list(names)
+    if flags & FLAG_CRT:
+        names += RSA_CRT_FIELDS
+        others, remainder = divmod(count - len(names), len(RSA_OTHER_PRIME_FIELDS))
+        if others > 0 and not remainder:
+            names += _other_prime_fields(others)
+    if count != len(names) or len(buffer) < HEADER.size + count * width:
+        raise ValueError("ERR407: Key file is truncated or corrupted")
+
+    view = memoryview(buffer)
+    try:
+        fields = {}
+        offset = HEADER.size
+        for name in names:
+            fields[name] = int.from_bytes(view[offset:offset + width], "big")
+            offset += width
+    finally:
+        view.release()
+    return KeyFile(algorithm, kind, fields)
+
+def save_key(path: str, algorithm: str, kind: str, fields: Dict[str, int]) -> None:
+    """Write a keyfile, private keys are created with owner-only permissions"""
+    data = encode_key(algorithm, kind, fields)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    mode = 0o600 if kind == "private" else 0o644
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+def load_key(path: str) -> KeyFile:
+    """Load a keyfile by mapping it into memory (no text parsing involved)"""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise ValueError("ERR404: Key file too short")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return decode_key(mm)
+#endregion
+
+#region Convenience wrappers
+def save_rsa_public(path: str, public_key: Tuple[int, int]) -> None:
+    e, n = public_key
+    save_key(path, "RSA", "public", {"e": e, "n": n})
+
+def save_rsa_private(path: str, public_key: Tuple[int, int], private_key: Tuple[int, int],
+                     crt: bool = True) -> None:
+    """Save an RSA private key, optionally with the CRT fields p, q, dp, dq, qinv (and r_i, d_i, t_i)"""
+    e, n = public_key
+    d, n_priv = private_key
+    if n != n_priv:
+        raise ValueError("ERR408: Private key doesn't match public key")
+    fields = {"e": e, "d": d, "n": n}
+    if crt:
+        fields.update(rsa_crt_fields(e, d, n))
+    save_key(path, "RSA", "private", fields)
+
+def save_elgamal_public(path: str, public_key: Tuple[int, int, int]) -> None:
+    p, g, h = public_key
+    save_key(path, "ElGamal", "public", {"p": p, "g": g, "h": h})
+
+def save_elgamal_private(path: str, public_key: Tuple[int, int, int], x: int) -> None:
+    p, g, h = public_key
+    save_key(path, "ElGamal", "private", {"p": p, "g": g, "h": h, "x": x})
+
+def save_ecelgamal_public(path: str, public_key: Tuple[int, int]) -> None:
+    qx, qy = public_key
+    save_key(path, "ECElGamal", "public", {"qx": qx, "qy": qy})
+
+def save_ecelgamal_private(path: str, public_key: Tuple[int, int], x: int) -> None:
+    qx, qy = public_key
+    save_key(path, "ECElGamal", "private", {"qx": qx, "qy": qy, "x": x})
+#endregion
+
+#region RSA CRT recovery
+def recover_rsa_primes(e: int, d: int, n: int) -> Tuple[int, ...]:
+    """
+    Factor n from a known (e, d) pair, see RSAKeyGenerator.recover_factors
+
+    Key generation does not keep the primes, this recovers them (largest
+    first, two or more) so CRT fields can be stored without changing the generator.
+    """
+    return RSAKeyGenerator.recover_factors(e, d, n)
+
+def rsa_crt_fields(e: int, d: int, n: int) -> Dict[str, int]:
+    """Compute p, q, dp, dq, qinv for CRT decryption, and r_i, d_i, t_i for further primes"""
+    p, q, *others = recover_rsa_primes(e, d, n)
+    fields = {"p": p, "q": q, "dp": d % (p - 1), "dq": d % (q - 1), "qinv": pow(q, -1, p)}
+    product = p * q
+    for i, r in enumerate(others, 3):
+        fields.update({f"r{i}": r, f"d{i}": d % (r - 1), f"t{i}": pow(product, -1, r)})
+        product *= r
+    return fields
+#endregion
+
+#region PKCS#1 DER / PEM export
+def _der_length(length: int) -> bytes:
+    if length < 0x80:
+        return bytes([length])
+    raw = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(raw)]) + raw
+
+def _der_integer(value: int) -> bytes:
+    raw = value.to_bytes(value.bit_length() // 8 + 1, "big")  # Leading 0x00 keeps it positive
+    return b"\x02" + _der_length(len(raw)) + raw
+
+def _der_sequence(items) -> bytes:
+    """SEQUENCE of INTEGERs, items already encoded as bytes are nested as they are"""
+    body = b"".join(v if isinstance(v, bytes) else _der_integer(v) for v in items)
+    return b"\x30" + _der_length(len(body)) + body
+
+def rsa_to_pkcs1_der(key: KeyFile) -> bytes:
+    """Export an RSA key as PKCS#1 RSAPublicKey / RSAPrivateKey DER"""
+    if key.algorithm != "RSA":
+        raise ValueError("ERR411: PKCS#1 export is only defined for RSA keys")
+    f = key.fields
+    if key.kind == "public":
+        return _der_sequence([f["n"], f["e"]])
+    crt = f if key.has_crt else rsa_crt_fields(f["e"], f["d"], f["n"])
+    others = _other_prime_count(crt)
+    values = [0, f["n"], f["e"], f["d"], crt["p"], crt["q"], crt["dp"], crt["dq"], crt["qinv"]]
+    if others:
+        # Version 1: multi-prime, the further primes go into otherPrimeInfos
+        names = _other_prime_fields(others)
+        values[0] = 1
+        values.append(_der_sequence([_der_sequence([crt[name] for name in names[i:i + 3]])
+                                     for i in range(0, len(names), 3)]))
+    return _der_sequence(values)
+
+def rsa_from_pkcs1_der(der: bytes) -> KeyFile:
+    """Import a PKCS#1 RSAPublicKey / RSAPrivateKey DER structure"""
+    def read_length(pos):
+        first = der[pos]
+        if first < 0x80:
+            return first, pos + 1
+        count = first & 0x7F
+        return int.from_bytes(der[pos + 1:pos + 1 + count], "big"), pos + 1 + count
+
+    def read_sequence(pos):
+        """INTEGERs of the SEQUENCE at pos (nested SEQUENCEs as lists) and the position after it"""
+        if pos >= len(der) or der[pos] != 0x30:
+            raise ValueError("ERR412: Invalid DER: expected SEQUENCE")
+        length, pos = read_length(pos + 1)
+        end = pos + length
+        values = []
+        while pos < end:
+            if der[pos] == 0x30:
+                value, pos = read_sequence(pos)
+                values.append(value)
+                continue
+            if der[pos] != 0x02:
+                raise ValueError("ERR412: Invalid DER: expected INTEGER")
+            length, pos = read_length(pos + 1)
+            values.append(int.from_bytes(der[pos:pos + length], "big", signed=True))
+            pos += length
+        return values, end
+
+    if not der:
+        raise ValueError("ERR412: Invalid DER: expected SEQUENCE")
+    values, _ = read_sequence(0)
+    if len(values) == 2 and all(isinstance(v, int) for v in values):
+        n, e = values
+        return KeyFile("RSA", "public", {"e": e, "n": n})
+    if len(values) in (9, 10) and all(isinstance(v, int) for v in values[:9]):
+        version, n, e, d, p, q, dp, dq, qinv = values[:9]
+        fields = {"e": e, "d": d, "n": n, "p": p, "q": q, "dp": dp, "dq": dq, "qinv": qinv}
+        if len(values) == 10:
+            others = values[9]
+            if version != 1 or not others or any(
+                    not isinstance(info, list) or len(info) != 3 or not all(isinstance(v, int) for v in info)
+                    for info in others):
+                raise ValueError("ERR412: Invalid DER: malformed otherPrimeInfos")
+            fields.update(zip(_other_prime_fields(len(others)), (v for info in others for v in info)))
+        return KeyFile("RSA", "private", fields)
+    raise ValueError("ERR412: Invalid DER: unexpected number of fields")
+
+def to_pem(der: bytes, private: bool) -> str:
+    label = "RSA PRIVATE KEY" if private else "RSA PUBLIC KEY"
+    body = base64.encodebytes(der).decode().replace("\n", "")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return f"-----BEGIN {label}-----\n" + "\n".join(lines) + f"\n-----END {label}-----\n"
+#endregion
@@ -0,0 +1 @@
+"""RSA-OAEP with CRT and blinding (src.RSA.rsa)"""
@@ -1,29 +1,35 @@
-import random
 import math
-import os
 import struct
 import hashlib
+import threading
 from typing import Tuple, Optional
 
+from src.Utils import randomness, bigint
+from src.Utils.secret import SecretInt
+
 class RSAKeyGenerator:
     """
     RSA Key Generator (Final Version)
 
     Features:
     1. Supports custom prime numbers p/q
-    2. Secure memory wiping
+    2. Private exponent kept in a zeroizable SecretInt
     3. Enhanced parameter validation
     4. Stack overflow prevention design
     5. Optimized primality testing algorithm
+    6. Multi-prime keys (RFC 8017): smaller primes, faster keygen and CRT decryption
     """
 
     MAX_RETRIES = 10  # Maximum key generation attempts
+    PUBLIC_EXPONENT = 65537
 
     @staticmethod
     def generate_keypair(
         bit_length: int = 2048,
         p: Optional[int] = None,
-        q: Optional[int] = None
+        q: Optional[int] = None,
+        budget=None,
+        num_primes: int = 2
     ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
         """
         Generate RSA key pair (supports automatic generation or custom primes)
@@ -34,29 +40,14 @@ class RSAKeyGenerator:
         3. Prime validity check (primality test + uniqueness check)
         4. Length compliance validation (modulus bit length match)
         5. Coprimality validation (gcd(e, φ(n)) == 1)
-        """
-        #region Secure wiping function
-        def secure_wipe(num: int) -> None:
-            """Three-pass overwrite wiping compliant with NIST SP 800-88"""
-            if num is None:
-                return
-
-            try:
-                byte_len = (num.bit_length() + 7) // 8
-                buffer = bytearray(byte_len)
-                # First pass: random data
-                buffer[:] = os.urandom(byte_len)
-                # Second pass: bit flipping
-                for i in range(byte_len):
-                    buffer[i] ^= 0xFF
-                # Third pass: all zeros
-                buffer[:] = b'\x00' * byte_len
-            finally:
-                del buffer
-        #endregion
 
+        :param budget: src.Utils.budget.KeygenBudget bounding the prime search
+                       (deadline, cancellation) and counting its progress
+        :param num_primes: Factors of n, up to max_primes(bit_length); the key
+                           pair has the same form, RSA recovers the factors
+        """
         #region Initialization cleanup
-        p_val = q_val = phi = n = e = d = None
+        primes = phi = n = e = d = None
         try:
             #region Parameter validation
             if (p is None) != (q is None):
@@ -65,6 +56,11 @@ class RSAKeyGenerator:
                 )
 
             custom_mode = p is not None
+            if not 2 <= num_primes <= RSAKeyGenerator.max_primes(bit_length) or (custom_mode and num_primes != 2):
+                raise ValueError(
+                    f"ERR114: {num_primes} primes not supported for a {bit_length}-bit key "
+                    f"(2 to {RSAKeyGenerator.max_primes(bit_length)}, custom primes: 2)"
+                )
             #endregion
 
             #region Custom prime handling
@@ -118,6 +114,7 @@ class RSAKeyGenerator:
                             f"ERR106: {name} bit length mismatch | "
                             f"Expected: {target}±2 bits, Actual: {prime_bits} bits"
                         )
+                primes = (p, q)
             #endregion
 
             #region Automatic generation mode
@@ -127,32 +124,13 @@ class RSAKeyGenerator:
                         "ERR107: Key length must be ≥2048 bits"
                     )
 
-                target_prime_bits = bit_length // 2
-                for attempt in range(RSAKeyGenerator.MAX_RETRIES):
-                    # Securely wipe previously generated data
-                    secure_wipe(p_val)
-                    secure_wipe(q_val)
-
-                    p_val = RSAKeyGenerator._generate_prime(target_prime_bits)
-                    q_val = RSAKeyGenerator._generate_prime(target_prime_bits)
-
-                    if p_val == q_val:
-                        continue
-
-                    n = p_val * q_val
-                    if n.bit_length() == bit_length:
-                        break
-                else:
-                    raise RuntimeError(
-                        "ERR108: Failed to generate valid prime pair"
-                    )
-
-                p, q = p_val, q_val
+                primes = RSAKeyGenerator._generate_primes(bit_length, num_primes, budget)
+                n = math.prod(primes)
             #endregion
 
             #region Compute core parameters
-            phi = (p - 1) * (q - 1)
-            e = 65537
+            phi = math.prod(r - 1 for r in primes)
+            e = RSAKeyGenerator.PUBLIC_EXPONENT
 
             # Coprimality validation
             if math.gcd(e, phi) != 1:
@@ -164,87 +142,155 @@ class RSAKeyGenerator:
                     "ERR110: Coprimality check failed in auto mode"
                 )
 
-            d = pow(e, -1, phi)
+            d = bigint.invert(e, phi)
             #endregion
 
             return ((e, n), (d, n))
 
         finally:
-            #region Secure cleanup
-            secure_wipe(p_val)
-            secure_wipe(q_val)
-            secure_wipe(phi)
-            secure_wipe(e if 'e' in locals() else 0)
-            secure_wipe(d if 'd' in locals() else 0)
-            # Remove references
-            p_val = q_val = phi = e = d = None
+            #region Cleanup
+            # Ints are immutable and cannot be overwritten, drop the references to
+            # intermediates; long-lived copies are held by RSA as SecretInt
+            primes = phi = e = d = None
             #endregion
 
     @staticmethod
-    def _generate_prime(bit_length: int) -> int:
-        """Optimized prime generation algorithm"""
-        # Fast path: pre-generated small prime check
-        SMALL_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]
+    def max_primes(bit_length: int) -> int:
+        """
+        Most factors a modulus of this size may have
 
-        for _ in range(10000):  # Maximum attempts
-            # Generate candidate
-            candidate = random.getrandbits(bit_length)
-            candidate |= (1 << (bit_length - 1)) | 1  # Ensure highest bit is 1 and odd
+        Each prime must stay well beyond the reach of ECM, which finds a factor
+        in time depending on the factor's size rather than on n's: 3 primes
+        below 4096 bits, 4 from 4096 bits.
+        """
+        return 3 if bit_length < 4096 else 4
 
-            # Quick elimination
-            if any(candidate % p == 0 for p in SMALL_PRIMES if p < candidate):
+    @staticmethod
+    def recover_primes(e: int, d: int, n: int) -> Tuple[int, int]:
+        """
+        Factor n from a known (e, d) pair (NIST SP 800-56B, Appendix C)
+
+        Key generation returns only (e, n) and (d, n); this recovers p > q so
+        the CRT parameters can be rebuilt from any private key.
+        """
+        p = RSAKeyGenerator._split(d * e - 1, n)
+        return (p, n // p) if p > n // p else (n // p, p)
+
+    @staticmethod
+    def recover_factors(e: int, d: int, n: int) -> Tuple[int, ...]:
+        """
+        All prime factors of n from (e, d), largest first, for two- and multi-prime keys
+
+        Composite factors are split like n, as λ of any factor divides d*e - 1.
+        A factor counts as prime once it passes one Miller-Rabin round: a wrong
+        guess cannot leak anything, RSA checks every CRT result.
+        """
+        k = d * e - 1
+        pending, factors = [n], []
+        while pending:
+            m = pending.pop()
+            if m != n and bigint.is_prime(m, 1):
+                factors.append(m)
+            else:
+                p = RSAKeyGenerator._split(k, m)
+                pending += [p, m // p]
+        return tuple(sorted(factors, reverse=True))
+
+    @staticmethod
+    def _split(k: int, n: int) -> int:
+        """Non-trivial factor of n, given a multiple k of λ(n)"""
+        if k % 2:
+            raise ValueError("ERR112: Inconsistent RSA key (d*e - 1 is odd)")
+        t = 0
+        r = k
+        while r % 2 == 0:
+            r //= 2
+            t += 1
+        for _ in range(100):
+            g = randomness.randint(2, n - 2)
+            y = bigint.powmod(g, r, n)
+            if y in (1, n - 1):
                 continue
+            for _ in range(t):
+                x = pow(y, 2, n)
+                if x == 1:
+                    return math.gcd(y - 1, n)
+                if x == n - 1:
+                    break
+                y = x
+        raise ValueError("ERR113: Could not factor modulus from (e, d)")
 
-            if RSAKeyGenerator._is_prime(candidate):
+    @staticmethod
+    def _generate_primes(bit_length: int, num_primes: int, budget=None) -> Tuple[int, ...]:
+        """
+        num_primes distinct primes whose product has exactly bit_length bits
+
+        All but the last prime get their share of bit_length; the last one is
+        searched in the interval that puts the product at bit_length bits, so
+        the earlier primes are only drawn again when that interval is empty.
+        """
+        sizes = [bit_length // num_primes + (i < bit_length % num_primes) for i in range(num_primes)]
+        last_bits = sizes[-1]
+        for attempt in range(RSAKeyGenerator.MAX_RETRIES):
+            primes = [RSAKeyGenerator._generate_prime(size, budget) for size in sizes[:-1]]
+            m = math.prod(primes)
+            low = max(-(-(1 << (bit_length - 1)) // m), 1 << (last_bits - 1))
+            high = min((1 << bit_length) // m, (1 << last_bits) - 1)
+            if low >= high:
+                continue
+            last = bigint.next_prime(randomness.randint(low, high - 1), budget)
+            if budget is not None:
+                budget.found()
+            primes.append(last)
+            if (last <= high and len(set(primes)) == num_primes
+                    and all(math.gcd(RSAKeyGenerator.PUBLIC_EXPONENT, r - 1) == 1 for r in primes)):
+                return tuple(primes)
+        raise RuntimeError(
+            "ERR108: Failed to generate valid prime pair"
+        )
+
+    @staticmethod
+    def _generate_prime(bit_length: int, budget=None) -> int:
+        """Optimized prime generation algorithm"""
+        for _ in range(10000):  # Maximum attempts
+            # Random start with the highest bit set, then the next prime after it
+            start = randomness.getrandbits(bit_length) | (1 << (bit_length - 1))
+            candidate = bigint.next_prime(start, budget)
+            if budget is not None:
+                budget.found()
+            if candidate.bit_length() == bit_length:
                 return candidate
         raise RuntimeError("ERR111: Prime generation timeout")
 
     @staticmethod
     def _is_prime(n: int, k: int = 64) -> bool:
-        """Optimized Miller-Rabin primality test"""
-        if n <= 1:
-            return False
-        if n <= 3:
-            return True
-        if n % 2 == 0:
-            return False
-
-        # Decompose n-1 as d*2^s
-        d = n - 1
-        s = 0
-        while d % 2 == 0:
-            d //= 2
-            s += 1
-
-        # Use a combination of fixed and random bases
-        witnesses = [2, 3, 5, 7, 11]  # Deterministic for n < 2^64
-        if n >= 3825123056546413051:
-            witnesses = [random.randint(2, min(n-2, 1<<20)) for _ in range(k)]
-
-        for a in witnesses:
-            x = pow(a, d, n)
-            if x == 1 or x == n - 1:
-                continue
-            for _ in range(s - 1):
-                x = pow(x, 2, n)
-                if x == n - 1:
-                    break
-            else:
-                return False
-        return True
+        """Miller-Rabin primality test (gmpy2 when installed)"""
+        return bigint.is_prime(n, k)
 
 #region RSA class
 class RSA:
     """RSA Encryption/Decryption Class"""
-    def __init__(self, public_key: Tuple[int, int], private_key: Optional[Tuple[int, int]] = None):
+
+    BLINDING_REFRESH = 32  # Uses of a blinding pair before a fresh r is drawn
+
+    def __init__(self, public_key: Tuple[int, int], private_key: Optional[Tuple[int, int]] = None,
+                 primes: Optional[Tuple[int, ...]] = None, crt: bool = True, blinding: bool = True):
         """
         Initialize RSA instance
 
         :param public_key: Public key (e, n)
         :param private_key: Private key (d, n) (optional)
+        :param primes: Prime factors of n (two or more), recovered from (e, d, n) when omitted and crt is set
+        :param crt: Decrypt with the Chinese Remainder Theorem (about 3x faster, more with more primes)
+        :param blinding: Blind the private-key operation against timing attacks
         """
         self.e, self.n = self._validate_key(public_key)
-        self.d = private_key[0] if private_key else None
+        self._d = None
+        self._crt = None
+        self.blinding = blinding
+        self._blinding_pair = None
+        self._blinding_uses = 0
+        self._blinding_lock = threading.Lock()
 
         # Validate private key if provided
         if private_key:
@@ -252,6 +298,12 @@ class RSA:
                 raise ValueError("Private key doesn't match public key")
             if not (0 < private_key[0] < self.n):
                 raise ValueError("Invalid private key")
+            self._d = SecretInt(private_key[0])
+            if crt:
+                primes = primes or RSAKeyGenerator.recover_factors(self.e, private_key[0], self.n)
+                if len(primes) < 2 or math.prod(primes) != self.n:
+                    raise ValueError("Primes don't match the modulus")
+                self._crt = self._crt_params(primes, private_key[0])
 
         self.OAEP_PARAMS = {
         "hash_alg": hashlib.sha256,       # Hash algorithm
@@ -260,6 +312,78 @@ class RSA:
         "hash_len": 32,                   # SHA-256 output length
         }
 
+    @staticmethod
+    def _crt_params(primes, d: int) -> tuple:
+        """
+        (prime, exponent, coefficient) SecretInts per factor, in recombination order
+
+        RFC 8017 order: q, then p with coefficient qInv = q^-1 mod p, then each
+        further prime r_i with t_i = (p * q * ... * r_(i-1))^-1 mod r_i.
+        """
+        p, q, *others = sorted(primes, reverse=True)
+        params = []
+        product = 1
+        for r in (q, p, *others):
+            params.append(tuple(SecretInt(v) for v in (r, d % (r - 1), bigint.invert(product % r, r))))
+            product *= r
+        return tuple(params)
+
+    @property
+    def d(self) -> Optional[int]:
+        """Private exponent, read from its SecretInt for each operation"""
+        return self._d.value if self._d is not None else None
+
+    def zeroize(self) -> None:
+        """Wipe the private key, the instance can only encrypt afterwards"""
+        if self._d is not None:
+            self._d.zeroize()
+            self._d = None
+        for params in self._crt or ():
+            for secret in params:
+                secret.zeroize()
+        self._crt = None
+        self._blinding_pair = None
+
+    def _next_blinding_pair(self) -> Tuple[int, int]:
+        """
+        Return (r^e, r^-1) for this call and advance the cached pair
+
+        Squaring both values gives the next valid pair ((r^2)^e, (r^2)^-1) for two
+        multiplications, so pow(r, e, n) and an inversion are only paid when a
+        fresh r is drawn every BLINDING_REFRESH uses.
+        """
+        n = self.n
+        with self._blinding_lock:
+            if self._blinding_pair is None or self._blinding_uses >= self.BLINDING_REFRESH:
+                while True:
+                    r = randomness.randint(2, n - 1)
+                    if math.gcd(r, n) == 1:
+                        break
+                self._blinding_pair = (bigint.powmod(r, self.e, n), bigint.invert(r, n))
+                self._blinding_uses = 0
+            pair = self._blinding_pair
+            r_e, r_inv = pair
+            self._blinding_pair = (r_e * r_e % n, r_inv * r_inv % n)
+            self._blinding_uses += 1
+        return pair
+
+    def _private_op(self, c: int) -> int:
+        """c^d mod n, through CRT when the factors are known"""
+        if self._crt is None:
+            return bigint.powmod(c, self._d.value, self.n)
+        (q, dq, _), *rest = [tuple(secret.value for secret in params) for params in self._crt]
+        # Garner's recombination, one step per further prime
+        m = bigint.powmod(c % q, dq, q)
+        product = q
+        for r, dr, coefficient in rest:
+            mr = bigint.powmod(c % r, dr, r)
+            m += (coefficient * (mr - m) % r) * product
+            product *= r
+        # A faulty CRT half would leak a factor of n, check before releasing the result
+        if bigint.powmod(m, self.e, self.n) != c:
+            return bigint.powmod(c, self._d.value, self.n)
+        return m
+
     @classmethod
     def _validate_oaep_params(cls, params: dict) -> None:
         """Validate OAEP parameter legality"""
@@ -295,7 +419,7 @@ class RSA:
         db = lhash + ps + b"\x01" + plaintext
 
         # Step 4: Generate random seed
-        seed = os.urandom(params["hash_len"])
+        seed = randomness.token_bytes(params["hash_len"])
 
         # Step 5: Generate dbMask and maskedDB
         db_mask = self._mgf1(seed, len(db), params["mgf_alg"])
@@ -368,14 +492,20 @@ class RSA:
         # Retain original range check
         if plain_int >= self.n:
             raise ValueError("Plaintext value must be less than modulus n")
-        return pow(plain_int, self.e, self.n)
+        return bigint.powmod(plain_int, self.e, self.n)
 
     def decrypt(self, ciphertext: int, use_oaep: bool = True) -> bytes:
         """Decryption with OAEP support"""
-        if not self.d:
+        if self._d is None:
             raise RuntimeError("Decryption requires private key")
+        if not (0 <= ciphertext < self.n):
+            raise ValueError("Ciphertext value must be less than modulus n")
 
-        plain_int = pow(ciphertext, self.d, self.n)
+        if self.blinding:
+            r_e, r_inv = self._next_blinding_pair()
+            plain_int = self._private_op(ciphertext * r_e % self.n) * r_inv % self.n
+        else:
+            plain_int = self._private_op(ciphertext)
         padded = plain_int.to_bytes(
             (self.n.bit_length() + 7) // 8, byteorder="big"
         )
@@ -385,14 +515,25 @@ class RSA:
         return padded
 
     @classmethod
-    def create_keypair(cls, bit_length: int = 2048) -> Tuple['RSA', 'RSA']:
+    def from_private_key(cls, d: int, n: int, e: int = 65537) -> 'RSA':
+        """
+        Rebuild a decrypting instance from (d, n) alone
+
+        Every key made by RSAKeyGenerator uses e = 65537; the CRT primes are
+        recovered from (e, d, n), which also rejects a d that does not fit e.
+        """
+        return cls(public_key=(e, n), private_key=(d, n))
+
+    @classmethod
+    def create_keypair(cls, bit_length: int = 2048, num_primes: int = 2) -> Tuple['RSA', 'RSA']:
         """
         Create paired RSA instances
 
         :param bit_length: Key length
+        :param num_primes: Factors of n, see RSAKeyGenerator.generate_keypair
         :return: (public key instance, private key instance)
         """
-        public_key, private_key = RSAKeyGenerator.generate_keypair(bit_length)
+        public_key, private_key = RSAKeyGenerator.generate_keypair(bit_length, num_primes=num_primes)
         return (
             cls(public_key=public_key),
             cls(public_key=public_key, private_key=private_key)
@@ -0,0 +1,111 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from rsa import RSAKeyGenerator, RSA
+
+# Differential tests against the reference libraries of the compat extra
+# (pip install .[compat]); each class is skipped when its library is missing.
+try:
+    from Crypto.PublicKey import RSA as CryptoRSA
+    from Crypto.Cipher import PKCS1_OAEP
+    from Crypto.Hash import SHA256
+except ImportError:
+    CryptoRSA = None
+try:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import padding, rsa as crsa
+except ImportError:
+    crsa = None
+
+MAX_MESSAGE = 256 - 2 * 32 - 2  # OAEP(SHA-256) payload of a 2048-bit key
+MESSAGES = [b"", b"\x00\x00leading zeros", os.urandom(117), os.urandom(MAX_MESSAGE)]
+
+class InteropMixin:
+    """Ciphertexts must interoperate in both directions, for keys made on either side"""
+
+    @classmethod
+    def setUpClass(cls):
+        public_key, private_key = RSAKeyGenerator.generate_keypair(2048)
+        cls.ours = RSA(public_key, private_key)
+        cls.theirs = cls.import_key(*public_key, private_key[0])
+
+    def check_pair(self, ours, theirs):
+        for message in MESSAGES:
+            with self.subTest(length=len(message)):
+                self.assertEqual(self.decrypt(theirs, ours.encrypt(message)), message)
+                self.assertEqual(ours.decrypt(self.encrypt(theirs, message)), message)
+
+    def test_our_key(self):
+        self.check_pair(self.ours, self.theirs)
+
+    def test_their_key(self):
+        e, n, d = self.generate_key()
+        self.check_pair(RSA((e, n), (d, n)), self.import_key(e, n, d))
+
+    def test_rejects_foreign_label_and_tampering(self):
+        ciphertext = self.encrypt(self.theirs, b"attack at dawn", label=b"other")
+        with self.assertRaises(ValueError):
+            self.ours.decrypt(ciphertext)
+        with self.assertRaises(ValueError):
+            self.decrypt(self.theirs, self.ours.encrypt(b"attack at dawn") ^ 1)
+
+@unittest.skipIf(CryptoRSA is None, "pycryptodome is not installed")
+class TestPycryptodomeInterop(InteropMixin, unittest.TestCase):
+    """RSA-OAEP(SHA-256) against pycryptodome"""
+
+    @staticmethod
+    def import_key(e, n, d):
+        return CryptoRSA.construct((n, e, d))
+
+    @staticmethod
+    def generate_key():
+        key = CryptoRSA.generate(2048)
+        return key.e, key.n, key.d
+
+    @staticmethod
+    def encrypt(key, message, label=b""):
+        return int.from_bytes(PKCS1_OAEP.new(key.public_key(), SHA256, label=label).encrypt(message), "big")
+
+    @staticmethod
+    def decrypt(key, ciphertext):
+        return PKCS1_OAEP.new(key, SHA256).decrypt(ciphertext.to_bytes(256, "big"))
+
+    def test_pkcs1_export(self):
+        """Keys exported by src.Keyfile load in pycryptodome"""
+        from src.Keyfile.keyfile import decode_key, encode_key, rsa_to_pkcs1_der
+        e, n, d = self.ours.e, self.ours.n, self.ours.d
+        key = decode_key(encode_key("RSA", "private", {"e": e, "d": d, "n": n}))
+        imported = CryptoRSA.import_key(rsa_to_pkcs1_der(key))
+        self.assertEqual((imported.n, imported.e, imported.d), (n, e, d))
+
+@unittest.skipIf(crsa is None, "cryptography is not installed")
+class TestCryptographyInterop(InteropMixin, unittest.TestCase):
+    """RSA-OAEP(SHA-256) against cryptography"""
+
+    @staticmethod
+    def _padding(label=b""):
+        return padding.OAEP(mgf=padding.MGF1(hashes.SHA256()), algorithm=hashes.SHA256(), label=label or None)
+
+    @staticmethod
+    def import_key(e, n, d):
+        p, q = crsa.rsa_recover_prime_factors(n, e, d)
+        numbers = crsa.RSAPrivateNumbers(p, q, d, crsa.rsa_crt_dmp1(d, p), crsa.rsa_crt_dmq1(d, q),
+                                         crsa.rsa_crt_iqmp(p, q), crsa.RSAPublicNumbers(e, n))
+        return numbers.private_key()
+
+    @staticmethod
+    def generate_key():
+        numbers = crsa.generate_private_key(65537, 2048).private_numbers()
+        return numbers.public_numbers.e, numbers.public_numbers.n, numbers.d
+
+    @classmethod
+    def encrypt(cls, key, message, label=b""):
+        return int.from_bytes(key.public_key().encrypt(message, cls._padding(label)), "big")
+
+    @classmethod
+    def decrypt(cls, key, ciphertext):
+        return key.decrypt(ciphertext.to_bytes(256, "big"), cls._padding())
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
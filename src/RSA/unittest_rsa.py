@@ -1,7 +1,9 @@
 import unittest
-from rsa import RSAKeyGenerator, RSA
 import os
+import sys
 import struct
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from rsa import RSAKeyGenerator, RSA
 
 class TestHighBitRSA(unittest.TestCase):
     """High-bit RSA Comprehensive Test Class (≥2048 bits)"""
@@ -97,5 +99,56 @@ class TestHighBitRSA(unittest.TestCase):
         decrypted = RSA(pub, priv).decrypt(cipher)
         self.assertEqual(test_data, decrypted.rstrip(b'\x00'))
 
+    def test_crt_and_blinding(self):
+        """CRT and blinded decryption agree with the plain private-key operation"""
+        plain = RSA(self.public_key, self.private_key, crt=False, blinding=False)
+        ciphertexts = [self.rsa_pub.encrypt(os.urandom(64)) for _ in range(3)]
+        expected = [plain.decrypt(c) for c in ciphertexts]
+        # More calls than BLINDING_REFRESH so the pair is both squared and redrawn
+        for _ in range(RSA.BLINDING_REFRESH // len(ciphertexts) + 1):
+            self.assertEqual([self.rsa_priv.decrypt(c) for c in ciphertexts], expected)
+
+        p, q = RSAKeyGenerator.recover_primes(self.public_key[0], self.private_key[0], self.public_key[1])
+        self.assertEqual(p * q, self.public_key[1])
+        r_e, r_inv = self.rsa_priv._next_blinding_pair()
+        self.assertEqual(pow(r_e, self.private_key[0], p * q) * r_inv % (p * q), 1)
+
+        private = RSA(self.public_key, self.private_key, primes=(q, p))
+        private.zeroize()
+        with self.assertRaises(RuntimeError):
+            private.decrypt(ciphertexts[0])
+
+class TestMultiPrimeRSA(unittest.TestCase):
+    """Multi-prime RSA (RFC 8017) Test Class"""
+
+    def check_key(self, bit_length, num_primes):
+        public_key, private_key = RSAKeyGenerator.generate_keypair(bit_length, num_primes=num_primes)
+        e, n = public_key
+        self.assertEqual(n.bit_length(), bit_length)
+        primes = RSAKeyGenerator.recover_factors(e, private_key[0], n)
+        self.assertEqual(len(primes), num_primes)
+        self.assertTrue(all(RSAKeyGenerator._is_prime(r) for r in primes))
+
+        plain = RSA(public_key, private_key, crt=False, blinding=False)
+        private = RSA(public_key, private_key, primes=primes)
+        for message in (b"", os.urandom(64)):
+            ciphertext = RSA(public_key).encrypt(message)
+            self.assertEqual(private.decrypt(ciphertext), message)
+            self.assertEqual(plain.decrypt(ciphertext), message)
+        self.assertEqual(RSA.from_private_key(private_key[0], n).decrypt(ciphertext), message)
+
+    def test_three_primes(self):
+        self.check_key(2048, 3)
+
+    def test_four_primes(self):
+        self.check_key(4096, 4)
+
+    def test_prime_count_validation(self):
+        for num_primes in (1, 4):
+            with self.assertRaises(ValueError):
+                RSAKeyGenerator.generate_keypair(2048, num_primes=num_primes)
+        with self.assertRaises(ValueError):
+            RSAKeyGenerator.generate_keypair(4096, num_primes=5)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
@@ -0,0 +1 @@
+"""Shared randomness, key-material and big-integer arithmetic helpers"""
@@ -0,0 +1,142 @@
+from typing import Optional
+
+from src.Utils import randomness
+
+try:
+    import gmpy2
+except ImportError:  # Optional dependency, fall back to CPython ints
+    gmpy2 = None
+
+#region Pure Python backend
+_SMALL_PRIMES = (
+    3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71, 73,
+    79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151, 157,
+    163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223, 227, 229, 233, 239,
+    241, 251, 257, 263, 269, 271, 277, 281, 283, 293, 307, 311, 313, 317, 331,
+    337, 347, 349, 353, 359, 367, 373, 379, 383, 389, 397, 401, 409, 419, 421,
+    431, 433, 439, 443, 449, 457, 461, 463, 467, 479, 487, 491, 499, 503, 509,
+    521, 523, 541
+)
+
+def _py_powmod(base: int, exponent: int, modulus: int) -> int:
+    return pow(base, exponent, modulus)
+
+def _py_invert(a: int, modulus: int) -> int:
+    return pow(a, -1, modulus)
+
+def _py_is_prime(n: int, k: int = 64) -> bool:
+    """Miller-Rabin primality test"""
+    if n <= _SMALL_PRIMES[-1]:
+        # A witness equal to n would wrongly reject it
+        return n == 2 or n in _SMALL_PRIMES
+    if n % 2 == 0:
+        return False
+
+    # Decompose n-1 as d*2^s
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    witnesses = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]  # Deterministic for n < 3.3*10^24
+    if n >= 3825123056546413051:
+        witnesses = [randomness.randint(2, min(n-2, 1<<20)) for _ in range(k)]
+
+    for a in witnesses:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+def _py_next_prime(n: int, budget=None) -> int:
+    """
+    Smallest prime greater than n
+
+    Candidates are stepped by 2 while their residues modulo the small primes
+    are updated incrementally, so Miller-Rabin only runs on candidates with no
+    small factor.
+
+    :param budget: KeygenBudget counting candidates and enforcing its deadline
+    """
+    if n < 2:
+        return 2
+    candidate = n + 1 if n % 2 == 0 else n + 2
+    if candidate <= _SMALL_PRIMES[-1]:
+        return next(p for p in _SMALL_PRIMES if p >= candidate)
+    residues = [candidate % p for p in _SMALL_PRIMES]
+    while True:
+        sieved = not all(residues)
+        if budget is not None:
+            budget.candidate(sieved)
+            if not sieved:
+                budget.tested()
+        if not sieved and _py_is_prime(candidate):
+            return candidate
+        candidate += 2
+        residues = [(r + 2) % p for r, p in zip(residues, _SMALL_PRIMES)]
+#endregion
+
+#region gmpy2 backend
+# Results are converted back to int so callers keep using to_bytes, bit_length
+# and plain int arithmetic whichever backend is active.
+def _gmp_powmod(base: int, exponent: int, modulus: int) -> int:
+    return int(gmpy2.powmod(base, exponent, modulus))
+
+def _gmp_invert(a: int, modulus: int) -> int:
+    try:
+        return int(gmpy2.invert(a, modulus))
+    except ZeroDivisionError:
+        raise ValueError("base is not invertible for the given modulus")
+
+def _gmp_is_prime(n: int, k: int = 64) -> bool:
+    return bool(gmpy2.is_prime(n, k))
+
+def _gmp_next_prime(n: int, budget=None) -> int:
+    # The search runs inside GMP, only its result is counted
+    if budget is not None:
+        budget.tested()
+    return int(gmpy2.next_prime(n))
+#endregion
+
+BACKENDS = {
+    "python": (_py_powmod, _py_invert, _py_is_prime, _py_next_prime),
+    "gmpy2": (_gmp_powmod, _gmp_invert, _gmp_is_prime, _gmp_next_prime),
+}
+
+def available() -> list:
+    """Names of the backends usable in this environment"""
+    return ["gmpy2", "python"] if gmpy2 is not None else ["python"]
+
+def use(name: Optional[str] = None) -> str:
+    """
+    Select the arithmetic backend
+
+    :param name: 'gmpy2', 'python', or None for the fastest available
+    :return: Name of the active backend
+    """
+    global BACKEND, powmod, invert, is_prime, next_prime
+    if name is None:
+        name = available()[0]
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown big-integer backend: {name}")
+    if name == "gmpy2" and gmpy2 is None:
+        raise ImportError("gmpy2 is not installed")
+    BACKEND = name
+    powmod, invert, is_prime, next_prime = BACKENDS[name]
+    return name
+
+# Active backend, rebound by use(). Callers go through the module
+# (bigint.powmod(...)) so that switching takes effect everywhere.
+BACKEND = "python"
+powmod = _py_powmod
+invert = _py_invert
+is_prime = _py_is_prime
+next_prime = _py_next_prime
+use()
@@ -0,0 +1,125 @@
+import time
+import threading
+import functools
+from typing import Callable, Optional
+
+class KeygenCancelled(RuntimeError):
+    """Key generation was stopped through its CancelToken"""
+
+class CancelToken:
+    """Cooperative cancellation flag, safe to set from any thread"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+class KeygenBudget:
+    """
+    Deadline, cancellation and progress counters of one key generation
+
+    The prime searches (bigint.next_prime and the keygens' retry loops) call
+    candidate() / tested() / found() as they go; each call checks the token
+    and the deadline, so a search stops within one primality test of being
+    cancelled or running out of time.
+
+    Counters:
+      candidates: odd numbers stepped through
+      sieve_hits: candidates rejected by trial division before Miller-Rabin
+      tests: full primality tests run
+      primes: primes found (several per key: retries, safe-prime search)
+    """
+
+    PROGRESS_INTERVAL = 0.5  # Seconds between two on_progress calls
+
+    def __init__(self, timeout: Optional[float] = None, deadline: Optional[float] = None,
+                 token: Optional[CancelToken] = None,
+                 on_progress: Optional[Callable[[dict], None]] = None,
+                 progress_interval: float = PROGRESS_INTERVAL):
+        """
+        :param timeout: Seconds from now
+        :param deadline: Absolute time.monotonic() value (the earlier of the two applies)
+        :param token: Cancels the generation when set
+        :param on_progress: Called with snapshot() every progress_interval seconds
+        """
+        self.start = time.monotonic()
+        if timeout is not None:
+            deadline = min(deadline, self.start + timeout) if deadline is not None else self.start + timeout
+        self.deadline = deadline
+        self.token = token
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        self._next_report = self.start + progress_interval
+        self.candidates = 0
+        self.sieve_hits = 0
+        self.tests = 0
+        self.primes = 0
+
+    def snapshot(self) -> dict:
+        return {'candidates': self.candidates, 'sieve_hits': self.sieve_hits, 'tests': self.tests,
+                'primes': self.primes, 'elapsed': time.monotonic() - self.start}
+
+    def check(self) -> None:
+        """
+        :raises KeygenCancelled: ERR601, the token was set
+        :raises TimeoutError: ERR602, the deadline has passed
+        """
+        if self.token is not None and self.token.cancelled:
+            raise KeygenCancelled("ERR601: Key generation cancelled")
+        now = time.monotonic()
+        if self.deadline is not None and now >= self.deadline:
+            raise TimeoutError(f"ERR602: Key generation deadline exceeded after {now - self.start:.2f} s "
+                               f"({self.candidates} candidates, {self.tests} primality tests)")
+        if self.on_progress is not None and now >= self._next_report:
+            self._next_report = now + self.progress_interval
+            self.on_progress(self.snapshot())
+
+    def candidate(self, sieved: bool) -> None:
+        """One candidate looked at, sieved if trial division rejected it"""
+        self.candidates += 1
+        if sieved:
+            self.sieve_hits += 1
+        self.check()
+
+    def tested(self) -> None:
+        """One full primality test run"""
+        self.tests += 1
+        self.check()
+
+    def found(self) -> None:
+        self.primes += 1
+        self.check()
+
+async def generate_async(generate: Callable, *args, timeout: Optional[float] = None,
+                         token: Optional[CancelToken] = None,
+                         on_progress: Optional[Callable[[dict], None]] = None,
+                         executor=None, **kwargs):
+    """
+    Run generate(*args, budget=..., **kwargs) in a thread, e.g.
+    await generate_async(RSAKeyGenerator.generate_keypair, 2048, timeout=5)
+
+    Cancelling the awaiting task cancels the generation as well, and on_progress
+    is called on the event loop thread. A caller with a latency target can
+    catch TimeoutError and fall back to a key generated ahead of time.
+
+    :param executor: concurrent.futures executor (default: the loop's thread pool)
+    :raises TimeoutError: ERR602, the timeout passed before a key was found
+    """
+    import asyncio  # Only needed by async callers
+    loop = asyncio.get_running_loop()
+    token = token or CancelToken()
+    report = None
+    if on_progress is not None:
+        report = lambda snapshot: loop.call_soon_threadsafe(on_progress, snapshot)
+    budget = KeygenBudget(timeout=timeout, token=token, on_progress=report)
+    job = loop.run_in_executor(executor, functools.partial(generate, *args, budget=budget, **kwargs))
+    try:
+        return await job
+    except asyncio.CancelledError:
+        token.cancel()  # The thread stops at its next check
+        raise
@@ -0,0 +1,123 @@
+import os
+import hashlib
+import threading
+from typing import Optional, Union
+
+class RandomSource:
+    """
+    Buffered randomness source
+
+    Entropy is read from os.urandom in bulk into a buffer and handed out as
+    integers through int.from_bytes on slices of it, so drawing many exponents,
+    prime candidates or nonces costs one system call per buffer instead of one
+    per value. Consumed bytes are zeroed right away.
+
+    With a seed the buffer is filled from SHAKE-256(seed || counter) instead,
+    which gives the same sequence on every run (benchmarks and tests only,
+    never for real keys).
+    """
+
+    def __init__(self, buffer_size: int = 1 << 16, seed: Optional[Union[int, bytes, str]] = None):
+        self.buffer_size = buffer_size
+        self._zeros = memoryview(bytes(buffer_size))
+        self._lock = threading.Lock()
+        self.seed(seed)
+
+    def seed(self, seed: Optional[Union[int, bytes, str]] = None) -> None:
+        """Switch to deterministic mode with the given seed, or back to OS entropy with None"""
+        if isinstance(seed, int):
+            seed = seed.to_bytes((seed.bit_length() + 8) // 8, "big", signed=True)
+        elif isinstance(seed, str):
+            seed = seed.encode()
+        with self._lock:
+            self._seed = seed
+            self._counter = 0
+            self._reset()
+
+    def _reset(self) -> None:
+        self._buffer = bytearray(self.buffer_size)
+        self._view = memoryview(self._buffer)
+        self._pos = self.buffer_size  # Empty, refilled on first use
+
+    @property
+    def deterministic(self) -> bool:
+        return self._seed is not None
+
+    def _fill(self, size: int) -> bytes:
+        if self._seed is None:
+            return os.urandom(size)
+        block = hashlib.shake_256(self._seed + self._counter.to_bytes(8, "big")).digest(size)
+        self._counter += 1
+        return block
+
+    def _take(self, n: int) -> int:
+        """Next n buffered bytes as an integer, the bytes are zeroed once read"""
+        with self._lock:
+            start = self._pos
+            end = start + n
+            if end > self.buffer_size:
+                self._view[:] = self._fill(self.buffer_size)
+                start, end = 0, n
+            value = int.from_bytes(self._view[start:end], "big")
+            self._view[start:end] = self._zeros[:n]
+            self._pos = end
+            return value
+
+    def token_bytes(self, n: int) -> bytes:
+        """n random bytes"""
+        if n > self.buffer_size:
+            with self._lock:
+                return self._fill(n)
+        return self._take(n).to_bytes(n, "big")
+
+    def getrandbits(self, k: int) -> int:
+        """Random integer in [0, 2^k)"""
+        if k <= 0:
+            return 0
+        n = (k + 7) // 8
+        if n > self.buffer_size:
+            return int.from_bytes(self.token_bytes(n), "big") >> (n * 8 - k)
+        return self._take(n) >> (n * 8 - k)
+
+    def randbelow(self, n: int) -> int:
+        """Uniform integer in [0, n), by rejection sampling"""
+        if n <= 0:
+            raise ValueError("randbelow requires n > 0")
+        k = n.bit_length()
+        while True:
+            r = self.getrandbits(k)
+            if r < n:
+                return r
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform integer in [a, b]"""
+        return a + self.randbelow(b - a + 1)
+
+    def _after_fork(self) -> None:
+        # A forked child must not hand out the parent's buffered bytes again
+        self._lock = threading.Lock()
+        self._reset()
+        if self._seed is not None:
+            self._seed += os.getpid().to_bytes(4, "big")
+
+# Shared instance used by the key generators and ciphers
+default = RandomSource()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=default._after_fork)
+
+def seed(value: Optional[Union[int, bytes, str]] = None) -> None:
+    """Make the shared source deterministic (None restores OS entropy)"""
+    default.seed(value)
+
+def token_bytes(n: int) -> bytes:
+    return default.token_bytes(n)
+
+def getrandbits(k: int) -> int:
+    return default.getrandbits(k)
+
+def randbelow(n: int) -> int:
+    return default.randbelow(n)
+
+def randint(a: int, b: int) -> int:
+    return default.randint(a, b)
@@ -0,0 +1,61 @@
+import ctypes
+
+class SecretInt:
+    """
+    Integer key material held in a mutable buffer
+
+    Python ints are immutable and cannot be overwritten, so wiping a copy of
+    one (as the old secure_wipe helpers did) never touched the key itself.
+    SecretInt keeps the only long-lived copy in a bytearray; zeroize() clears
+    it with a single memset whatever the key size, and the value is rebuilt
+    on demand for each operation.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, value: int):
+        self._buffer = None  # Set before validating, __del__ runs on rejected values too
+        if not isinstance(value, int) or value < 0:
+            raise ValueError("SecretInt holds non-negative integers only")
+        self._buffer = bytearray(value.to_bytes((value.bit_length() + 7) // 8 or 1, "big"))
+
+    @property
+    def value(self) -> int:
+        if self._buffer is None:
+            raise ValueError("Secret has been zeroized")
+        return int.from_bytes(self._buffer, "big")
+
+    def bit_length(self) -> int:
+        return self.value.bit_length()
+
+    @property
+    def zeroized(self) -> bool:
+        return self._buffer is None
+
+    def zeroize(self) -> None:
+        """Overwrite the buffer with zeros and release it"""
+        buffer = self._buffer
+        if buffer is None:
+            return
+        size = len(buffer)
+        if size:
+            ctypes.memset((ctypes.c_char * size).from_buffer(buffer), 0, size)
+        self._buffer = None
+
+    def __enter__(self) -> "SecretInt":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.zeroize()
+
+    def __del__(self) -> None:
+        self.zeroize()
+
+    def __repr__(self) -> str:
+        return "SecretInt(<zeroized>)" if self._buffer is None else "SecretInt(<redacted>)"
+
+    def __getstate__(self):
+        return bytes(self._buffer) if self._buffer is not None else None
+
+    def __setstate__(self, state) -> None:
+        self._buffer = bytearray(state) if state is not None else None
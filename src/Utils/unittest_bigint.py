@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from src.Utils import bigint
+
+MERSENNE_127 = (1 << 127) - 1
+MERSENNE_521 = (1 << 521) - 1
+
+class TestBigInt(unittest.TestCase):
+    """Big-integer backend Test Class (every available backend)"""
+
+    def tearDown(self):
+        bigint.use()
+
+    def test_backends_agree(self):
+        p = MERSENNE_521
+        base = 0x1234567890ABCDEF ** 20 % p
+        for name in bigint.available():
+            with self.subTest(backend=name):
+                self.assertEqual(bigint.use(name), name)
+                self.assertEqual(bigint.powmod(base, 65537, p), pow(base, 65537, p))
+                inv = bigint.invert(base, p)
+                self.assertIsInstance(inv, int)
+                self.assertEqual(inv * base % p, 1)
+                with self.assertRaises(ValueError):
+                    bigint.invert(6, 9)
+
+    def test_primality(self):
+        primes = [2, 3, 97, 541, 7919, MERSENNE_127, MERSENNE_521]
+        composites = [0, 1, 4, 561, 41041, 3825123056546413051, MERSENNE_127 * 3]
+        for name in bigint.available():
+            bigint.use(name)
+            for n in primes:
+                with self.subTest(backend=name, n=n):
+                    self.assertTrue(bigint.is_prime(n))
+            for n in composites:
+                with self.subTest(backend=name, n=n):
+                    self.assertFalse(bigint.is_prime(n))
+            self.assertEqual([bigint.next_prime(n) for n in (0, 2, 3, 540, 7908)], [2, 3, 5, 541, 7919])
+            self.assertEqual(bigint.next_prime(MERSENNE_127 - 2), MERSENNE_127)
+
+    def test_selection(self):
+        with self.assertRaises(ValueError):
+            bigint.use("openssl")
+        if "gmpy2" not in bigint.available():
+            with self.assertRaises(ImportError):
+                bigint.use("gmpy2")
+        self.assertEqual(bigint.use(), bigint.available()[0])
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
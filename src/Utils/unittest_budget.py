@@ -0,0 +1,66 @@
+import unittest
+import asyncio
+import time
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from budget import CancelToken, KeygenBudget, KeygenCancelled, generate_async
+from src.Utils import bigint
+from src.RSA.rsa import RSAKeyGenerator
+from src.ElGamal.ElGamal import ElGamalKeyGenerator
+
+class TestKeygenBudget(unittest.TestCase):
+    """Deadline / cancellation aware key generation Test Class"""
+
+    def test_progress_counters(self):
+        budget = KeygenBudget()
+        p = bigint.next_prime(1 << 511, budget)
+        self.assertTrue(bigint.is_prime(p))
+        snapshot = budget.snapshot()
+        if bigint.BACKEND == "python":
+            self.assertEqual(snapshot['candidates'], (p - (1 << 511) + 1) // 2)
+            self.assertEqual(snapshot['tests'], snapshot['candidates'] - snapshot['sieve_hits'])
+            self.assertGreater(snapshot['sieve_hits'], 0)
+        self.assertGreater(snapshot['tests'], 0)
+
+    def test_deadline(self):
+        start = time.monotonic()
+        with self.assertRaises(TimeoutError) as ctx:
+            ElGamalKeyGenerator.generate_keypair(2048, budget=KeygenBudget(timeout=0.2))
+        self.assertIn("ERR602", str(ctx.exception))
+        self.assertLess(time.monotonic() - start, 2)
+
+    def test_cancellation_and_reports(self):
+        reports = []
+        token = CancelToken()
+
+        def on_progress(snapshot):
+            reports.append(snapshot)
+            token.cancel()
+
+        budget = KeygenBudget(token=token, on_progress=on_progress, progress_interval=0)
+        with self.assertRaises(KeygenCancelled):
+            RSAKeyGenerator.generate_keypair(2048, budget=budget)
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(set(reports[0]), {'candidates', 'sieve_hits', 'tests', 'primes', 'elapsed'})
+
+    def test_async_wrapper(self):
+        async def scenario():
+            public_key, private_key = await generate_async(RSAKeyGenerator.generate_keypair, 2048, timeout=60)
+            self.assertEqual(public_key[1], private_key[1])
+
+            with self.assertRaises(TimeoutError):
+                await generate_async(ElGamalKeyGenerator.generate_keypair, 2048, timeout=0.1)
+
+            token = CancelToken()
+            task = asyncio.ensure_future(generate_async(ElGamalKeyGenerator.generate_keypair, 2048, token=token))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            self.assertTrue(token.cancelled)
+
+        asyncio.run(scenario())
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,35 @@
+import unittest
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from randomness import RandomSource
+
+class TestRandomSource(unittest.TestCase):
+    """Buffered randomness source Test Class"""
+
+    def test_ranges(self):
+        source = RandomSource(buffer_size=64)
+        for _ in range(200):
+            self.assertTrue(2 <= source.randint(2, 10) <= 10)
+            self.assertLess(source.getrandbits(13), 1 << 13)
+            self.assertLess(source.randbelow(1000), 1000)
+        self.assertEqual(len(source.token_bytes(100)), 100)  # Larger than the buffer
+        self.assertEqual(source.getrandbits(0), 0)
+        with self.assertRaises(ValueError):
+            source.randbelow(0)
+
+    def test_seeded_mode_is_reproducible(self):
+        a, b = RandomSource(seed=42), RandomSource(seed=42)
+        self.assertTrue(a.deterministic)
+        self.assertEqual([a.getrandbits(2048) for _ in range(5)], [b.getrandbits(2048) for _ in range(5)])
+        self.assertNotEqual(RandomSource(seed=43).getrandbits(256), RandomSource(seed=42).getrandbits(256))
+        a.seed(None)
+        self.assertFalse(a.deterministic)
+
+    def test_consumed_bytes_are_cleared(self):
+        source = RandomSource(buffer_size=32)
+        source.token_bytes(16)
+        self.assertEqual(bytes(source._buffer[:16]), bytes(16))
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
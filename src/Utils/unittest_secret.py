@@ -0,0 +1,53 @@
+import unittest
+import os
+import sys
+import pickle
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+from secret import SecretInt
+from src.ElGamal.ElGamal import ElGamal
+
+class TestSecretInt(unittest.TestCase):
+    """Zeroizable key material Test Class"""
+
+    def test_value_and_zeroize(self):
+        value = int.from_bytes(os.urandom(256), 'big')
+        secret = SecretInt(value)
+        buffer = secret._buffer
+        self.assertEqual(secret.value, value)
+        self.assertNotIn(str(value), repr(secret))
+        secret.zeroize()
+        self.assertEqual(bytes(buffer), bytes(len(buffer)))
+        self.assertTrue(secret.zeroized)
+        with self.assertRaises(ValueError):
+            secret.value
+        secret.zeroize()  # Idempotent
+
+    def test_context_manager_and_pickle(self):
+        with SecretInt(12345) as secret:
+            self.assertEqual(pickle.loads(pickle.dumps(secret)).value, 12345)
+        self.assertTrue(secret.zeroized)
+        with self.assertRaises(ValueError):
+            SecretInt(-1)
+
+    def test_rejected_value_is_collected_quietly(self):
+        unraisable = []
+        hook, sys.unraisablehook = sys.unraisablehook, unraisable.append
+        try:
+            for value in (-1, 1.5, "7"):
+                with self.assertRaises(ValueError):
+                    SecretInt(value)
+        finally:
+            sys.unraisablehook = hook
+        self.assertEqual(unraisable, [])
+
+    def test_cipher_zeroize(self):
+        public, private = ElGamal.create_keypair(group="ffdhe2048", subgroup=True)
+        ciphertext = public.encrypt(b"secret")
+        self.assertEqual(private.decrypt(ciphertext), b"secret")
+        private.zeroize()
+        self.assertIsNone(private.x)
+        with self.assertRaises(RuntimeError):
+            private.decrypt(ciphertext)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,49 @@
+"""
+RSA, ElGamal and EC-ElGamal file encryption
+
+Nothing is imported eagerly: subpackages (src.RSA, src.Keyfile, ...) load on
+first attribute access and cipher classes are looked up by algorithm name, so
+a command only pays for the algorithm it actually runs.
+"""
+import importlib
+
+__version__ = "1.0.0"
+
+SUBPACKAGES = ("RSA", "ElGamal", "ECElGamal", "Keyfile", "Envelope", "Codec", "Utils")
+
+# Algorithm name -> (module, cipher class, key generator class)
+ALGORITHMS = {
+    "RSA": ("src.RSA.rsa", "RSA", "RSAKeyGenerator"),
+    "ElGamal": ("src.ElGamal.ElGamal", "ElGamal", "ElGamalKeyGenerator"),
+    "ECElGamal": ("src.ECElGamal.ECElGamal", "ECElGamal", "ECElGamalKeyGenerator"),
+}
+
+def cipher_class(algorithm: str):
+    """RSA / ElGamal / ECElGamal class, importing its module on first use"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    module, name, _ = ALGORITHMS[algorithm]
+    return getattr(importlib.import_module(module), name)
+
+def keygen_class(algorithm: str):
+    """Key generator class of an algorithm, importing its module on first use"""
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm: {algorithm}")
+    module, _, name = ALGORITHMS[algorithm]
+    return getattr(importlib.import_module(module), name)
+
+def algorithm_of(cipher) -> str:
+    """'RSA', 'ElGamal' or 'ECElGamal' for an RSA / ElGamal / ECElGamal instance"""
+    if hasattr(cipher, "n"):
+        return "RSA"
+    if hasattr(cipher, "Q"):
+        return "ECElGamal"
+    return "ElGamal"
+
+def __getattr__(name):
+    if name in SUBPACKAGES:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(list(globals()) + list(SUBPACKAGES))
@@ -0,0 +1,42 @@
+import os
+import sys
+import time
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Startup budget per command in seconds (interpreter start included)
+BUDGET = 0.25
+RUNS = 5
+
+COMMANDS = [
+    ['-c', 'pass'],  # Bare interpreter, for reference
+    ['-m', 'main.run.cli', '--help'],
+    ['-m', 'main.run.cli', 'encrypt', '--help'],
+    ['-m', 'main.run.cli', 'decrypt', '--help'],
+    ['-m', 'main.run.cli', 'keygen', '--help'],
+    ['main/run/Encrypt.py', '--help'],
+    ['main/run/Decrypt.py', '--help'],
+]
+
+def cold_start(args):
+    """Best wall time of RUNS fresh interpreters running args"""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+if __name__ == "__main__":
+    over = []
+    print(f"{'Command':<45}Time")
+    for args in COMMANDS:
+        elapsed = cold_start(args)
+        print(f"{' '.join(args):<45}{elapsed * 1000:.1f} ms")
+        if elapsed > BUDGET:
+            over.append(' '.join(args))
+    if over:
+        print(f"Over the {BUDGET * 1000:.0f} ms budget: {', '.join(over)}")
+        sys.exit(1)
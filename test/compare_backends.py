@@ -0,0 +1,111 @@
+import os
+import sys
+import json
+import time
+import argparse
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.RSA.rsa import RSAKeyGenerator, RSA
+from src.Utils import bigint
+
+# RSA-OAEP(SHA-256) speed of this package next to pycryptodome and
+# cryptography (pip install .[compat]). Every backend gets the same key and
+# the same messages, and every ciphertext is decrypted by the other side as
+# well, so a speedup that breaks compatibility shows up as a failure here.
+# Missing libraries are skipped.
+
+def _backends():
+    backends = {}
+    try:
+        from Crypto.PublicKey import RSA as CryptoRSA
+        from Crypto.Cipher import PKCS1_OAEP
+        from Crypto.Hash import SHA256
+        backends['pycryptodome'] = {
+            'generate': lambda bits: CryptoRSA.generate(bits),
+            'import': lambda e, n, d: CryptoRSA.construct((n, e, d)),
+            'encrypt': lambda key, m: PKCS1_OAEP.new(key.public_key(), SHA256).encrypt(m),
+            'decrypt': lambda key, c: PKCS1_OAEP.new(key, SHA256).decrypt(c),
+        }
+    except ImportError:
+        pass
+    try:
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding, rsa as crsa
+        oaep = padding.OAEP(mgf=padding.MGF1(hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+        def import_key(e, n, d):
+            p, q = crsa.rsa_recover_prime_factors(n, e, d)
+            return crsa.RSAPrivateNumbers(p, q, d, crsa.rsa_crt_dmp1(d, p), crsa.rsa_crt_dmq1(d, q),
+                                          crsa.rsa_crt_iqmp(p, q), crsa.RSAPublicNumbers(e, n)).private_key()
+
+        backends['cryptography'] = {
+            'generate': lambda bits: crsa.generate_private_key(65537, bits),
+            'import': import_key,
+            'encrypt': lambda key, m: key.public_key().encrypt(m, oaep),
+            'decrypt': lambda key, c: key.decrypt(c, oaep),
+        }
+    except ImportError:
+        pass
+    return backends
+
+def _timed(func, items):
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    return results, (time.perf_counter() - start) / len(items)
+
+def compare(bits=2048, keys=3, messages=200):
+    """
+    :return: {backend: {'keygen', 'encrypt', 'decrypt': seconds per operation}}
+    """
+    size = (bits + 7) // 8
+    plaintexts = [os.urandom(i % (size - 2 * 32 - 1)) for i in range(messages)]
+
+    _, keygen = _timed(lambda _: RSAKeyGenerator.generate_keypair(bits), range(keys))
+    public_key, private_key = RSAKeyGenerator.generate_keypair(bits)
+    ours = RSA(public_key, private_key)
+    ciphertexts, encrypt = _timed(ours.encrypt, plaintexts)
+    decrypted, decrypt = _timed(ours.decrypt, ciphertexts)
+    if decrypted != plaintexts:
+        raise AssertionError("RSA round trip failed")
+    report = {'ufug2106': {'keygen': keygen, 'encrypt': encrypt, 'decrypt': decrypt}}
+
+    for name, backend in _backends().items():
+        _, keygen = _timed(backend['generate'], [bits] * keys)
+        key = backend['import'](ours.e, ours.n, ours.d)
+        theirs, encrypt = _timed(lambda m: backend['encrypt'](key, m), plaintexts)
+        decrypted, decrypt = _timed(lambda c: backend['decrypt'](key, c), theirs)
+        # Differential check in both directions
+        if decrypted != plaintexts:
+            raise AssertionError(f"{name} round trip failed")
+        if [ours.decrypt(int.from_bytes(c, 'big')) for c in theirs] != plaintexts:
+            raise AssertionError(f"{name} ciphertexts do not decrypt with RSA")
+        if [backend['decrypt'](key, c.to_bytes(size, 'big')) for c in ciphertexts] != plaintexts:
+            raise AssertionError(f"RSA ciphertexts do not decrypt with {name}")
+        report[name] = {'keygen': keygen, 'encrypt': encrypt, 'decrypt': decrypt}
+    return report
+
+def print_report(report, bits):
+    ours = report['ufug2106']
+    print(f"RSA-{bits} OAEP(SHA-256), bigint backend: {bigint.BACKEND}\n")
+    print(f"{'Backend':<15}{'keygen (s)':>12}{'encrypt (ms)':>14}{'decrypt (ms)':>14}"
+          f"{'keygen gap':>12}{'encrypt gap':>13}{'decrypt gap':>13}")
+    for name, times in report.items():
+        gaps = [ours[op] / times[op] for op in ('keygen', 'encrypt', 'decrypt')]
+        print(f"{name:<15}{times['keygen']:>12.3f}{times['encrypt'] * 1000:>14.3f}{times['decrypt'] * 1000:>14.3f}"
+              + ''.join(f"{gap:>12.1f}x" for gap in gaps))
+    print("\ngap: time of this package / time of the backend")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare RSA-OAEP with pycryptodome and cryptography")
+    parser.add_argument('--bits', type=int, default=2048)
+    parser.add_argument('--keys', type=int, default=3, help="key pairs generated per backend")
+    parser.add_argument('--messages', type=int, default=200, help="messages encrypted and decrypted")
+    parser.add_argument('--output', help="write the timings as JSON")
+    args = parser.parse_args()
+
+    report = compare(args.bits, args.keys, args.messages)
+    print_report(report, args.bits)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'bits': args.bits, 'bigint': bigint.BACKEND, 'seconds': report}, f, indent=2)
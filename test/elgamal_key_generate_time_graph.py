@@ -1,41 +1,41 @@
-
-import matplotlib.pyplot as plt
-
 # 提取数据
 key_sizes = [512, 576, 640, 704, 768, 832, 896, 960, 1024]
 avg_times = [16.147893, 47.403437, 48.663082, 48.893848, 26.214356, 33.141076, 72.974650, 106.436910, 290.462504]
 
-# 设置图片清晰度
-plt.rcParams['figure.dpi'] = 300
-
-# 创建图表
-plt.figure(figsize=(12, 6))
-plt.plot(key_sizes, avg_times, marker='o', linestyle='-', color='#1f77b4', linewidth=2)
+def plot():
+    import matplotlib.pyplot as plt  # Imported here so loading the data needs no matplotlib
 
-# 添加标题和轴标签（使用英文）
-plt.title('Relationship between Key Size and Average Key Generation Time', fontsize=16, pad=20)
-plt.xlabel('Key Size (bits)', fontsize=12)
-plt.ylabel('Average Key Generation Time (s)', fontsize=12)
+    # 设置图片清晰度
+    plt.rcParams['figure.dpi'] = 300
 
-# 设置x轴刻度
-plt.xticks(key_sizes, rotation=45)
+    # 创建图表
+    plt.figure(figsize=(12, 6))
+    plt.plot(key_sizes, avg_times, marker='o', linestyle='-', color='#1f77b4', linewidth=2)
 
-# 添加网格线
-plt.grid(True, linestyle='--', alpha=0.7)
+    # 添加标题和轴标签（使用英文）
+    plt.title('Relationship between Key Size and Average Key Generation Time', fontsize=16, pad=20)
+    plt.xlabel('Key Size (bits)', fontsize=12)
+    plt.ylabel('Average Key Generation Time (s)', fontsize=12)
 
-# 添加数据标签
-for x, y in zip(key_sizes, avg_times):
-    plt.annotate(f'{y:.2f}s', (x, y), textcoords='offset points',
-                 xytext=(0,5), ha='center', fontsize=9)
+    # 设置x轴刻度
+    plt.xticks(key_sizes, rotation=45)
 
-# 优化布局
-plt.tight_layout()
+    # 添加网格线
+    plt.grid(True, linestyle='--', alpha=0.7)
 
-# 显示图表
-plt.show()    
+    # 添加数据标签
+    for x, y in zip(key_sizes, avg_times):
+        plt.annotate(f'{y:.2f}s', (x, y), textcoords='offset points',
+                     xytext=(0,5), ha='center', fontsize=9)
 
+    # 优化布局
+    plt.tight_layout()
 
+    # 显示图表
+    plt.show()
 
+if __name__ == "__main__":
+    plot()
 
 
 # import time
@@ -1,37 +1,35 @@
-import matplotlib.pyplot as plt
-
 # 数据
 key_sizes = [2048, 2176, 2304, 2432, 2560, 2688, 2816, 2944, 3072, 3200, 3328, 3456, 3584, 3712, 3840, 3968]
 avg_times = [2.571675, 2.266838, 3.378178, 3.767596, 4.306194, 6.156540, 7.195320, 7.766657, 
              8.927467, 8.663682, 11.637862, 13.451822, 9.619351, 10.608393, 22.726179,37.514026]
 
-# 创建图表
-plt.figure(figsize=(12, 6))  # 设置画布大小
-plt.plot(key_sizes, avg_times, marker='o', linestyle='-', color='#1f77b4', linewidth=2)  # 绘制折线图
-
-# 添加标题和轴标签
-plt.title('Relationship between Key Size and Average Key Generation Time', fontsize=16, pad=20)
-plt.xlabel('Key Size (KeySize)', fontsize=12)
-plt.ylabel('Average Key Generation Time (Seconds)', fontsize=12)
-# 自定义x轴刻度（每256间隔显示刻度）
-plt.xticks(range(2048, 4097, 256), rotation=45, ha='right')  # 旋转刻度标签避免重叠
-
-# 添加网格线
-plt.grid(True, linestyle='--', alpha=0.7)
-
-# 显示数值标签（可选）
-for x, y in zip(key_sizes, avg_times):
-    plt.text(x, y, f'{y:.2f}', ha='right', va='bottom', fontsize=10)
-
-# 优化布局
-plt.tight_layout()
-plt.show()
+def plot():
+    import matplotlib.pyplot as plt  # Imported here so loading the data needs no matplotlib
 
+    # 创建图表
+    plt.figure(figsize=(12, 6))  # 设置画布大小
+    plt.plot(key_sizes, avg_times, marker='o', linestyle='-', color='#1f77b4', linewidth=2)  # 绘制折线图
 
+    # 添加标题和轴标签
+    plt.title('Relationship between Key Size and Average Key Generation Time', fontsize=16, pad=20)
+    plt.xlabel('Key Size (KeySize)', fontsize=12)
+    plt.ylabel('Average Key Generation Time (Seconds)', fontsize=12)
+    # 自定义x轴刻度（每256间隔显示刻度）
+    plt.xticks(range(2048, 4097, 256), rotation=45, ha='right')  # 旋转刻度标签避免重叠
 
+    # 添加网格线
+    plt.grid(True, linestyle='--', alpha=0.7)
 
+    # 显示数值标签（可选）
+    for x, y in zip(key_sizes, avg_times):
+        plt.text(x, y, f'{y:.2f}', ha='right', va='bottom', fontsize=10)
 
+    # 优化布局
+    plt.tight_layout()
+    plt.show()
 
+if __name__ == "__main__":
+    plot()
 
 
 # import time
@@ -0,0 +1,277 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import hashlib
+import argparse
+import platform
+import tempfile
+import contextlib
+import subprocess
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+# Scaling benchmark of the whole file pipeline:
+#   Turn_Into_Bytes -> Encrypt -> Decrypt -> Restore
+# for synthetic inputs of growing size. Every stage runs in a fresh
+# interpreter inside a scratch workspace (the scripts use main/data/...
+# relative paths), so its peak RSS and tracemalloc peak belong to that stage
+# alone. Results are saved as JSON; pass the files of several releases to
+# --plot to overlay their curves.
+
+STAGES = ['stage', 'encrypt', 'decrypt', 'restore']
+KINDS = ['text', 'random', 'image']
+DEFAULT_SIZES = '1K,64K,1M,16M,256M,1G,4G'
+DEFAULT_CONFIGS = 'RSA-2048,ElGamal-2048,ECElGamal-256'
+BLOCK = 1 << 20  # Generator block size
+SUPERLINEAR = 1.2  # Flag a step whose time per byte grows by more than this
+
+#region Inputs
+def parse_size(text):
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30}
+    text = text.strip().upper()
+    if text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def _blocks(kind, size, seed=0):
+    """Deterministic content of one kind, in BLOCK-sized pieces"""
+    rng = random.Random(seed)
+    if kind == 'text':
+        # Spaces only: Restore.py treats printable data as text
+        words = ['alpha', 'beta', 'gamma', 'delta', 'cipher', 'prime', 'modulus', 'key', 'block', 'data']
+        base = ' '.join(rng.choice(words) for _ in range(BLOCK // 5)).encode()[:BLOCK]
+        make = lambda i: base[i % 997:] + base[:i % 997]
+    elif kind == 'image':
+        # PNG signature followed by smooth gradient rows, like raw pixel data
+        row = bytes(range(256)) * 16
+        base = b''.join(row[y % 256:] + row[:y % 256] for y in range(BLOCK // len(row)))
+        make = lambda i: (b'\x89PNG\r\n\x1a\n' + base[8:]) if i == 0 else base
+    else:
+        make = lambda i: rng.randbytes(BLOCK) if hasattr(rng, 'randbytes') else os.urandom(BLOCK)
+    written, index = 0, 0
+    while written < size:
+        block = make(index)[:size - written]
+        yield block
+        written += len(block)
+        index += 1
+
+def generate_input(path, kind, size):
+    with open(path, 'wb') as f:
+        for block in _blocks(kind, size):
+            f.write(block)
+#endregion
+
+#region Stages (child process)
+def _public_cipher(key_path):
+    from src import cipher_class
+    from src.Keyfile.keyfile import load_key
+    key = load_key(key_path)
+    return cipher_class(key.algorithm)(key.public_key())
+
+def run_stage(stage, algorithm):
+    """Run one stage in the current directory (a workspace)"""
+    key_path = os.path.join('keys', algorithm + '.key')
+    if stage == 'stage':
+        from main.run.Turn_Into_Bytes import file_to_bytes
+        file_to_bytes('input.bin', os.path.join('main', 'data', 'data.txt'))
+    elif stage == 'encrypt':
+        from main.run.Encrypt import encrypt_file, method_code
+        encrypt_file(method_code(algorithm), os.path.join('main', 'data', 'data.txt'),
+                     os.path.join('main', 'data', 'encrypt.txt'), _public_cipher(key_path))
+    elif stage == 'decrypt':
+        from main.run.Decrypt import decrypt_file, codec_from_key_file
+        decrypt_file(os.path.join('main', 'data', 'encrypt.txt'), os.path.join('main', 'data', 'decrypt.txt'),
+                     codec_from_key_file(key_path, algorithm))
+    else:
+        from main.run.Restore import restore_file
+        restore_file()
+
+def measure_stage(stage, algorithm, trace):
+    """Child entry point: run a stage and report time and memory as JSON"""
+    import tracemalloc
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(sys.stderr):
+        run_stage(stage, algorithm)
+    seconds = time.perf_counter() - start
+    traced = tracemalloc.get_traced_memory()[1] if trace else None
+    try:
+        import resource
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss = rss if sys.platform == 'darwin' else rss * 1024  # Linux reports KiB
+    except ImportError:  # Windows
+        rss = None
+    print(json.dumps({'seconds': seconds, 'peak_rss': rss, 'traced_peak': traced}))
+#endregion
+
+#region Driver
+def parse_config(text):
+    """'RSA-2048' -> ('RSA', 2048); ElGamal sizes select the ffdhe group of that size"""
+    algorithm, bits = text.split('-')
+    return algorithm, int(bits)
+
+def write_key(workspace, algorithm, bits):
+    from src import keygen_class
+    from main.run.Keygen import write_keypair
+    from main.run.Encrypt import method_code
+    os.makedirs(os.path.join(workspace, 'keys'), exist_ok=True)
+    if algorithm == 'ElGamal':
+        public_key, private_key = keygen_class('ElGamal').generate_keypair(bits, group=f'ffdhe{bits}')
+    elif algorithm == 'ECElGamal':
+        public_key, private_key = keygen_class('ECElGamal').generate_keypair()
+    else:
+        public_key, private_key = keygen_class('RSA').generate_keypair(bits)
+    write_keypair(method_code(algorithm), public_key, private_key, os.path.join(workspace, 'keys', algorithm))
+
+def _digest(path, limit=None):
+    digest = hashlib.sha256()
+    remaining = os.path.getsize(path) if limit is None else limit
+    with open(path, 'rb') as f:
+        while remaining:
+            data = f.read(min(BLOCK, remaining))
+            if not data:
+                break
+            digest.update(data)
+            remaining -= len(data)
+    return digest.hexdigest()
+
+def run_pipeline(workspace, algorithm, trace):
+    results = {}
+    for stage in STAGES:
+        proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', stage, algorithm]
+                              + (['--no-tracemalloc'] if not trace else []),
+                              cwd=workspace, capture_output=True, text=True, check=True)
+        results[stage] = json.loads(proc.stdout.strip().splitlines()[-1])
+    # Decrypt output is the input plus the zero padding of the last block
+    size = os.path.getsize(os.path.join(workspace, 'input.bin'))
+    decrypted = os.path.join(workspace, 'main', 'data', 'decrypt.txt')
+    results['verified'] = _digest(decrypted, size) == _digest(os.path.join(workspace, 'input.bin'))
+    return results
+
+def benchmark(sizes, kinds, configs, max_seconds, trace=True, keep=None):
+    """
+    :param max_seconds: Larger sizes of a (config, kind) are skipped once one
+                        pipeline run takes longer than this
+    :return: List of result rows
+    """
+    rows = []
+    workspace = keep or tempfile.mkdtemp(prefix='scaling-')
+    try:
+        for config in configs:
+            algorithm, bits = parse_config(config)
+            write_key(workspace, algorithm, bits)
+            for kind in kinds:
+                previous = None
+                for size in sizes:
+                    data_dir = os.path.join(workspace, 'main', 'data')
+                    shutil.rmtree(data_dir, ignore_errors=True)
+                    os.makedirs(data_dir)
+                    generate_input(os.path.join(workspace, 'input.bin'), kind, size)
+                    stages = run_pipeline(workspace, algorithm, trace)
+                    total = sum(stages[s]['seconds'] for s in STAGES)
+                    row = {'config': config, 'kind': kind, 'size': size, 'stages': stages,
+                           'seconds': total, 'throughput': size / total if total else 0.0,
+                           'verified': stages.pop('verified')}
+                    # Time per byte relative to the previous size (1.0 is linear)
+                    row['scaling'] = (total / size) / (previous['seconds'] / previous['size']) if previous else None
+                    rows.append(row)
+                    print_row(row)
+                    previous = row
+                    if total > max_seconds:
+                        break
+    finally:
+        if not keep:
+            shutil.rmtree(workspace, ignore_errors=True)
+    return rows
+
+def _human(size):
+    for unit in ('B', 'K', 'M', 'G'):
+        if size < 1024 or unit == 'G':
+            return f"{size:g}{unit}" if unit == 'B' else f"{size:.4g}{unit}"
+        size /= 1024
+
+def print_row(row):
+    rss = max((s['peak_rss'] or 0) for s in row['stages'].values())
+    traced = max((s['traced_peak'] or 0) for s in row['stages'].values())
+    scaling = f"{row['scaling']:.2f}" if row['scaling'] else '-'
+    flag = ' superlinear' if row['scaling'] and row['scaling'] > SUPERLINEAR else ''
+    flag += '' if row['verified'] else ' MISMATCH'
+    print(f"{row['config']:<16}{row['kind']:<8}{_human(row['size']):>8}{row['seconds']:>10.2f} s"
+          f"{row['throughput'] / 1024:>12.1f} KB/s{_human(rss):>9} RSS{_human(traced):>9} traced"
+          f"{scaling:>7}{flag}")
+
+def environment():
+    from src.Utils.bigint import BACKEND
+    return {'python': platform.python_version(), 'platform': platform.platform(),
+            'bigint': BACKEND, 'time': time.strftime('%Y-%m-%d %H:%M:%S')}
+
+def plot(result_files, output):
+    import matplotlib.pyplot as plt  # Imported here so running the benchmark needs no matplotlib
+
+    fig, (ax_speed, ax_memory) = plt.subplots(1, 2, figsize=(14, 6))
+    for path in result_files:
+        with open(path) as f:
+            result = json.load(f)
+        series = {}
+        for row in result['rows']:
+            series.setdefault((row['config'], row['kind']), []).append(row)
+        for (config, kind), rows in series.items():
+            name = f"{result['label']} {config} {kind}"
+            sizes = [r['size'] for r in rows]
+            ax_speed.plot(sizes, [r['throughput'] / 1024 for r in rows], marker='o', label=name)
+            ax_memory.plot(sizes, [max(s['peak_rss'] or 0 for s in r['stages'].values()) / (1 << 20)
+                                   for r in rows], marker='o', label=name)
+    for ax, ylabel in ((ax_speed, 'Throughput (KB/s)'), (ax_memory, 'Peak RSS (MB)')):
+        ax.set_xscale('log')
+        ax.set_xlabel('Input size (bytes)')
+        ax.set_ylabel(ylabel)
+        ax.grid(True, linestyle='--', alpha=0.7)
+    ax_speed.set_yscale('log')
+    ax_memory.legend(fontsize=8)
+    fig.suptitle('Pipeline scaling (Turn_Into_Bytes -> Encrypt -> Decrypt -> Restore)')
+    fig.tight_layout()
+    fig.savefig(output)
+    print(f"Curves saved to {output}")
+#endregion
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline throughput and memory versus input size")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="comma-separated sizes, e.g. 1K,1M,1G")
+    parser.add_argument('--kinds', default=','.join(KINDS), help="text, random and/or image")
+    parser.add_argument('--configs', default=DEFAULT_CONFIGS,
+                        help="algorithm-bits list, e.g. RSA-2048,RSA-3072,ElGamal-3072,ECElGamal-256")
+    parser.add_argument('--max-seconds', type=float, default=120.0,
+                        help="stop growing a series once one run takes longer than this")
+    parser.add_argument('--no-tracemalloc', action='store_true',
+                        help="skip tracemalloc (it slows the stages down)")
+    parser.add_argument('--label', default='current', help="name of this run in the curves")
+    parser.add_argument('--output', default=os.path.join(ROOT, 'test', 'scaling_results.json'))
+    parser.add_argument('--keep', help="use this directory as workspace and keep it")
+    parser.add_argument('--plot', nargs='+', metavar='RESULTS',
+                        help="only draw the curves of these result files into scaling.png")
+    parser.add_argument('--child', nargs=2, metavar=('STAGE', 'ALGORITHM'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        measure_stage(*args.child, trace=not args.no_tracemalloc)
+        return
+    if args.plot:
+        plot(args.plot, os.path.join(ROOT, 'test', 'scaling.png'))
+        return
+
+    sizes = sorted(parse_size(s) for s in args.sizes.split(','))
+    rows = benchmark(sizes, args.kinds.split(','), args.configs.split(','), args.max_seconds,
+                     trace=not args.no_tracemalloc, keep=args.keep)
+    with open(args.output, 'w') as f:
+        json.dump({'label': args.label, 'environment': environment(), 'rows': rows}, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+    if not all(row['verified'] for row in rows):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()